@@ -0,0 +1,12 @@
+"""
+Session3 공용 모듈(market_data, charts, context_packer 등)을 import할 수 있도록 경로 추가
+사용: import _session3_path  # noqa: F401  (Session3 모듈 import보다 먼저)
+"""
+
+import os
+import sys
+
+SESSION3_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Session3"))
+
+if SESSION3_DIR not in sys.path:
+    sys.path.append(SESSION3_DIR)
@@ -0,0 +1,217 @@
+"""
+비동기 도구 호출 루프 (Streamlit 챗봇용)
+- 모델 호출은 astream, 도구는 ainvoke로 동시에 실행 (도구별 제한 시간은 tool_executor 설정 사용)
+- 스트림의 도구 호출 조각을 이어 붙이다가 인자 JSON이 완성되는 즉시 그 도구를 시작
+  (여러 도구 호출이 있으면 뒤쪽 호출의 인자가 생성되는 동안 앞쪽 도구가 실행됨)
+- 도구 호출 라운드 수 상한: 넘으면 도구 없이 지금까지의 결과로 답하게 함
+- AgentRun: 공용 백그라운드 이벤트 루프에서 실행하고 이벤트를 큐로 전달
+  → 화면이 앞 토큰을 그리는 동안 루프는 다음 단계(도구 실행 등)를 진행
+  → 새 메시지가 오거나 화면 쪽 소비가 중단되면 cancel()로 진행 중인 모델/도구 작업 취소
+  → 이벤트를 기다리는 동안에도 AGENT_POLL_SECONDS마다 on_idle을 불러 스크립트 쪽에 제어를 돌려줌
+    (Streamlit은 st.* 호출 때만 재실행/중지 요청을 처리하므로 긴 도구 실행 중에도 재실행이 바로 일어남)
+
+이벤트:
+("token", 텍스트)                       모델 토큰
+("ai", AIMessage)                       도구 호출이 담긴 모델 응답
+("tool", ToolMessage, [모델용 메시지])   도구 결과 (모델에는 to_model로 변환한 메시지를 전달)
+("final", AIMessage)                    최종 답변
+
+설정 (환경변수): AGENT_MAX_ITERATIONS, AGENT_POLL_SECONDS
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage, ToolMessage
+
+import llm_clients
+import tool_executor
+
+logger = logging.getLogger(__name__)
+
+MAX_ITERATIONS = int(os.getenv("AGENT_MAX_ITERATIONS", 5))
+POLL_SECONDS = float(os.getenv("AGENT_POLL_SECONDS", 0.2))   # 이벤트 대기 중 on_idle 호출 간격
+LIMIT_NOTICE = "도구 호출 횟수 한도({limit}회)에 도달했습니다. 더 이상 도구를 호출하지 말고 지금까지의 결과로 답변하세요."
+
+_DONE = object()
+
+
+async def _run_tool(tool_call: dict, tools: dict) -> ToolMessage:
+    """도구 하나 실행 (제한 시간/오류는 status="error" ToolMessage로)"""
+    name = tool_call["name"]
+    tool = tools.get(name)
+    timeout = tool_executor.executor.timeout_for(name)
+    try:
+        if tool is None:
+            raise tool_executor.ToolCallError(f"알 수 없는 도구: {name}")
+        return await asyncio.wait_for(tool.ainvoke(tool_call), timeout)
+    except asyncio.TimeoutError:
+        error = f"{name} 시간 초과 ({timeout:g}초)"
+    except tool_executor.ToolCallError as e:
+        error = str(e)
+    except Exception as e:
+        error = f"{name} 실행 실패: {e}"
+    return ToolMessage(content=f"오류: {error}", tool_call_id=tool_call["id"], name=name, status="error")
+
+
+class EarlyToolStarter:
+    """
+    스트리밍 중인 도구 호출 조각(tool_call_chunks)을 index별로 이어 붙이고,
+    이름/ID가 있고 인자가 완전한 JSON 객체가 되면 바로 도구 실행 task를 시작
+    (JSON 객체는 닫는 괄호까지 와야 파싱되므로 파싱 성공 = 인자 완성)
+    """
+
+    def __init__(self, tools: dict, enabled: bool = True):
+        self.tools = tools
+        self.enabled = enabled
+        self._parts = {}   # index -> {"name", "id", "args"}
+        self._tasks = {}   # tool_call_id -> asyncio.Task
+
+    def feed(self, chunk):
+        if not self.enabled:
+            return
+        for piece in getattr(chunk, "tool_call_chunks", None) or []:
+            part = self._parts.setdefault(piece.get("index"), {"name": "", "id": None, "args": ""})
+            part["name"] += piece.get("name") or ""
+            part["id"] = piece.get("id") or part["id"]
+            part["args"] += piece.get("args") or ""
+            self._try_start(part)
+
+    def _try_start(self, part: dict):
+        if not part["name"] or not part["id"] or part["id"] in self._tasks:
+            return
+        try:
+            args = json.loads(part["args"])
+        except ValueError:
+            return
+        if isinstance(args, dict):
+            tool_call = {"name": part["name"], "args": args, "id": part["id"], "type": "tool_call"}
+            self._tasks[part["id"]] = asyncio.ensure_future(_run_tool(tool_call, self.tools))
+
+    @property
+    def started(self) -> int:
+        return len(self._tasks)
+
+    def tasks_for(self, tool_calls: list) -> list:
+        """최종 tool_calls 순서대로 task (미리 시작하지 못한 호출은 지금 시작)"""
+        for tool_call in tool_calls:
+            if tool_call["id"] not in self._tasks:
+                self._tasks[tool_call["id"]] = asyncio.ensure_future(_run_tool(tool_call, self.tools))
+        return [self._tasks[tool_call["id"]] for tool_call in tool_calls]
+
+    def cancel(self):
+        for task in self._tasks.values():
+            task.cancel()
+
+
+async def astream_agent(llm, messages: list, tools: dict, max_iterations: int = MAX_ITERATIONS, to_model=None,
+                        start_tools_early: bool = True):
+    """
+    모델 호출 → 도구 실행을 반복하는 비동기 제너레이터 (이벤트는 모듈 설명 참고)
+    messages는 복사해서 사용 (호출한 쪽 기록은 이벤트를 보고 직접 갱신)
+    to_model: ToolMessage -> 모델에 보낼 메시지 리스트 (기본은 그대로)
+    start_tools_early: 인자가 완성된 도구를 스트림이 끝나기 전에 시작 (False면 스트림 종료 후 일괄 시작)
+    """
+    model = llm_clients.bind_tools(llm, list(tools.values()))  # 프로세스당 한 번만 바인딩
+    conversation = list(messages)
+    for iteration in range(max_iterations + 1):
+        if iteration == max_iterations:
+            # 한도 도달: 도구 없이 마지막 답변
+            model = llm
+            conversation.append(SystemMessage(LIMIT_NOTICE.format(limit=max_iterations)))
+
+        starter = EarlyToolStarter(tools, enabled=start_tools_early)
+        try:
+            gathered = None
+            async for chunk in model.astream(conversation):
+                if chunk.content:
+                    yield ("token", chunk.content)
+                starter.feed(chunk)
+                gathered = chunk if gathered is None else gathered + chunk
+
+            if gathered is None or not gathered.tool_calls:
+                yield ("final", gathered)
+                return
+
+            conversation.append(gathered)
+            yield ("ai", gathered)
+
+            # 한 라운드의 도구 호출은 동시에 실행(일부는 이미 실행 중), 결과는 호출 순서대로
+            results = await asyncio.gather(*starter.tasks_for(gathered.tool_calls))
+        finally:
+            starter.cancel()  # 취소/오류로 빠져나갈 때 실행 중인 도구 task 정리 (끝난 task에는 영향 없음)
+
+        for tool_msg in results:
+            model_msgs = to_model(tool_msg) if to_model else [tool_msg]
+            conversation.extend(model_msgs)
+            yield ("tool", tool_msg, model_msgs)
+
+
+@lru_cache(maxsize=None)
+def background_loop() -> asyncio.AbstractEventLoop:
+    """프로세스 공용 이벤트 루프 (데몬 스레드에서 계속 실행)"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
+    return loop
+
+
+class AgentRun:
+    """
+    비동기 제너레이터를 백그라운드 루프에서 실행하고 이벤트를 동기 코드(Streamlit 스크립트)로 전달
+    events()를 끝까지 소비하지 않고 닫으면(화면 재실행 등) 작업을 취소
+    동기 도구는 스레드에서 실행되므로 취소 후에도 그 호출 자체는 끝까지 돌고 결과만 버림
+    """
+
+    def __init__(self, agen, loop: asyncio.AbstractEventLoop = None):
+        self._queue = queue.Queue()
+        self._future = asyncio.run_coroutine_threadsafe(self._pump(agen), loop or background_loop())
+
+    async def _pump(self, agen):
+        try:
+            async for event in agen:
+                self._queue.put(event)
+            self._queue.put(_DONE)
+        except asyncio.CancelledError:
+            self._queue.put(_DONE)
+            raise
+        except Exception as e:
+            self._queue.put(e)
+        finally:
+            await agen.aclose()
+
+    def events(self, on_idle=None, poll: float = POLL_SECONDS):
+        """
+        이벤트를 순서대로 반환. 기다리는 동안 poll초마다 on_idle() 호출
+        (Streamlit: st.session_state를 읽으면 대기 중인 재실행/중지 요청이 예외로 올라와 작업이 취소됨)
+        """
+        try:
+            while True:
+                try:
+                    event = self._queue.get(timeout=poll)
+                except queue.Empty:
+                    if on_idle is not None:
+                        on_idle()
+                    continue
+                if event is _DONE:
+                    return
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        finally:
+            self.cancel()
+
+    def cancel(self) -> bool:
+        """진행 중이면 취소 (이미 끝났으면 False)"""
+        if self._future.done():
+            return False
+        self._future.cancel()
+        return True
+
+    @property
+    def done(self) -> bool:
+        return self._future.done()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+도구 호출 챗봇 루프: 기존 동기 재귀(get_ai_response) vs agent_loop (비동기 + 백그라운드 루프)
+- 도구 호출 → 답변 순서로 응답하는 스트리밍 모델 스텁과 지연만 있는 도구로 네트워크 없이 실행
+- 화면 렌더링 지연(토큰당)을 두고 마지막 토큰까지 시간 비교 (도구 실행과 렌더링이 겹치는지)
+- 새 메시지가 와서 취소할 때 작업이 얼마나 빨리 멈추는지, 도구 라운드 상한이 지켜지는지 확인
+
+실행: python bench_agent_loop.py --tool-delay 0.5 --render-delay 0.01
+"""
+
+import argparse
+import asyncio
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import tool
+
+import agent_loop
+
+
+class ToolCallingStubModel(BaseChatModel):
+    """마지막 사용자 메시지 뒤에 도구 결과가 없으면 도구 호출, 있으면 tokens개 토큰 답변"""
+
+    tokens: int = 30
+    token_delay: float = 0.01
+    tickers: list = ["TSLA", "NVDA"]
+    always_call_tools: bool = False
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-calling-stub"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _chunks(self, messages):
+        self.calls += 1
+        last_human = max(i for i, m in enumerate(messages) if isinstance(m, HumanMessage))
+        has_results = any(isinstance(m, ToolMessage) for m in messages[last_human:])
+        limit_reached = isinstance(messages[-1], SystemMessage) and "한도" in messages[-1].content
+        if (self.always_call_tools or not has_results) and not limit_reached:
+            chunks = [{"name": "get_yf_stock_info", "args": f'{{"ticker": "{t}"}}', "id": f"call-{self.calls}-{t}",
+                       "index": i} for i, t in enumerate(self.tickers)]
+            yield AIMessageChunk(content="", tool_call_chunks=chunks)
+            return
+        for i in range(self.tokens):
+            yield AIMessageChunk(content=f"t{i} ")
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for chunk in self._chunks(messages):
+            time.sleep(self.token_delay)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for chunk in self._chunks(messages):
+            await asyncio.sleep(self.token_delay)
+            yield ChatGenerationChunk(message=chunk)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = "".join(chunk.text for chunk in self._stream(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+def make_tools(delay: float) -> dict:
+    @tool
+    def get_yf_stock_info(ticker: str) -> str:
+        """가짜 종목 정보 (지연만 있음)"""
+        time.sleep(delay)
+        return f"{ticker} info"
+
+    return {get_yf_stock_info.name: get_yf_stock_info}
+
+
+def legacy_response(llm, messages, tools):
+    """기존 get_ai_response: 동기 스트림 + 도구 순차 실행 + 재귀 (상한/취소 없음)"""
+    gathered = None
+    for chunk in llm.stream(messages):
+        yield chunk.content
+        gathered = chunk if gathered is None else gathered + chunk
+    if gathered.tool_calls:
+        messages = messages + [gathered]
+        for tool_call in gathered.tool_calls:
+            messages.append(tools[tool_call["name"]].invoke(tool_call))
+        yield from legacy_response(llm, messages, tools)
+
+
+def consume(tokens, render_delay: float) -> float:
+    start = time.perf_counter()
+    for token in tokens:
+        if token:
+            time.sleep(render_delay)  # 화면 렌더링
+    return time.perf_counter() - start
+
+
+def agent_tokens(run):
+    for event in run.events():
+        if event[0] == "token":
+            yield event[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기 재귀 vs 비동기 도구 루프")
+    parser.add_argument("--tool-delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--render-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    tools = make_tools(args.tool_delay)
+    messages = [SystemMessage("조력자"), HumanMessage("TSLA와 NVDA 비교해줘")]
+    llm = ToolCallingStubModel(token_delay=args.token_delay)
+
+    legacy = consume(legacy_response(llm, messages, tools), args.render_delay)
+    run = agent_loop.AgentRun(agent_loop.astream_agent(llm, messages, tools))
+    new = consume(agent_tokens(run), args.render_delay)
+    print(f"도구 2개 × {args.tool_delay}s, 토큰 렌더링 {args.render_delay}s")
+    print(f"마지막 토큰까지: 기존 {legacy:.2f}s → agent_loop {new:.2f}s")
+
+    # 도구 실행 중 취소
+    run = agent_loop.AgentRun(agent_loop.astream_agent(llm, messages, tools))
+    events = run.events()
+    next(e for e in events if e[0] == "ai")  # 도구 호출 직후
+    start = time.perf_counter()
+    run.cancel()
+    while not run.done:
+        time.sleep(0.001)
+    print(f"도구 실행 중 취소: {(time.perf_counter() - start) * 1e3:.1f} ms 만에 중단 (기존 방식은 취소 불가)")
+
+    # 도구 라운드 상한
+    looping = ToolCallingStubModel(token_delay=0, always_call_tools=True)
+    kinds = [e[0] for e in agent_loop.AgentRun(
+        agent_loop.astream_agent(looping, messages, make_tools(0), max_iterations=3)).events()]
+    assert kinds.count("ai") == 3 and kinds[-1] == "final", kinds
+    print(f"항상 도구를 부르는 모델: 라운드 {kinds.count('ai')}회 후 최종 답변 (모델 호출 {looping.calls}회)")
+
+
+if __name__ == "__main__":
+    main()
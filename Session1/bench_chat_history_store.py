@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+여러 세션의 대화 기록: 모듈 dict(InMemoryChatMessageHistory) vs SQLiteChatHistoryStore
+- 세션 N개가 번갈아 한 턴씩 대화하는 상황을 가짜 메시지로 재현 (네트워크/LLM 없음)
+- 파이썬 힙 사용량(tracemalloc), 턴당 기록 시간, 재시작 후 세션을 다시 여는 시간 비교
+- 재시작 후에도 최근 메시지가 그대로 복원되는지 확인
+
+실행: python bench_chat_history_store.py --sessions 2000 --turns 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from chat_history_store import InMemoryChatHistoryStore, SQLiteChatHistoryStore
+
+
+def run(store, sessions: int, turns: int) -> float:
+    """세션들이 돌아가며 turns번씩 대화. 반환: 턴당 평균 시간(ms)"""
+    start = time.perf_counter()
+    for turn in range(turns):
+        for s in range(sessions):
+            history = store.get_session_history(f"user-{s}")
+            if turn == 0:
+                history.add_message(SystemMessage("너는 사용자를 도와주는 친절한 조력자야."))
+            history.messages  # 모델 호출 전 기록 조회
+            history.add_messages([HumanMessage(f"{s}번 사용자의 {turn}번째 질문입니다. " * 5),
+                                  AIMessage(f"{turn}번째 질문에 대한 답변입니다. " * 20)])
+    return (time.perf_counter() - start) / (sessions * turns) * 1e3
+
+
+def measure(label: str, make_store, sessions: int, turns: int):
+    tracemalloc.start()
+    store = make_store()
+    per_turn = run(store, sessions, turns)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} 힙 {current / 1024 / 1024:7.1f} MB, 턴당 {per_turn:.3f} ms")
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dict vs SQLite 대화 기록 저장소")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--max-sessions", type=int, default=200, help="메모리에 유지할 세션 수")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "chat_history.sqlite")
+    print(f"세션 {args.sessions}개 × {args.turns}턴")
+    measure("dict (기존)", InMemoryChatHistoryStore, args.sessions, args.turns)
+    store = measure(f"SQLite (LRU {args.max_sessions})",
+                    lambda: SQLiteChatHistoryStore(path, load_last=10, max_sessions=args.max_sessions, compact_seconds=0),
+                    args.sessions, args.turns)
+    expected = store.get_session_history("user-7").messages
+    store.close()
+
+    # 재시작: 새 저장소 객체로 세션을 다시 열어 최근 메시지만 읽는지 확인
+    restarted = SQLiteChatHistoryStore(path, load_last=10, compact_seconds=0)
+    start = time.perf_counter()
+    restored = restarted.get_session_history("user-7").messages
+    print(f"재시작 후 세션 열기: {(time.perf_counter() - start) * 1e3:.2f} ms, 메시지 {len(restored)}개 (시스템 + 최근 10개)")
+    assert [m.content for m in restored] == [m.content for m in expected]
+
+    deleted = SQLiteChatHistoryStore(path, keep_messages=4, compact_seconds=0).compact()
+    print(f"압축(세션당 최근 4개 유지): 메시지 {deleted:,}개 삭제, 남은 수 {restarted.stats()['messages']:,}")
+
+
+if __name__ == "__main__":
+    main()
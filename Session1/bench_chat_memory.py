@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+긴 대화에서 턴당 프롬프트 크기: 전체 히스토리 재전송 vs chat_memory
+- 매 턴 사용자 질문 + 도구 호출(큰 주가 표) + 답변을 쌓는 가짜 대화로 네트워크 없이 실행
+- 요약 모델은 고정 길이 응답을 돌려주는 가짜 모델 (요약 호출 횟수 확인)
+- RunnableWithMessageHistory에서 그대로 쓸 수 있는지도 확인
+
+실행: python bench_chat_memory.py --turns 40
+"""
+
+import argparse
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables.history import RunnableWithMessageHistory
+
+from chat_memory import ConversationMemory, message_tokens
+
+
+class CountingSummarizer:
+    """호출 횟수만 세는 요약 모델"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return AIMessage("사용자는 TSLA/NVDA 주가 흐름을 비교 중이며 1년 수익률과 변동성을 확인했다. " * 3)
+
+
+def turn_messages(i: int) -> list:
+    ticker = ("TSLA", "NVDA", "AAPL")[i % 3]
+    table = "\n".join(f"| 2025-01-{d:02d} | {100 + d + i:.2f} | {1_000_000 + d * 1000} |" for d in range(1, 29))
+    call = {"name": "get_yf_stock_history", "args": {"ticker": ticker, "period": "1mo"}, "id": f"call-{i}", "type": "tool_call"}
+    return [
+        HumanMessage(f"{ticker} 최근 한 달 주가 보여주고 추세 설명해줘 ({i}번째 질문)"),
+        AIMessage("", tool_calls=[call]),
+        ToolMessage(table, tool_call_id=f"call-{i}", name="get_yf_stock_history"),
+        AIMessage(f"{ticker}는 한 달 동안 완만히 상승했습니다. 거래량은 평균 수준입니다. " * 4),
+    ]
+
+
+def prompt_tokens(messages) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 히스토리 vs chat_memory 프롬프트 크기")
+    parser.add_argument("--turns", type=int, default=40)
+    args = parser.parse_args()
+
+    system = SystemMessage("너는 사용자를 친절하게 최선을 다해서 돕는 인공지능 조력자이다.")
+    full = [system]
+    summarizer = CountingSummarizer()
+    memory = ConversationMemory(summarizer=summarizer)
+    memory.add_message(system)
+
+    print(f"{'턴':>4}{'전체 히스토리':>14}{'chat_memory':>14}")
+    for i in range(1, args.turns + 1):
+        human, *rest = turn_messages(i)
+        full.append(human)
+        memory.add_message(human)
+        full_tokens, memory_tokens = prompt_tokens(full), prompt_tokens(memory.messages)
+        full.extend(rest)
+        memory.add_messages(rest)
+        if i in (1, 5, 10, 20, 40) or i == args.turns:
+            print(f"{i:>4}{full_tokens:>14,}{memory_tokens:>14,}")
+        assert memory_tokens <= memory.max_tokens, memory_tokens
+
+    print(f"요약 호출 {summarizer.calls}회, 요약된 턴 {memory.summarized_turns}개, 원문 유지 턴 {len(memory.turns)}개")
+
+    # RunnableWithMessageHistory 호환
+    store = {}
+    chain = RunnableWithMessageHistory(FakeListChatModel(responses=["네"] * 20),
+                                       lambda sid: store.setdefault(sid, ConversationMemory(keep_turns=2)))
+    for i in range(5):
+        chain.invoke([HumanMessage(f"질문 {i}")], config={"configurable": {"session_id": "s"}})
+    print(f"RunnableWithMessageHistory: 원문 턴 {len(store['s'].turns)}개, 요약 있음 {bool(store['s'].summary)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Streamlit 상호작용 1회당 클라이언트 준비 비용: 매번 새로 생성 vs llm_clients 공용 객체
+- 로컬 가짜 OpenAI 서버(chat/completions)로 네트워크 없이 실행, 서버가 받은 TCP 연결 수 집계
+- 기존: 재실행마다 ChatOpenAI 생성 + bind_tools(ALL_TOOLS), 입력마다 OpenAI() 생성 후 요청
+- 현재: 프로세스 공용 클라이언트/바인딩 재사용, keep-alive 연결 재사용
+
+실행: python bench_llm_clients.py --interactions 50 --latency 0.02
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from langchain_openai import ChatOpenAI
+from openai import OpenAI
+
+import llm_clients
+from tools_1 import ALL_TOOLS
+
+COMPLETION = {
+    "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "안녕하세요"}}],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+}
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+    disable_nagle_algorithm = True
+    wbufsize = -1  # 헤더와 본문을 한 번에 전송 (지연 ACK로 인한 40ms 대기 방지)
+    latency = 0.02
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with FakeOpenAIHandler.lock:
+            FakeOpenAIHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(latency: float) -> str:
+    FakeOpenAIHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def timed(label: str, interaction, n: int):
+    FakeOpenAIHandler.connections = 0
+    start = time.perf_counter()
+    for _ in range(n):
+        interaction()
+    per = (time.perf_counter() - start) / n * 1e3
+    print(f"{label:<34} {per:7.2f} ms/회, 서버 TCP 연결 {FakeOpenAIHandler.connections}개")
+    return per
+
+
+def main():
+    parser = argparse.ArgumentParser(description="클라이언트 재생성 vs 공용 클라이언트")
+    parser.add_argument("--interactions", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="가짜 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    base_url = start_server(args.latency)
+    messages = [{"role": "user", "content": "안녕"}]
+
+    print("[스크립트 재실행 준비: 모델 생성 + 도구 바인딩]")
+    legacy = timed("기존 (재실행마다 생성)",
+                   lambda: ChatOpenAI(model="gpt-4o-mini", base_url=base_url).bind_tools(ALL_TOOLS), args.interactions)
+    llm_clients.bind_tools(llm_clients.chat_model("gpt-4o-mini", base_url=base_url), ALL_TOOLS)  # 첫 생성은 제외
+    shared = timed("llm_clients (프로세스 공용)",
+                   lambda: llm_clients.bind_tools(llm_clients.chat_model("gpt-4o-mini", base_url=base_url), ALL_TOOLS),
+                   args.interactions)
+    print(f"→ 재실행당 {legacy:.2f} ms 절약")
+
+    print(f"[입력 1회: 클라이언트 준비 + 요청 (서버 지연 {args.latency * 1e3:.0f} ms)]")
+
+    def legacy_request():
+        client = OpenAI(base_url=base_url)
+        client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        client.close()
+
+    legacy = timed("기존 (입력마다 OpenAI())", legacy_request, args.interactions)
+    shared = timed("llm_clients (keep-alive 재사용)",
+                   lambda: llm_clients.openai_client(base_url).chat.completions.create(model="gpt-4o-mini", messages=messages),
+                   args.interactions)
+    print(f"→ 오버헤드(서버 지연 제외) {legacy - args.latency * 1e3:.2f} ms → {shared - args.latency * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+도구 데이터 미리 가져오기 효과: 모델이 도구 호출을 정하는 시간 동안 info/일봉 조회를 먼저 시작
+- yfinance 대신 지연만 있는 가짜 조회(market_data._ticker, bar_store.store.get_period)로 네트워크 없이 실행
+- 사용자 메시지 → (모델 첫 응답 대기) → 도구 호출(info + history, 종목별 동시 실행)까지 걸린 시간 비교
+- 도구 호출 쪽 market_data hit/병합 수로 캐시가 실제로 쓰였는지 확인
+
+실행: python bench_prefetch.py --model-delay 0.8 --fetch-delay 0.6
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from prefetch import Prefetcher, extract_tickers, market_data
+
+MESSAGES = [
+    "테슬라와 엔비디아의 value factor 비교해줘.",
+    "Compare Apple and Microsoft over the last year",
+    "삼성전자랑 SK하이닉스 최근 주가 흐름 알려줘",
+]
+
+
+class FakeTicker:
+    def __init__(self, ticker: str, delay: float):
+        self.ticker, self.delay = ticker, delay
+
+    @property
+    def info(self):
+        time.sleep(self.delay)
+        return {"symbol": self.ticker, "currentPrice": 100.0}
+
+
+def install_fakes(delay: float):
+    index = pd.bdate_range(end="2025-06-30", periods=252)
+    bars = pd.DataFrame({"Close": np.linspace(100, 120, len(index))}, index=index)
+
+    def get_period(ticker, period="1y"):
+        time.sleep(delay)
+        return bars
+
+    market_data._ticker = lambda ticker: FakeTicker(ticker, delay)
+    market_data.bar_store.store.get_period = get_period
+
+
+def tool_phase(tickers: list) -> float:
+    """모델이 요청한 도구 호출 실행 (get_yf_stock_info + get_yf_stock_history, 동시 실행)"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(8) as pool:
+        jobs = [pool.submit(market_data.get_info, t) for t in tickers]
+        jobs += [pool.submit(market_data.get_history, t, "1y") for t in tickers]
+        for job in jobs:
+            job.result()
+    return time.perf_counter() - start
+
+
+def turn(message: str, model_delay: float, prefetcher=None) -> tuple:
+    start = time.perf_counter()
+    if prefetcher:
+        prefetcher.prefetch(message)
+    time.sleep(model_delay)  # 모델이 도구 호출을 만드는 시간
+    tool_time = tool_phase(extract_tickers(message))
+    return time.perf_counter() - start, tool_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도구 데이터 미리 가져오기 효과")
+    parser.add_argument("--model-delay", type=float, default=0.8, help="모델 첫 응답(도구 호출 결정) 시간")
+    parser.add_argument("--fetch-delay", type=float, default=0.6, help="info/일봉 조회 1회 지연")
+    args = parser.parse_args()
+
+    install_fakes(args.fetch_delay)
+    print(f"모델 {args.model_delay}s, 조회 {args.fetch_delay}s")
+    prefetcher = Prefetcher()
+    for label, active in (("미리 가져오기 없음", None), ("미리 가져오기", prefetcher)):
+        market_data.clear_cache()
+        totals = [turn(message, args.model_delay, active) for message in MESSAGES]
+        stats = market_data.cache_stats()
+        hits = stats["info"]["hits"] + stats["history"]["hits"]
+        coalesced = stats["info"]["coalesced"] + stats["history"]["coalesced"]
+        print(f"{label:<14} 턴 평균 {np.mean([t for t, _ in totals]):.2f}s, "
+              f"도구 단계 평균 {np.mean([t for _, t in totals]):.2f}s (캐시 hit {hits}, 진행 중 병합 {coalesced})")
+
+    print(f"prefetcher 통계: {prefetcher.stats()}")
+    for message in MESSAGES:
+        print(f"  {message} → {extract_tickers(message)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+도구 호출 인자 스트리밍: 스트림 종료 후 일괄 시작 vs 인자 JSON이 완성되는 즉시 시작
+- 도구 호출 3개의 인자를 몇 글자씩 나눠 생성하는 모델 스텁 (네트워크 없음)
+- 첫 호출은 느린 도구(차트 등), 나머지는 빠른 도구: 앞 도구가 뒤쪽 인자 생성과 겹치는지 확인
+- 결과 순서/내용이 두 방식에서 같은지 확인
+
+실행: python bench_tool_call_streaming.py --chunk-delay 0.02 --slow-tool 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import tool
+
+import agent_loop
+
+CALLS = [
+    ("get_stock_chart", {"ticker": "TSLA", "start_date": "2025-01-01", "end_date": "2025-06-30"}),
+    ("get_yf_stock_info", {"ticker": "TSLA"}),
+    ("get_yf_stock_info", {"ticker": "NVDA"}),
+]
+
+
+class ArgStreamingStubModel(BaseChatModel):
+    """CALLS의 인자 JSON을 chunk_chars 글자씩 chunk_delay 간격으로 생성, 도구 결과가 오면 짧은 답변"""
+
+    chunk_chars: int = 4
+    chunk_delay: float = 0.02
+
+    @property
+    def _llm_type(self) -> str:
+        return "arg-streaming-stub"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if isinstance(messages[-1], ToolMessage):
+            yield ChatGenerationChunk(message=AIMessageChunk(content="완료"))
+            return
+        for index, (name, args) in enumerate(CALLS):
+            text = json.dumps(args)
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                {"name": name, "id": f"call-{index}", "args": "", "index": index}]))
+            for i in range(0, len(text), self.chunk_chars):
+                await asyncio.sleep(self.chunk_delay)
+                yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                    {"name": None, "id": None, "args": text[i:i + self.chunk_chars], "index": index}]))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="완료"))])
+
+
+def make_tools(slow: float, fast: float) -> dict:
+    @tool
+    def get_stock_chart(ticker: str, start_date: str, end_date: str) -> str:
+        """느린 도구"""
+        time.sleep(slow)
+        return f"chart {ticker} {start_date}~{end_date}"
+
+    @tool
+    def get_yf_stock_info(ticker: str) -> str:
+        """빠른 도구"""
+        time.sleep(fast)
+        return f"info {ticker}"
+
+    return {t.name: t for t in (get_stock_chart, get_yf_stock_info)}
+
+
+def run(llm, tools, early: bool):
+    start = time.perf_counter()
+    stream_end = None
+    results = []
+    for event in agent_loop.AgentRun(agent_loop.astream_agent(
+            llm, [HumanMessage("테슬라 차트와 테슬라/엔비디아 정보")], tools, start_tools_early=early)).events():
+        if event[0] == "ai":
+            stream_end = time.perf_counter() - start
+        elif event[0] == "tool":
+            results.append(event[1].content)
+    return stream_end, time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도구 인자 스트리밍 중 도구 미리 시작")
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--slow-tool", type=float, default=1.0)
+    parser.add_argument("--fast-tool", type=float, default=0.3)
+    args = parser.parse_args()
+
+    llm = ArgStreamingStubModel(chunk_delay=args.chunk_delay)
+    tools = make_tools(args.slow_tool, args.fast_tool)
+    run(llm, tools, True)  # 스레드 풀/이벤트 루프 준비
+
+    late_stream, late_total, late_results = run(llm, tools, False)
+    early_stream, early_total, early_results = run(llm, tools, True)
+    assert late_results == early_results, (late_results, early_results)
+    print(f"도구 호출 {len(CALLS)}개 (느린 도구 {args.slow_tool}s, 빠른 도구 {args.fast_tool}s)")
+    print(f"스트림 종료 후 시작:  인자 생성 {late_stream:.2f}s, 답변까지 {late_total:.2f}s")
+    print(f"인자 완성 즉시 시작:  인자 생성 {early_stream:.2f}s, 답변까지 {early_total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
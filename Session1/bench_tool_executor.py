@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+한 응답의 여러 도구 호출: 순차 실행 vs tool_executor 병렬 실행
+- 지연(sleep)만 있는 가짜 도구로 네트워크 없이 실행 (TSLA/NVDA 비교처럼 도구 4개 호출)
+- 결과 순서 유지, 느린 도구의 제한 시간 초과 처리 확인
+
+실행: python bench_tool_executor.py --delay 0.5
+"""
+
+import argparse
+import time
+
+from langchain_core.tools import tool
+
+from tool_executor import ToolExecutor
+
+
+def make_tools(delay: float) -> dict:
+    @tool
+    def get_yf_stock_info(ticker: str) -> str:
+        """가짜 종목 정보"""
+        time.sleep(delay)
+        return f"{ticker} info"
+
+    @tool
+    def get_yf_stock_history(ticker: str, period: str) -> str:
+        """가짜 주가 이력"""
+        time.sleep(delay * 1.5)
+        return f"{ticker} {period} history"
+
+    @tool
+    def slow_tool(ticker: str) -> str:
+        """제한 시간을 넘기는 도구"""
+        time.sleep(delay * 10)
+        return "never"
+
+    return {t.name: t for t in (get_yf_stock_info, get_yf_stock_history, slow_tool)}
+
+
+def tool_calls() -> list:
+    calls = []
+    for ticker in ("TSLA", "NVDA"):
+        calls.append({"name": "get_yf_stock_info", "args": {"ticker": ticker}, "id": f"info-{ticker}", "type": "tool_call"})
+        calls.append({"name": "get_yf_stock_history", "args": {"ticker": ticker, "period": "1y"},
+                      "id": f"hist-{ticker}", "type": "tool_call"})
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도구 호출 순차 vs 병렬")
+    parser.add_argument("--delay", type=float, default=0.5, help="도구 1회 지연(초)")
+    args = parser.parse_args()
+
+    tools = make_tools(args.delay)
+    calls = tool_calls()
+
+    start = time.perf_counter()
+    sequential = [tools[c["name"]].invoke(c) for c in calls]
+    seq_time = time.perf_counter() - start
+
+    executor = ToolExecutor(timeouts={"slow_tool": args.delay * 3})
+    start = time.perf_counter()
+    parallel = executor.run_tool_calls(calls, tools)
+    par_time = time.perf_counter() - start
+
+    assert [m.content for m in parallel] == [m.content for m in sequential]
+    assert [m.tool_call_id for m in parallel] == [c["id"] for c in calls]
+    print(f"도구 호출 {len(calls)}개: 순차 {seq_time:.2f}s → 병렬 {par_time:.2f}s")
+
+    start = time.perf_counter()
+    with_slow = executor.run_tool_calls(calls[:2] + [{"name": "slow_tool", "args": {"ticker": "TSLA"},
+                                                      "id": "slow", "type": "tool_call"}], tools)
+    print(f"느린 도구 포함: {time.perf_counter() - start:.2f}s, 마지막 결과: {with_slow[-1].status} / {with_slow[-1].content}")
+
+
+if __name__ == "__main__":
+    main()
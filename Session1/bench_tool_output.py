@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+도구 결과 크기 벤치마크: DataFrame.to_markdown() 전체 덤프 vs tool_output 직렬화
+- 합성 일봉(1mo ~ 10y)으로 네트워크 없이 실행
+- 기간별 토큰 수와 직렬화 시간을 비교 (기간이 길어져도 tool_output은 상한 안에 머무는지 확인)
+
+실행: python bench_tool_output.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+import tool_output
+from context_packer import count_tokens
+
+PERIODS = {"1mo": 21, "6mo": 126, "1y": 252, "5y": 1260, "10y": 2520}
+
+
+def synthetic_history(days: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2025-06-30", periods=days, tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, days)))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.005, days)),
+        "High": close * 1.01, "Low": close * 0.99, "Close": close,
+        "Volume": rng.integers(1_000_000, 50_000_000, days),
+        "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=index)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    text = fn()
+    return text, (time.perf_counter() - start) * 1e3
+
+
+def main():
+    print(f"상한: {tool_output.MAX_ROWS}행, {tool_output.MAX_TOKENS}토큰")
+    print(f"{'기간':<6}{'to_markdown 토큰':>18}{'tool_output 토큰':>18}{'ms':>8}  형식")
+    for period, days in PERIODS.items():
+        history = synthetic_history(days)
+        legacy = history.to_markdown()
+        text, ms = timed(lambda: tool_output.serialize_history(history))
+        tokens = count_tokens(text)
+        assert tokens <= tool_output.MAX_TOKENS, tokens
+        label = text.split("\n[", 1)[1].split("]", 1)[0]
+        print(f"{period:<6}{count_tokens(legacy):>18,}{tokens:>18,}{ms:>8.1f}  {label}")
+
+    history = synthetic_history(PERIODS["5y"])
+    print(f"5y summary 모드: {count_tokens(tool_output.serialize_history(history, mode='summary'))} 토큰")
+    text = tool_output.serialize_history(history, mode="lttb", columns=["Close"])
+    print(f"5y lttb Close만: {count_tokens(text)} 토큰")
+
+
+if __name__ == "__main__":
+    main()
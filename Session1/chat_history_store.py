@@ -0,0 +1,357 @@
+"""
+세션별 대화 기록 저장소 (SQLite, 여러 사용자/재시작 대응)
+- 메시지는 추가(INSERT)만 하고 수정하지 않음
+- 세션을 처음 열 때 머리말(첫 사용자 메시지 전의 시스템 메시지)과 최근 N개 메시지만 읽음
+- view(ConversationMemory)의 누적 요약도 저장해 두고, 다시 열 때 요약 + 요약 이후 메시지로 복원
+  (LRU에서 밀려났다 다시 열거나 프로세스를 재시작해도 요약 모델을 다시 부르지 않음)
+- 메모리에는 최근에 쓴 세션만 LRU로 유지 (밀려난 세션은 다음 요청 때 디스크에서 다시 읽음)
+- 백그라운드 스레드가 주기적으로 오래된 메시지/비활성 세션 정리 (압축)
+- get_session_history를 RunnableWithMessageHistory에 그대로 전달
+
+사용:
+history_store = SQLiteChatHistoryStore(memory_factory=lambda: ConversationMemory(summarizer=...))
+RunnableWithMessageHistory(llm, history_store.get_session_history)
+
+설정 (환경변수): CHAT_HISTORY_PATH, CHAT_HISTORY_LOAD_LAST, CHAT_HISTORY_MAX_SESSIONS,
+                 CHAT_HISTORY_KEEP_MESSAGES, CHAT_HISTORY_TTL_DAYS, CHAT_HISTORY_COMPACT_SECONDS
+"""
+
+import abc
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.chat_history import BaseChatMessageHistory, InMemoryChatMessageHistory
+from langchain_core.messages import HumanMessage, SystemMessage, message_to_dict, messages_from_dict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.getenv(
+    "CHAT_HISTORY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache", "chat_history.sqlite"),
+)
+LOAD_LAST = int(os.getenv("CHAT_HISTORY_LOAD_LAST", 40))              # 세션을 열 때 읽을 최근 메시지 수
+MAX_SESSIONS = int(os.getenv("CHAT_HISTORY_MAX_SESSIONS", 1000))      # 메모리에 유지할 세션 수
+KEEP_MESSAGES = int(os.getenv("CHAT_HISTORY_KEEP_MESSAGES", 500))     # 압축 후 세션당 디스크에 남길 메시지 수
+TTL_DAYS = float(os.getenv("CHAT_HISTORY_TTL_DAYS", 30))              # 이 기간 동안 쓰지 않은 세션은 삭제
+COMPACT_SECONDS = float(os.getenv("CHAT_HISTORY_COMPACT_SECONDS", 300))
+
+
+class ChatHistoryStore(abc.ABC):
+    """대화 기록 백엔드 공통 인터페이스"""
+
+    @abc.abstractmethod
+    def get_session_history(self, session_id: str) -> BaseChatMessageHistory:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryChatHistoryStore(ChatHistoryStore):
+    """기존 dict 방식 (테스트/단일 사용자용)"""
+
+    def __init__(self):
+        self._sessions = {}
+
+    def get_session_history(self, session_id: str) -> BaseChatMessageHistory:
+        if session_id not in self._sessions:
+            self._sessions[session_id] = InMemoryChatMessageHistory()
+        return self._sessions[session_id]
+
+
+class PersistentChatHistory(BaseChatMessageHistory):
+    """
+    한 세션의 기록: 추가는 디스크에 바로 기록하고, 모델에 보낼 메시지는 메모리의 view에서 읽음
+    view: memory_factory가 있으면 그 객체(예: ConversationMemory), 없으면 최근 load_last개 창
+    """
+
+    def __init__(self, store, session_id: str, view: BaseChatMessageHistory = None):
+        self.store = store
+        self.session_id = session_id
+        self.view = view
+        self._window = []
+        self._loaded = False
+        self._saved_summary = ""
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """처음 읽을 때만 디스크에서 최근 메시지를 가져옴"""
+        if self._loaded:
+            return
+        if hasattr(self.view, "restore"):
+            # 저장된 요약이 있으면 요약 + 그 이후 메시지로 복원 (정리/요약을 다시 실행하지 않음)
+            saved = self.store.load_summary(self.session_id) or {"summary": "", "summarized_turns": 0,
+                                                                  "first_kept_id": None}
+            loaded = self.store.load(self.session_id, since_id=saved["first_kept_id"])
+            self.view.restore(loaded, saved["summary"], saved["summarized_turns"])
+            self._saved_summary = saved["summary"]
+        elif self.view is not None:
+            self.view.add_messages(self.store.load(self.session_id))
+        else:
+            self._window = self.store.load(self.session_id)
+        self._loaded = True
+
+    def _save_summary(self):
+        """view의 요약이 바뀌었으면 저장"""
+        if not hasattr(self.view, "summary_state"):
+            return
+        state = self.view.summary_state()
+        if state["summary"] != self._saved_summary:
+            self.store.save_summary(self.session_id, **state)
+            self._saved_summary = state["summary"]
+
+    @property
+    def messages(self) -> list:
+        with self._lock:
+            self._load()
+            return self.view.messages if self.view is not None else list(self._window)
+
+    def add_messages(self, messages) -> None:
+        messages = list(messages)
+        with self._lock:
+            self._load()
+            self.store.append(self.session_id, messages)
+            if self.view is not None:
+                self.view.add_messages(messages)
+                self._save_summary()
+            else:
+                self._window = _trim_window(self._window + messages, self.store.load_last)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.store.delete(self.session_id)
+            if self.view is not None:
+                self.view.clear()
+            self._window = []
+            self._saved_summary = ""
+            self._loaded = True
+
+
+def _trim_window(messages: list, load_last: int) -> list:
+    """머리말 시스템 메시지 + 최근 load_last개. 창이 도구 결과 중간에서 시작하지 않도록 사용자 메시지부터"""
+    preamble = []
+    for msg in messages:
+        if not isinstance(msg, SystemMessage):
+            break
+        preamble.append(msg)
+    recent = messages[len(preamble):][-load_last:] if load_last else []
+    for i, msg in enumerate(recent):
+        if isinstance(msg, HumanMessage):
+            return preamble + recent[i:]
+    return preamble
+
+
+class SQLiteChatHistoryStore(ChatHistoryStore):
+    """SQLite 백엔드 + 세션 LRU + 백그라운드 압축"""
+
+    def __init__(self, path: str = DEFAULT_PATH, load_last: int = LOAD_LAST, max_sessions: int = MAX_SESSIONS,
+                 keep_messages: int = KEEP_MESSAGES, ttl_days: float = TTL_DAYS,
+                 compact_seconds: float = COMPACT_SECONDS, memory_factory=None):
+        self.path = path
+        self.load_last = load_last
+        self.max_sessions = max_sessions
+        self.keep_messages = keep_messages
+        self.ttl_days = ttl_days
+        self.compact_seconds = compact_seconds
+        self.memory_factory = memory_factory
+        self._conn = None
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()   # session_id -> PersistentChatHistory (LRU)
+        self._compactor = None
+        self._stop = threading.Event()
+        self._stats = {"opened": 0, "evicted": 0, "compactions": 0, "deleted_messages": 0}
+
+    # -------------------------------------------------------------------------
+    # 세션
+    # -------------------------------------------------------------------------
+
+    def get_session_history(self, session_id: str) -> PersistentChatHistory:
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is not None:
+                self._sessions.move_to_end(session_id)
+                return history
+            view = self.memory_factory() if self.memory_factory else None
+            history = self._sessions[session_id] = PersistentChatHistory(self, session_id, view)
+            self._stats["opened"] += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._stats["evicted"] += 1
+        self._start_compactor()
+        return history
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, cached_sessions=len(self._sessions))
+            stats["sessions"], stats["messages"] = self._db().execute(
+                "SELECT COUNT(DISTINCT session_id), COUNT(*) FROM chat_messages").fetchone()
+        return stats
+
+    # -------------------------------------------------------------------------
+    # 저장/조회
+    # -------------------------------------------------------------------------
+
+    def append(self, session_id: str, messages: list) -> None:
+        now = time.time()
+        rows = [(session_id, msg.type, json.dumps(message_to_dict(msg), ensure_ascii=False), now) for msg in messages]
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            db.executemany("INSERT INTO chat_messages (session_id, type, payload, created_at) VALUES (?, ?, ?, ?)", rows)
+            db.execute("INSERT OR REPLACE INTO chat_sessions (session_id, last_used) VALUES (?, ?)", (session_id, now))
+            db.execute("COMMIT")
+
+    def load(self, session_id: str, since_id: int = None) -> list:
+        """
+        머리말 시스템 메시지 + 최근 load_last개 (사용자 메시지부터 시작하도록 정리)
+        since_id: 이 id 이후 메시지 전부 (이전 메시지는 저장된 요약에 들어 있음)
+                  요약에 없는 메시지이므로 load_last로 자르지 않음 (view가 원문으로 두고 있던 턴들)
+        """
+        with self._lock:
+            db = self._db()
+            first_human = db.execute(
+                "SELECT MIN(id) FROM chat_messages WHERE session_id = ? AND type = 'human'", (session_id,)
+            ).fetchone()[0]
+            first_human = first_human if first_human is not None else 2 ** 62
+            preamble = db.execute(
+                "SELECT payload FROM chat_messages WHERE session_id = ? AND type = 'system' AND id < ? ORDER BY id",
+                (session_id, first_human),
+            ).fetchall()
+            if since_id is not None:
+                recent = db.execute(
+                    "SELECT payload FROM chat_messages WHERE session_id = ? AND id >= ? ORDER BY id",
+                    (session_id, max(first_human, since_id)),
+                ).fetchall()
+            else:
+                recent = db.execute(
+                    "SELECT payload FROM (SELECT id, payload FROM chat_messages WHERE session_id = ? AND id >= ?"
+                    " ORDER BY id DESC LIMIT ?) ORDER BY id",
+                    (session_id, first_human, self.load_last),
+                ).fetchall()
+        preamble = messages_from_dict([json.loads(row[0]) for row in preamble])
+        recent = messages_from_dict([json.loads(row[0]) for row in recent])
+        if since_id is not None:
+            return preamble + recent
+        return _trim_window(preamble + recent, self.load_last)
+
+    def save_summary(self, session_id: str, summary: str, summarized_turns: int, kept_turns: int) -> None:
+        """
+        view의 누적 요약 저장. 요약은 원문으로 남은 최근 kept_turns개 턴 이전의 메시지를 대신함
+        → 그 첫 턴(사용자 메시지)의 id를 함께 저장해 두고 다시 열 때 그 이후만 읽음
+        """
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT id FROM chat_messages WHERE session_id = ? AND type = 'human' ORDER BY id DESC LIMIT 1 OFFSET ?",
+                (session_id, kept_turns - 1),
+            ).fetchone() if kept_turns else None
+            if row is None:
+                row = db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM chat_messages WHERE session_id = ?",
+                                 (session_id,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO chat_summaries (session_id, summary, summarized_turns, first_kept_id, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (session_id, summary, summarized_turns, row[0], time.time()),
+            )
+
+    def load_summary(self, session_id: str):
+        """저장된 요약 {"summary", "summarized_turns", "first_kept_id"} (없으면 None)"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT summary, summarized_turns, first_kept_id FROM chat_summaries WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return dict(zip(("summary", "summarized_turns", "first_kept_id"), row)) if row else None
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+            db.execute("DELETE FROM chat_summaries WHERE session_id = ?", (session_id,))
+            db.execute("DELETE FROM chat_sessions WHERE session_id = ?", (session_id,))
+
+    # -------------------------------------------------------------------------
+    # 압축
+    # -------------------------------------------------------------------------
+
+    def compact(self) -> int:
+        """
+        비활성 세션 삭제 + 세션당 최근 keep_messages개만 남김 (머리말 시스템 메시지는 유지)
+        반환: 삭제한 메시지 수
+        """
+        cutoff = time.time() - self.ttl_days * 86400
+        with self._lock:
+            db = self._db()
+            before = db.total_changes
+            db.execute("BEGIN")
+            db.execute("DELETE FROM chat_messages WHERE session_id IN"
+                       " (SELECT session_id FROM chat_sessions WHERE last_used < ?)", (cutoff,))
+            db.execute("DELETE FROM chat_summaries WHERE session_id IN"
+                       " (SELECT session_id FROM chat_sessions WHERE last_used < ?)", (cutoff,))
+            db.execute("DELETE FROM chat_sessions WHERE last_used < ?", (cutoff,))
+            db.execute(
+                "DELETE FROM chat_messages WHERE id IN ("
+                " SELECT id FROM (SELECT id, type, ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY id DESC) AS rn,"
+                "  MIN(CASE WHEN type = 'human' THEN id END) OVER (PARTITION BY session_id) AS first_human"
+                "  FROM chat_messages)"
+                " WHERE rn > ? AND NOT (type = 'system' AND id < COALESCE(first_human, id + 1)))",
+                (self.keep_messages,),
+            )
+            db.execute("COMMIT")
+            deleted = db.total_changes - before
+            self._stats["compactions"] += 1
+            self._stats["deleted_messages"] += deleted
+        return deleted
+
+    def _start_compactor(self):
+        if self._compactor is not None or not self.compact_seconds:
+            return
+        with self._lock:
+            if self._compactor is not None:
+                return
+            self._compactor = threading.Thread(target=self._compact_loop, name="chat-history-compactor", daemon=True)
+            self._compactor.start()
+
+    def _compact_loop(self):
+        while not self._stop.wait(self.compact_seconds):
+            try:
+                self.compact()
+            except Exception as e:
+                logger.warning("대화 기록 압축 실패: %s", e)
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -------------------------------------------------------------------------
+    # 내부 구현
+    # -------------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        """처음 사용할 때 파일/테이블 생성 (import만으로는 디스크를 건드리지 않음)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_messages ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, type TEXT NOT NULL,"
+                " payload TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS chat_messages_session ON chat_messages (session_id, id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS chat_sessions (session_id TEXT PRIMARY KEY, last_used REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS chat_sessions_last_used ON chat_sessions (last_used)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_summaries (session_id TEXT PRIMARY KEY, summary TEXT NOT NULL,"
+                " summarized_turns INTEGER NOT NULL, first_kept_id INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
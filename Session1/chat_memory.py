@@ -0,0 +1,215 @@
+"""
+토큰 상한이 있는 대화 메모리 (챗봇용)
+- 최근 대화 턴은 원문 그대로, 오래된 턴은 LLM으로 누적 요약에 합침
+- 최근 턴이 아닌 도구 결과(ToolMessage)는 짧은 표시로 교체 (tool_call_id는 유지해 API 짝이 맞음)
+- 모델에 보내는 메시지가 토큰 상한을 넘지 않도록 오래된 턴부터 요약으로 이동
+- BaseChatMessageHistory를 구현하므로 RunnableWithMessageHistory에도 그대로 사용 가능
+
+사용:
+memory = ConversationMemory(summarizer=ChatOpenAI(model="gpt-4o-mini"))
+memory.add_message(HumanMessage("..."))
+llm.invoke(memory.messages)   # 앞부분 시스템 메시지 + 요약 + 최근 턴
+memory.add_message(response)  # 도구 호출이 없는 AI 답변으로 턴이 끝나면 자동으로 정리(compact)
+
+설정 (환경변수): MEMORY_MAX_TOKENS, MEMORY_KEEP_TURNS, MEMORY_FOLD_TURNS, MEMORY_TOOL_PAYLOAD_TOKENS,
+                 MEMORY_SUMMARY_TOKENS
+"""
+
+import logging
+import os
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+# 토큰 계산은 Session3 context_packer(tiktoken) 사용
+import _session3_path  # noqa: F401
+from context_packer import count_tokens, excerpt
+
+logger = logging.getLogger(__name__)
+
+MAX_TOKENS = int(os.getenv("MEMORY_MAX_TOKENS", 3000))               # 모델에 보내는 대화 전체 상한
+KEEP_TURNS = int(os.getenv("MEMORY_KEEP_TURNS", 6))                  # 원문으로 남길 최근 턴 수
+TOOL_PAYLOAD_TOKENS = int(os.getenv("MEMORY_TOOL_PAYLOAD_TOKENS", 300))  # 지난 턴 도구 결과를 남길 최대 크기
+SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", 300))        # 누적 요약 길이
+FOLD_TURNS = int(os.getenv("MEMORY_FOLD_TURNS", 3))                  # 턴 수 초과 시 한 번에 요약할 턴 수 (요약 호출 횟수 절감)
+LOW_WATER = 0.7      # 토큰 상한 초과 시 이 비율까지 줄임
+MESSAGE_OVERHEAD = 4  # 메시지마다 붙는 역할/구분 토큰
+
+SUMMARY_PROMPT = """다음은 지금까지의 대화 요약과 그 뒤에 이어진 대화입니다.
+둘을 합쳐 {tokens}토큰 이내의 한국어 요약으로 다시 써 주세요.
+사용자의 목표/선호, 언급된 종목과 기간, 도구로 확인한 핵심 수치, 이미 내린 결론 위주로 쓰고 인사말은 생략하세요.
+
+[기존 요약]
+{summary}
+
+[이어진 대화]
+{transcript}"""
+
+
+def message_tokens(message) -> int:
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    tokens = count_tokens(content) + MESSAGE_OVERHEAD
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += count_tokens(f"{tool_call['name']}{tool_call['args']}")
+    return tokens
+
+
+def transcript(messages: list) -> str:
+    """요약 프롬프트용 대화 기록 (도구 결과는 앞부분만)"""
+    lines = []
+    for msg in messages:
+        if isinstance(msg, HumanMessage):
+            lines.append(f"사용자: {msg.content}")
+        elif isinstance(msg, ToolMessage):
+            lines.append(f"도구({msg.name}): {excerpt(str(msg.content), 80)}")
+        elif isinstance(msg, AIMessage):
+            if msg.content:
+                lines.append(f"AI: {msg.content}")
+            for tool_call in msg.tool_calls:
+                lines.append(f"AI 도구 호출: {tool_call['name']}({tool_call['args']})")
+    return "\n".join(lines)
+
+
+class ConversationMemory(BaseChatMessageHistory):
+    """
+    메시지 = 머리말(첫 사용자 메시지 전의 시스템/인사 메시지) + 요약 + 턴들
+    턴 = 사용자 메시지 하나부터 다음 사용자 메시지 전까지 (AI 도구 호출과 도구 결과가 같은 턴에 묶임)
+    summarizer가 없으면 오래된 턴은 요약 대신 발췌로 남김
+    """
+
+    def __init__(self, summarizer=None, max_tokens: int = MAX_TOKENS, keep_turns: int = KEEP_TURNS,
+                 fold_turns: int = FOLD_TURNS, tool_payload_tokens: int = TOOL_PAYLOAD_TOKENS,
+                 summary_tokens: int = SUMMARY_TOKENS):
+        self.summarizer = summarizer
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.fold_turns = max(1, fold_turns)
+        self.tool_payload_tokens = tool_payload_tokens
+        self.summary_tokens = summary_tokens
+        self.preamble = []
+        self.turns = []
+        self.summary = ""
+        self.summarized_turns = 0
+
+    # --- BaseChatMessageHistory ---
+    @property
+    def messages(self) -> list:
+        """모델에 보낼 메시지"""
+        summary = [SystemMessage(f"이전 대화 요약: {self.summary}")] if self.summary else []
+        return self.preamble + summary + [msg for turn in self.turns for msg in turn]
+
+    def add_messages(self, messages) -> None:
+        self._append(messages)
+        # RunnableWithMessageHistory는 한 턴의 입력/출력을 한 번에 추가하므로 AI 답변으로 끝나면 정리
+        last = messages[-1] if messages else None
+        if isinstance(last, AIMessage) and not last.tool_calls:
+            self.compact()
+
+    def clear(self) -> None:
+        self.preamble, self.turns, self.summary, self.summarized_turns = [], [], "", 0
+
+    # --- 저장/복원 (chat_history_store가 요약을 디스크에 보관) ---
+    def summary_state(self) -> dict:
+        """저장할 요약 상태. kept_turns: 요약에 들어가지 않고 원문으로 남은 최근 턴 수"""
+        return {"summary": self.summary, "summarized_turns": self.summarized_turns, "kept_turns": len(self.turns)}
+
+    def restore(self, messages: list, summary: str = "", summarized_turns: int = 0) -> None:
+        """저장된 요약 + 그 이후 메시지로 상태 복원 (요약 모델을 다시 호출하지 않음)"""
+        self.clear()
+        self._append(messages)
+        self.summary, self.summarized_turns = summary, summarized_turns
+        self._stub_tool_payloads()
+
+    def _append(self, messages) -> None:
+        for message in messages:
+            if isinstance(message, HumanMessage):
+                if self.turns:
+                    self.turns[-1] = _drop_unanswered_tool_calls(self.turns[-1])
+                self.turns.append([message])
+            elif self.turns:
+                self.turns[-1].append(message)
+            else:
+                self.preamble.append(message)
+
+    # --- 정리 ---
+    def token_count(self) -> int:
+        return sum(message_tokens(msg) for msg in self.messages)
+
+    def compact(self) -> None:
+        """지난 턴 도구 결과 정리 → 오래된 턴 요약 → 토큰 상한까지 추가 요약"""
+        self._stub_tool_payloads()
+
+        # 턴 수: keep_turns + fold_turns - 1 까지는 두었다가 keep_turns로 한 번에 줄임
+        overflow = 0
+        if len(self.turns) >= self.keep_turns + self.fold_turns:
+            overflow = len(self.turns) - self.keep_turns
+        # 토큰 상한: 넘으면 상한의 LOW_WATER 비율 아래로 내려갈 때까지 오래된 턴부터 추가로 요약
+        # (매 턴 요약하지 않도록 여유를 둠, 최신 턴 하나는 항상 원문 유지)
+        if self._tokens_without(overflow) > self.max_tokens:
+            while overflow < len(self.turns) - 1 and self._tokens_without(overflow) > self.max_tokens * LOW_WATER:
+                overflow += 1
+        if overflow:
+            self._summarize(self.turns[:overflow])
+            self.turns = self.turns[overflow:]
+
+    def _stub_tool_payloads(self) -> None:
+        """지난 턴의 큰 도구 결과는 한 줄 표시로 교체 (최신 턴은 원문 유지)"""
+        for turn in self.turns[:-1]:
+            for i, msg in enumerate(turn):
+                if isinstance(msg, ToolMessage) and message_tokens(msg) > self.tool_payload_tokens:
+                    turn[i] = msg.model_copy(update={
+                        "content": f"[이전 도구 결과 생략: {msg.name}, 약 {message_tokens(msg)}토큰]"})
+
+    def _tokens_without(self, n_turns: int) -> int:
+        """오래된 n개 턴을 요약으로 옮겼을 때의 토큰 수 (요약은 최대 길이로 가정)"""
+        kept = [msg for turn in self.turns[n_turns:] for msg in turn]
+        summary = self.summary_tokens + MESSAGE_OVERHEAD if (self.summary or n_turns) else 0
+        return sum(message_tokens(msg) for msg in self.preamble + kept) + summary
+
+    def _summarize(self, turns: list) -> None:
+        text = transcript([msg for turn in turns for msg in turn])
+        self.summarized_turns += len(turns)
+        if self.summarizer is not None:
+            try:
+                prompt = SUMMARY_PROMPT.format(tokens=self.summary_tokens, summary=self.summary or "(없음)",
+                                               transcript=text)
+                self.summary = excerpt(self.summarizer.invoke(prompt).content, self.summary_tokens)
+                return
+            except Exception as e:
+                logger.warning("대화 요약 실패, 발췌로 대체합니다: %s", e)
+        # 요약 모델이 없거나 실패하면 최근 내용 위주 발췌
+        combined = f"{self.summary}\n{text}".strip()
+        self.summary = excerpt_tail(combined, self.summary_tokens)
+
+
+def _drop_unanswered_tool_calls(turn: list) -> list:
+    """
+    중간에 취소된 턴 정리: 결과가 모두 오지 않은 도구 호출 AI 메시지와 그 일부 결과를 제거
+    (tool_calls에 대응하는 ToolMessage가 없으면 API가 요청을 거부함)
+    """
+    answered = {msg.tool_call_id for msg in turn if isinstance(msg, ToolMessage)}
+    dropped = set()
+    for msg in turn:
+        if isinstance(msg, AIMessage) and msg.tool_calls:
+            ids = {tool_call["id"] for tool_call in msg.tool_calls}
+            if not ids <= answered:
+                dropped |= ids
+    if not dropped:
+        return turn
+    return [msg for msg in turn
+            if not (isinstance(msg, AIMessage) and {tc["id"] for tc in msg.tool_calls} & dropped)
+            and not (isinstance(msg, ToolMessage) and msg.tool_call_id in dropped)]
+
+
+def excerpt_tail(text: str, budget_tokens: int) -> str:
+    """뒤쪽(최근) 줄부터 예산만큼 유지"""
+    kept, used = [], 0
+    for line in reversed(text.splitlines()):
+        tokens = count_tokens(line)
+        if used + tokens > budget_tokens:
+            if not kept:
+                kept.append(excerpt(line, budget_tokens))
+            break
+        kept.append(line)
+        used += tokens
+    return "\n".join(reversed(kept))
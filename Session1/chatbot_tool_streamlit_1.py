@@ -1,14 +1,24 @@
 # 테스트 질문: 테슬라와 엔비디아의 value factor 비교해줘.
 
-from openai import OpenAI
+import llm_clients
 from my_functions_1 import get_current_time, tools, get_yf_stock_info, get_yf_stock_history, get_yf_stock_recommendations
 import json
+import tool_executor
+import prefetch
 import streamlit as st
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI()
+client = llm_clients.openai_client()  # 프로세스 공용 클라이언트 (재실행/세션 간 연결 재사용)
+
+# 도구 이름 -> 함수 (인자는 모델이 만든 JSON 그대로 전달)
+FUNCTIONS = {
+    "get_current_time": get_current_time,
+    "get_yf_stock_info": get_yf_stock_info,
+    "get_yf_stock_history": get_yf_stock_history,
+    "get_yf_stock_recommendations": get_yf_stock_recommendations,
+}
 
 def get_ai_response(messages, tools=None):
     response = client.chat.completions.create(
@@ -33,34 +43,29 @@ for msg in st.session_state.messages:
 if user_input := st.chat_input():
     st.session_state.messages.append({"role": "user", "content": user_input}) 
     st.chat_message("user").write(user_input)
+    prefetch.prefetch(user_input)  # 메시지에 나온 종목 데이터를 모델 응답을 기다리는 동안 미리 조회
     
     response = get_ai_response(st.session_state.messages, tools=tools) 
     ai_msg = response.choices[0].message 
 
     tool_calls = ai_msg.tool_calls 
     if tool_calls:
+        calls = []
         for tool_call in tool_calls:
             tool_name = tool_call.function.name 
-            tool_call_id = tool_call.id   
             arguments = json.loads(tool_call.function.arguments)    
-            
-            if tool_name == "get_current_time": 
-                func_result = get_current_time(timezone=arguments['timezone']), 
-
-            elif tool_name == "get_yf_stock_info":
-                func_result = get_yf_stock_info(ticker=arguments['ticker'])
-
-            elif tool_name == "get_yf_stock_history":
-                func_result = get_yf_stock_history(ticker=arguments['ticker'], period=arguments['period'])   
-
-            elif tool_name == "get_yf_stock_recommendations":
-                func_result = get_yf_stock_recommendations(ticker=arguments['ticker'])                             
+            func = FUNCTIONS.get(tool_name)
+            if func is None:  # 모델이 없는 도구를 부르면 오류 결과로 전달 (스크립트가 멈추지 않도록)
+                func, arguments = tool_executor.unknown_tool, {"name": tool_name}
+            calls.append((tool_name, func, arguments))
 
+        # 여러 도구 호출은 동시에 실행 (결과는 호출 순서대로, 도구별 제한 시간 적용)
+        for tool_call, func_result in zip(tool_calls, tool_executor.run_calls(calls)):
             st.session_state.messages.append({
                 "role": "function",
-                "tool_call_id": tool_call_id,
-                "name": tool_name,
-                "content": func_result,
+                "tool_call_id": tool_call.id,
+                "name": tool_call.function.name,
+                "content": str(func_result),  # 실패/시간 초과는 오류 메시지 문자열
             })         
         st.session_state.messages.append({"role": "system", "content": "이제 주어진 결과를 참고해서 답변해."}) 
         response = get_ai_response(st.session_state.messages, tools=tools) 
@@ -1,79 +1,78 @@
 # 차트 도구 추가: 그래프 이미지를 텍스트로 변환할 때 용량 폭증
+# → 차트는 아티팩트 저장소에 저장하고 메시지에는 핸들(artifact:...)만 보관, 화면에 그릴 때 핸들로 읽음
 # 테스트 질문: 테슬라 6개월 주가 그래프 그려줘.
-# UI용과 Model용 구분한 히스토리 관리
+# UI용과 Model용 구분한 히스토리 관리 (모델용은 chat_memory: 최근 턴 + 요약, 토큰 상한)
 # streamlit 일관된 랜더링 방법
 # Execute: streamlit run langchain_chatbot_tool_streamlit.py
 # Terminate: ^C and close browser
 
-from langchain_openai import ChatOpenAI
+import llm_clients  # 프로세스 공용 모델/연결 풀 (재실행마다 새로 만들지 않음)
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
 from tools_1 import ALL_TOOLS, TOOL_DICT  # 도구들을 import
-import base64
+import _session3_path  # noqa: F401  (Session3 모듈 경로)
+import artifact_store
+import agent_loop
+import prefetch
+from chat_memory import ConversationMemory
 import streamlit as st
 from dotenv import load_dotenv
 
 load_dotenv()
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+llm = llm_clients.chat_model("gpt-4o-mini")
+summarizer = llm_clients.chat_model("gpt-4o-mini", temperature=0)  # 오래된 턴 요약용
 
-# 도구들을 LLM에 바인딩
-llm_with_tools = llm.bind_tools(ALL_TOOLS) 
+def show_chart(handle):
+    """차트 핸들의 이미지 파일을 화면에 표시 (세션 상태에는 이미지 데이터를 두지 않음)"""
+    with st.chat_message("assistant"):
+        if artifact_store.exists(handle):
+            st.image(artifact_store.path(handle))
+        else:
+            st.error(f"차트를 찾을 수 없습니다: {handle}")
+
+# 차트 답변 안내는 시스템 프롬프트에 둠: 도구 결과 사이에 시스템 메시지를 끼우면
+# 병렬 도구 호출([차트, 시세] 등)에서 한 AI 메시지의 ToolMessage들이 갈라져 API가 요청을 거부함
+CHART_NOTICE = "차트 도구 결과에 대해서는 최종 답변에 마크다운 이미지나 <img> 태그 등을 포함하지 마세요. 차트 렌더링은 UI가 담당하므로 텍스트로만 설명하세요."
+
+def model_messages_for(tool_msg):
+    """도구 결과 중 모델에 보낼 메시지 (차트는 핸들 대신 간단한 텍스트)"""
+    if tool_msg.name == "get_stock_chart" and tool_msg.status != "error":
+        return [ToolMessage(content="차트 이미지가 생성되었습니다", tool_call_id=tool_msg.tool_call_id, name=tool_msg.name)]
+    return [tool_msg]
 
 # 사용자의 메시지 처리하기 위한 함수: 스트리밍 처리
+# 모델/도구 호출은 agent_loop가 백그라운드 이벤트 루프에서 비동기로 실행 (도구 라운드 수 상한, 새 메시지 시 취소)
 def get_ai_response(messages):
-    response = llm_with_tools.stream(messages)
-    
-    gathered = None
-    for chunk in response: # 도구 호출이 있는 경우는 내용 없음
-        yield chunk
-        
-        if gathered is None:
-            gathered = chunk
-        else:
-            gathered += chunk
-
-    if gathered.tool_calls:
-        # st.session_state.messages.append(gathered)
-        st.session_state.ui_messages.append(gathered) # UI용: 원본 메시지 저장 (화면 표시용)
-        st.session_state.model_messages.append(gathered)  # 모델용: 원본 메시지 저장 (API 호출용)
-        
-        for tool_call in gathered.tool_calls:
-            selected_tool = TOOL_DICT[tool_call['name']]  # TOOL_DICT 사용
-            tool_msg = selected_tool.invoke(tool_call) # llm이 반환한 tool에 llm이 만든 args를 넣어 함수값 반환 받음: ToolMessage()
-
-            st.session_state.deferred_ui_tools.append(tool_msg) # UI용: 원본 데이터 저장 (이후에 이미지 표시용)
-
-            if tool_msg.name == "get_stock_chart":
-                st.session_state.model_messages.append(ToolMessage(
-                                content="차트 이미지가 생성되었습니다",  # base64 대신 간단한 텍스트
-                                tool_call_id=tool_msg.tool_call_id,
-                                name=tool_msg.name
-                                )
-                )
-                st.session_state.model_messages.append(SystemMessage(
-                    "최종 답변에 마크다운 이미지나 <img> 태그 등을 포함하지 마세요. 차트 렌더링은 UI가 담당하므로 텍스트로만 설명하세요."
-                    )
-                )
-
-            else:
-                st.session_state.model_messages.append(tool_msg)
-
-        for chunk in get_ai_response(st.session_state.model_messages): # 함수값(tool_msg)를 포함해서 다시 llm에 입력
-            yield chunk
+    run = agent_loop.AgentRun(agent_loop.astream_agent(llm, messages, TOOL_DICT, to_model=model_messages_for))
+    st.session_state.agent_run = run
+
+    # 도구 실행 중에도 세션 상태를 주기적으로 읽어 Streamlit이 재실행/중지 요청을 처리하게 함 (→ 작업 취소)
+    for event in run.events(on_idle=lambda: "agent_run" in st.session_state):
+        kind = event[0]
+        if kind == "token":
+            yield event[1]
+        elif kind == "ai":  # 도구 호출이 있는 경우는 내용 없음
+            st.session_state.ui_messages.append(event[1]) # UI용: 원본 메시지 저장 (화면 표시용)
+            st.session_state.memory.add_message(event[1])  # 모델용: 원본 메시지 저장 (API 호출용)
+        elif kind == "tool":
+            tool_msg, model_msgs = event[1], event[2]
+            st.session_state.deferred_ui_tools.append(tool_msg) # UI용: 도구 결과 저장 (차트는 핸들만, 이후에 이미지 표시용)
+            st.session_state.memory.add_messages(model_msgs)
 
 
 st.title("Langchain Chatbot")
 
 # 초기 시스템 메시지
 if "ui_messages" not in st.session_state:
-    initial_system = SystemMessage("너는 사용자를 친절하게 최선을 다해서 돕는 인공지능 조력자이다.")
+    initial_system = SystemMessage(f"너는 사용자를 친절하게 최선을 다해서 돕는 인공지능 조력자이다.\n{CHART_NOTICE}")
     initial_ai = AIMessage("안녕하세요! 무엇을 도와드릴까요?")
     
     # UI용: 화면 표시를 위한 메시지 (모든 데이터 포함)
     st.session_state["ui_messages"] = [initial_system, initial_ai]
     
-    # 모델용: API 호출을 위한 메시지 (토큰 절약)
-    st.session_state["model_messages"] = [initial_system, initial_ai]
+    # 모델용: API 호출을 위한 메시지 (토큰 절약, 오래된 턴은 요약되고 전체가 토큰 상한 안에 유지됨)
+    st.session_state["memory"] = ConversationMemory(summarizer=summarizer)
+    st.session_state.memory.add_messages([initial_system, initial_ai])
 
     # 임시 저장용
     st.session_state["deferred_ui_tools"] = []       
@@ -87,29 +86,35 @@ for msg in st.session_state.ui_messages:
         elif isinstance(msg, AIMessage):
             st.chat_message("assistant").write(msg.content)
         elif isinstance(msg, ToolMessage):  
-            if msg.name == "get_stock_chart":
-                # UI용 메시지에는 원본 base64 데이터가 있음
-                with st.chat_message("assistant"):
-                    st.image(base64.b64decode(msg.content))          
+            if msg.name == "get_stock_chart" and msg.status != "error":
+                # UI용 메시지에는 차트 핸들만 있음
+                show_chart(msg.content)
 
 # 사용자 입력 처리
 if prompt := st.chat_input():
     st.chat_message("user").write(prompt) # 사용자 메시지 출력
     # 사용자 메시지 저장
     st.session_state.ui_messages.append(HumanMessage(prompt))
-    st.session_state.model_messages.append(HumanMessage(prompt))    
+    st.session_state.memory.add_message(HumanMessage(prompt))    
+
+    # 메시지에 나온 종목의 info/주가를 모델이 도구 호출을 정하는 동안 미리 조회
+    prefetch.prefetch(prompt)
+
+    # 이전 응답이 아직 진행 중이면 취소 (모델 스트림/도구 대기 중단)
+    if st.session_state.get("agent_run") is not None:
+        st.session_state.agent_run.cancel()
+    st.session_state.deferred_ui_tools = []
 
-    response = get_ai_response(st.session_state.model_messages) # 모델 호출: 토큰 절약된 model_messages 사용
+    response = get_ai_response(st.session_state.memory.messages) # 모델 호출: 토큰 상한이 있는 memory 사용
     ai_msg = st.chat_message("assistant").write_stream(response) # AI 메시지 출력
     # AI 메시지 저장   
     st.session_state.ui_messages.append(AIMessage(ai_msg))
-    st.session_state.model_messages.append(AIMessage(ai_msg))    
+    st.session_state.memory.add_message(AIMessage(ai_msg))    
 
     # 툴 메시지가 그래프이면 화면에 먼저 렌더
     for tool_msg in st.session_state.deferred_ui_tools:
-        if tool_msg.name == "get_stock_chart":
-            with st.chat_message("assistant"):
-                st.image(base64.b64decode(tool_msg.content))
+        if tool_msg.name == "get_stock_chart" and tool_msg.status != "error":
+            show_chart(tool_msg.content)
 
     # 그 다음 한 번에 히스토리에 기록
     st.session_state.ui_messages.extend(st.session_state.deferred_ui_tools)
@@ -1,4 +1,5 @@
-from langchain_core.chat_history import InMemoryChatMessageHistory  # 대화를 기록하는 클래스
+from chat_memory import ConversationMemory  # 대화를 기록하는 클래스 (최근 턴 + 요약, 토큰 상한)
+from chat_history_store import SQLiteChatHistoryStore  # 세션별 대화를 디스크(SQLite)에 저장
 from langchain_core.runnables.history import RunnableWithMessageHistory  # 대화 기록을 활용하는 wrapper
 from langchain_openai import ChatOpenAI 
 from langchain_core.messages import SystemMessage, HumanMessage
@@ -7,15 +8,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 llm = ChatOpenAI(model="gpt-4o")
+summarizer = ChatOpenAI(model="gpt-4o-mini", temperature=0)  # 오래된 대화 요약용
 
-# 대화를 저장할 딕셔너리
-store = {}
+# 대화 저장소: 재시작해도 유지, 메모리에는 최근 사용한 세션만 (세션별 최근 메시지 + 요약)
+history_store = SQLiteChatHistoryStore(memory_factory=lambda: ConversationMemory(summarizer=summarizer))
 
 # 대화 기록을 가져오는 함수(세션 ID 필요)
 def get_session_history(session_id: str):
-    if session_id not in store:
-        store[session_id] = InMemoryChatMessageHistory() # session_id를 키로해서 메모리 객체 생성
-    return store[session_id]
+    return history_store.get_session_history(session_id)
 
 # 대화 기록을 활용하는 모델을 랩퍼로 생성
 llm_with_memory = RunnableWithMessageHistory(llm, get_session_history)
@@ -23,10 +23,10 @@ llm_with_memory = RunnableWithMessageHistory(llm, get_session_history)
 # config에서 세션 ID를 설정
 config = {"configurable": {"session_id": "1234"}}
 
-# 초기 시스템 메시지를 메모리에 추가
+# 초기 시스템 메시지를 메모리에 추가 (새 세션일 때만, 이전 대화가 있으면 이어서 진행)
 system_message = SystemMessage(content="너는 사용자를 도와주는 친절한 조력자야.")
-store["1234"] = InMemoryChatMessageHistory()
-store["1234"].add_message(system_message)
+if not get_session_history("1234").messages:
+    get_session_history("1234").add_message(system_message)
 
 while True:
     user_input = input("사용자: ")
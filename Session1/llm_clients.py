@@ -0,0 +1,68 @@
+"""
+프로세스 공용 LLM 클라이언트 (Streamlit 재실행/세션 간 공유)
+- Streamlit은 상호작용마다 스크립트를 처음부터 다시 실행하지만 import한 모듈은 프로세스에 남음
+  → 여기서 만든 클라이언트/모델/도구 바인딩을 모든 세션과 재실행이 재사용
+- httpx 연결 풀(keep-alive)을 하나 두고 OpenAI SDK 클라이언트와 ChatOpenAI가 함께 사용
+- bind_tools 결과(도구 스키마 변환)도 (모델, 도구 이름 목록)별로 한 번만 생성
+
+사용:
+client = llm_clients.openai_client()                        # openai SDK
+llm = llm_clients.chat_model("gpt-4o-mini")                 # LangChain
+llm_with_tools = llm_clients.bind_tools(llm, ALL_TOOLS)
+
+설정 (환경변수): LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_KEEPALIVE_SECONDS, LLM_HTTP_TIMEOUT
+"""
+
+import os
+import threading
+from functools import lru_cache
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import OpenAI
+
+MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", 50))
+KEEPALIVE_SECONDS = float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", 120))
+TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", 120))
+
+_bindings = {}
+_bindings_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_SECONDS)
+
+
+@lru_cache(maxsize=None)
+def http_client() -> httpx.Client:
+    """동기 요청용 연결 풀 (스레드 안전)"""
+    return httpx.Client(limits=_limits(), timeout=httpx.Timeout(TIMEOUT, connect=10))
+
+
+@lru_cache(maxsize=None)
+def async_http_client() -> httpx.AsyncClient:
+    """비동기 요청용 연결 풀 (agent_loop의 공용 이벤트 루프에서 사용)"""
+    return httpx.AsyncClient(limits=_limits(), timeout=httpx.Timeout(TIMEOUT, connect=10))
+
+
+@lru_cache(maxsize=None)
+def openai_client(base_url: str = None) -> OpenAI:
+    """openai SDK 클라이언트 (공용 연결 풀 사용)"""
+    return OpenAI(base_url=base_url, http_client=http_client())
+
+
+@lru_cache(maxsize=None)
+def chat_model(model: str = "gpt-4o-mini", **kwargs) -> ChatOpenAI:
+    """모델/파라미터 조합별 ChatOpenAI 하나 (kwargs는 해시 가능한 값만)"""
+    return ChatOpenAI(model=model, http_client=http_client(), http_async_client=async_http_client(), **kwargs)
+
+
+def bind_tools(llm, tools: list):
+    """llm.bind_tools 결과를 (모델 객체, 도구 이름 목록)별로 재사용"""
+    key = (id(llm), tuple(tool.name for tool in tools))
+    with _bindings_lock:
+        bound = _bindings.get(key)
+        if bound is None or bound[0] is not llm:
+            bound = _bindings[key] = (llm, llm.bind_tools(tools))
+    return bound[1]
@@ -1,7 +1,10 @@
 from datetime import datetime
 import pytz
-import yfinance as yf
-from datetime import datetime
+
+# 시장 데이터는 Session3의 공용 캐시 계층을 통해 조회
+import _session3_path  # noqa: F401
+import market_data
+import tool_output
 
 
 def get_current_time(timezone: str = 'Asia/Seoul'):
@@ -12,22 +15,20 @@ def get_current_time(timezone: str = 'Asia/Seoul'):
     return now_timezone
 
 def get_yf_stock_info(ticker: str):
-    stock = yf.Ticker(ticker)
-    info = stock.info
-    print(info)
-    return str(info)
+    info = market_data.get_info(ticker)
+    info_text = tool_output.serialize_info(info)  # 주요 필드만
+    print(info_text)
+    return info_text
 
-def get_yf_stock_history(ticker: str, period: str):
-    stock = yf.Ticker(ticker)
-    history = stock.history(period=period)
-    history_md = history.to_markdown()
+def get_yf_stock_history(ticker: str, period: str, mode: str = 'auto'):
+    history = market_data.get_history(ticker, period=period)
+    history_md = tool_output.serialize_history(history, mode=mode)  # 요약 통계 + 행/토큰 상한 안의 표
     print(history_md)
     return history_md
 
 def get_yf_stock_recommendations(ticker: str):
-    stock = yf.Ticker(ticker)
-    recommendations = stock.recommendations
-    recommendations_md = recommendations.to_markdown()
+    recommendations = market_data.get_recommendations(ticker)
+    recommendations_md = tool_output.serialize_table(recommendations)
     print(recommendations_md)
     return recommendations_md
 
@@ -84,6 +85,11 @@ tools = [
                         'type': 'string',
                         'description': '주가 정보를 알고 싶은 기간을 입력하세요. (예: 1d, 5d, 1mo, 1y, 5y)',
                     },
+                    'mode': {
+                        'type': 'string',
+                        'enum': list(tool_output.HISTORY_MODES),
+                        'description': '반환 형식: auto(기간에 맞게 자동), summary(요약 통계만), full(일별), weekly(주봉), lttb(추세 모양 유지 다운샘플)',
+                    },
                 },
                 "required": ['ticker', 'period'],
             },
@@ -0,0 +1,156 @@
+"""
+도구 데이터 미리 가져오기 (모델이 도구 호출을 결정하는 동안)
+- 사용자 메시지에서 종목을 찾아(한글/영문 이름 별칭표 + 알려진 티커) 백그라운드에서 info와 일봉을 조회
+- 결과는 market_data 캐시(LRU + 요청 병합)와 bar_store 디스크에 남으므로,
+  도구 호출이 도착하면 대부분 캐시에서 바로 응답 (아직 받는 중이면 같은 다운로드를 기다림)
+- 같은 종목은 PREFETCH_TTL 동안 다시 미리 가져오지 않음
+
+사용:
+prefetch.prefetch("테슬라와 엔비디아 비교해줘")  # -> ["TSLA", "NVDA"] (바로 반환, 조회는 백그라운드)
+
+설정 (환경변수): PREFETCH_WORKERS, PREFETCH_PERIOD, PREFETCH_TTL
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 시장 데이터는 Session3의 공용 캐시 계층을 통해 조회
+import _session3_path  # noqa: F401
+import market_data
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.getenv("PREFETCH_WORKERS", 4))
+PERIOD = os.getenv("PREFETCH_PERIOD", "1y")       # 일봉 조회 기간 (bar_store가 더 긴 구간을 디스크에 확보)
+TTL = float(os.getenv("PREFETCH_TTL", 5 * 60))    # market_data info TTL(10분)보다 짧게
+
+# 이름(소문자) -> 티커. 한글 이름은 조사가 붙어도 찾도록 부분 문자열로, 영문은 단어 경계로 비교
+TICKER_ALIASES = {
+    # 미국
+    "테슬라": "TSLA", "tesla": "TSLA",
+    "엔비디아": "NVDA", "nvidia": "NVDA",
+    "애플": "AAPL", "apple": "AAPL",
+    "마이크로소프트": "MSFT", "마소": "MSFT", "microsoft": "MSFT",
+    "구글": "GOOGL", "알파벳": "GOOGL", "google": "GOOGL", "alphabet": "GOOGL",
+    "아마존": "AMZN", "amazon": "AMZN",
+    "메타": "META", "페이스북": "META", "facebook": "META",
+    "넷플릭스": "NFLX", "netflix": "NFLX",
+    "브로드컴": "AVGO", "broadcom": "AVGO",
+    "인텔": "INTC", "intel": "INTC",
+    "퀄컴": "QCOM", "qualcomm": "QCOM",
+    "마이크론": "MU", "micron": "MU",
+    "팔란티어": "PLTR", "palantir": "PLTR",
+    "코카콜라": "KO", "coca-cola": "KO", "coca cola": "KO",
+    "버크셔": "BRK-B", "berkshire": "BRK-B",
+    "제이피모건": "JPM", "jp모건": "JPM", "jpmorgan": "JPM",
+    "월마트": "WMT", "walmart": "WMT",
+    "디즈니": "DIS", "disney": "DIS",
+    "나이키": "NKE", "nike": "NKE",
+    "스타벅스": "SBUX", "starbucks": "SBUX",
+    "코스트코": "COST", "costco": "COST",
+    "오라클": "ORCL", "oracle": "ORCL",
+    "어도비": "ADBE", "adobe": "ADBE",
+    "세일즈포스": "CRM", "salesforce": "CRM",
+    "티에스엠씨": "TSM", "tsmc": "TSM",
+    "일라이릴리": "LLY", "eli lilly": "LLY",
+    "visa": "V",
+    "마스터카드": "MA", "mastercard": "MA",
+    # 한국
+    "삼성전자": "005930.KS", "samsung electronics": "005930.KS",
+    "sk하이닉스": "000660.KS", "하이닉스": "000660.KS", "sk hynix": "000660.KS",
+    "네이버": "035420.KS", "naver": "035420.KS",
+    "카카오": "035720.KS", "kakao": "035720.KS",
+    "현대차": "005380.KS", "현대자동차": "005380.KS", "hyundai motor": "005380.KS",
+    "기아": "000270.KS",
+    "lg에너지솔루션": "373220.KS",
+    "셀트리온": "068270.KS", "celltrion": "068270.KS",
+}
+
+# 별칭을 포함하지만 종목이 아닌 흔한 단어 (검색 전에 지움)
+NOT_TICKERS = ("메타버스", "애플리케이션", "인텔리전스", "아마존강")
+
+# 대문자 티커로 직접 쓴 경우 ("TSLA 주가") — 흔한 약어(AI, PER 등)와 섞이지 않도록 별칭표에 있는 티커만
+_KNOWN_SYMBOLS = {symbol for symbol in TICKER_ALIASES.values() if not symbol[0].isdigit()}
+_SYMBOL_PATTERN = re.compile(r"\$([A-Za-z]{1,5}(?:[.-][A-Za-z]{1,2})?)\b|\b([A-Z]{1,5}(?:[.-][A-Z]{1,2})?)\b")
+_ENGLISH_PATTERNS = {alias: re.compile(rf"\b{re.escape(alias)}\b")
+                     for alias in TICKER_ALIASES if alias.isascii()}
+
+
+def extract_tickers(text: str) -> list:
+    """메시지에 나온 종목 티커 (등장 순서, 중복 제거)"""
+    lowered = text.lower()
+    for word in NOT_TICKERS:
+        lowered = lowered.replace(word, " " * len(word))  # 위치(등장 순서)는 유지
+    found = []   # (위치, 티커)
+    for alias, symbol in TICKER_ALIASES.items():
+        if alias in _ENGLISH_PATTERNS:
+            match = _ENGLISH_PATTERNS[alias].search(lowered)
+            position = match.start() if match else -1
+        else:
+            position = lowered.find(alias)
+        if position >= 0:
+            found.append((position, symbol))
+    for match in _SYMBOL_PATTERN.finditer(text):
+        cashtag, symbol = match.groups()
+        if cashtag:  # $티커는 별칭표에 없어도 허용
+            found.append((match.start(), cashtag.upper()))
+        elif symbol in _KNOWN_SYMBOLS:
+            found.append((match.start(), symbol))
+
+    tickers = []
+    for _, symbol in sorted(found):
+        if symbol not in tickers:
+            tickers.append(symbol)
+    return tickers
+
+
+class Prefetcher:
+    """종목별 info/일봉 조회를 스레드 풀에서 미리 실행"""
+
+    def __init__(self, max_workers: int = WORKERS, period: str = PERIOD, ttl: float = TTL):
+        self.period = period
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._recent = {}   # 티커 -> 마지막으로 미리 가져온 시각
+        self._lock = threading.Lock()
+        self._stats = {"requested": 0, "skipped": 0, "failed": 0}
+
+    def prefetch(self, text: str) -> list:
+        """메시지에서 종목을 찾아 백그라운드 조회 시작. 찾은 티커 목록을 바로 반환"""
+        tickers = extract_tickers(text)
+        now = time.monotonic()
+        for ticker in tickers:
+            with self._lock:
+                if now - self._recent.get(ticker, -self.ttl) < self.ttl:
+                    self._stats["skipped"] += 1
+                    continue
+                self._recent[ticker] = now
+                self._stats["requested"] += 1
+            self._pool.submit(self._warm, ticker, "info", market_data.get_info)
+            self._pool.submit(self._warm, ticker, "history", lambda t: market_data.get_history(t, period=self.period))
+        return tickers
+
+    def _warm(self, ticker: str, kind: str, fetch):
+        try:
+            fetch(ticker)
+        except Exception as e:
+            # 미리 가져오기 실패는 무시 (도구 호출 때 다시 시도하고 오류도 그때 보고)
+            with self._lock:
+                self._stats["failed"] += 1
+                self._recent.pop(ticker, None)
+            logger.debug("%s %s 미리 가져오기 실패: %s", ticker, kind, e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+# 프로세스 전체에서 공유하는 기본 prefetcher
+prefetcher = Prefetcher()
+
+prefetch = prefetcher.prefetch
+prefetch_stats = prefetcher.stats
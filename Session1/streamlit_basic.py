@@ -5,17 +5,20 @@ In Streamlit:
 Every user interaction (e.g., submitting input) re-runs the script from top to bottom.
 But st.session_state persists across reruns, so you can store things like:
 Chat history, User inputs, Model state
+Clients/connection pools should not be rebuilt on every rerun: llm_clients keeps one per process
 """
 
 # To run this code, <streamlit run streamlit_basic.py> in a terminal. Then a browser will open.
 # To terminate a session, <Ctrl-C> in the terminal and close the browser.
 
 import streamlit as st
-from openai import OpenAI
+import llm_clients
 from dotenv import load_dotenv
 
 load_dotenv()
 
+client = llm_clients.openai_client()  # 모든 세션/재실행이 같은 클라이언트와 연결 풀 사용
+
 st.title("Chatbot")
 
 if "messages" not in st.session_state:
@@ -25,7 +28,6 @@ for msg in st.session_state.messages:
     st.chat_message(msg["role"]).write(msg["content"]) # 브라우저에 출력
 
 if prompt := st.chat_input():
-    client = OpenAI()
     st.session_state.messages.append({"role": "user", "content": prompt})
     st.chat_message("user").write(prompt) # 브라우저에 출력
     response = client.chat.completions.create(model="gpt-4o", messages=st.session_state.messages)
@@ -0,0 +1,99 @@
+"""
+한 번의 어시스턴트 응답에 들어 있는 여러 도구 호출을 동시에 실행
+- 공용 스레드 풀에서 병렬 실행 → 응답 지연이 도구 지연의 합이 아니라 최댓값
+- 결과는 도구 호출 순서 그대로 반환
+- 도구별 제한 시간: 넘으면 기다리지 않고 오류 결과로 대체 (모델이 그 사실을 보고 답변)
+
+사용:
+LangChain 도구:  tool_messages = tool_executor.run_tool_calls(ai_msg.tool_calls, TOOL_DICT)
+일반 함수:       results = tool_executor.run_calls([(name, fn, kwargs), ...])
+
+설정 (환경변수): TOOL_MAX_WORKERS, TOOL_TIMEOUT
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from langchain_core.messages import ToolMessage
+
+MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", 8))
+DEFAULT_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", 30))
+
+# 도구 이름 -> 제한 시간(초). 없으면 DEFAULT_TIMEOUT
+TOOL_TIMEOUTS = {
+    "get_current_time": 5,
+    "get_stock_chart": 60,
+}
+
+
+class ToolCallError(Exception):
+    """도구 실행 실패/시간 초과 (결과 자리에 담겨 반환됨)"""
+
+
+class ToolExecutor:
+    """
+    스레드 풀 기반 도구 실행기
+    시간 초과된 호출의 스레드는 백그라운드에서 끝날 때까지 돌고 결과는 버림
+    (풀을 재사용하므로 with 블록 종료 시 느린 도구를 기다리지 않음)
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, default_timeout: float = DEFAULT_TIMEOUT, timeouts: dict = None):
+        self.default_timeout = default_timeout
+        self.timeouts = dict(TOOL_TIMEOUTS if timeouts is None else timeouts)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout)
+
+    def run_calls(self, calls: list) -> list:
+        """
+        calls: [(이름, 함수, kwargs), ...] 를 동시에 실행
+        반환: 같은 순서의 결과 리스트. 실패/시간 초과는 ToolCallError 객체
+        """
+        started = time.monotonic()
+        futures = [self._pool.submit(fn, **kwargs) for _, fn, kwargs in calls]
+        results = []
+        for (name, _, _), future in zip(calls, futures):
+            # 제한 시간은 제출 시점부터 도구마다 따로 계산
+            remaining = max(0.0, started + self.timeout_for(name) - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeout:
+                future.cancel()
+                results.append(ToolCallError(f"{name} 시간 초과 ({self.timeout_for(name):g}초)"))
+            except ToolCallError as e:
+                results.append(e)
+            except Exception as e:
+                results.append(ToolCallError(f"{name} 실행 실패: {e}"))
+        return results
+
+    def run_tool_calls(self, tool_calls: list, tools: dict) -> list:
+        """LangChain tool_calls 실행 → 같은 순서의 ToolMessage 리스트 (실패는 status="error")"""
+        calls = []
+        for tool_call in tool_calls:
+            tool = tools.get(tool_call["name"])
+            if tool is None:
+                calls.append((tool_call["name"], unknown_tool, {"name": tool_call["name"]}))
+            else:
+                calls.append((tool_call["name"], tool.invoke, {"input": tool_call}))
+
+        messages = []
+        for tool_call, result in zip(tool_calls, self.run_calls(calls)):
+            if isinstance(result, ToolCallError):
+                result = ToolMessage(content=f"오류: {result}", tool_call_id=tool_call["id"],
+                                     name=tool_call["name"], status="error")
+            messages.append(result)
+        return messages
+
+
+def unknown_tool(name: str):
+    """등록되지 않은 도구 이름 대신 실행할 함수 (run_calls 결과에 ToolCallError로 남음)"""
+    raise ToolCallError(f"알 수 없는 도구: {name}")
+
+
+# 프로세스 전체에서 공유하는 기본 실행기
+executor = ToolExecutor()
+
+run_calls = executor.run_calls
+run_tool_calls = executor.run_tool_calls
@@ -0,0 +1,206 @@
+"""
+도구 결과 직렬화 (LLM에 넣을 표/딕셔너리를 행 수·토큰 상한 안에서 압축)
+- 주가 이력: 요약 통계 + 전체/주간/LTTB 다운샘플 표 중 기간에 맞는 것을 선택
+- 표: 열 선택, 숫자 반올림, 행 상한 (넘치면 처음/끝 행만)
+- 종목 정보: Yahoo info 전체 대신 주요 필드만 key: value 줄로
+- 최종 문자열이 토큰 상한을 넘으면 행 수를 줄여 다시 직렬화
+
+설정 (환경변수): TOOL_OUTPUT_MAX_ROWS, TOOL_OUTPUT_MAX_TOKENS
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# 토큰 계산은 Session3 context_packer(tiktoken) 사용
+import _session3_path  # noqa: F401
+from context_packer import count_tokens, excerpt
+
+MAX_ROWS = int(os.getenv("TOOL_OUTPUT_MAX_ROWS", 60))
+MAX_TOKENS = int(os.getenv("TOOL_OUTPUT_MAX_TOKENS", 1500))
+HISTORY_MODES = ("auto", "summary", "full", "weekly", "lttb")
+HISTORY_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]  # Dividends/Stock Splits는 기본 제외
+
+# get_yf_stock_info에서 기본으로 남길 필드 (순서대로 출력)
+INFO_FIELDS = [
+    "longName", "symbol", "exchange", "currency", "sector", "industry", "country",
+    "currentPrice", "previousClose", "marketCap", "enterpriseValue",
+    "trailingPE", "forwardPE", "priceToBook", "pegRatio", "enterpriseToEbitda",
+    "trailingEps", "forwardEps", "dividendYield", "payoutRatio", "beta",
+    "fiftyTwoWeekHigh", "fiftyTwoWeekLow", "fiftyDayAverage", "twoHundredDayAverage",
+    "totalRevenue", "revenueGrowth", "earningsGrowth", "grossMargins", "operatingMargins",
+    "profitMargins", "returnOnEquity", "debtToEquity", "freeCashflow",
+    "recommendationKey", "targetMeanPrice", "numberOfAnalystOpinions",
+]
+SUMMARY_TOKENS = 120  # longBusinessSummary 발췌 길이
+
+
+def _round(df: pd.DataFrame) -> pd.DataFrame:
+    """가격은 소수 둘째 자리, 거래량 등 큰 값은 정수로 (NaN이 있는 열은 nullable Int64)"""
+    out = df.copy()
+    for col in out.select_dtypes(include="number").columns:
+        if out[col].abs().max() >= 1e4:
+            # 비율 등에 섞인 ±inf는 정수로 바꿀 수 없으므로 결측으로 처리
+            out[col] = out[col].replace([float("inf"), float("-inf")], float("nan")).round().astype("Int64")
+        else:
+            out[col] = out[col].round(2)
+    return out
+
+
+def _format_index(df: pd.DataFrame) -> pd.DataFrame:
+    if isinstance(df.index, pd.DatetimeIndex):
+        df = df.copy()
+        df.index = df.index.strftime("%Y-%m-%d")
+    return df
+
+
+def _select(df: pd.DataFrame, columns) -> pd.DataFrame:
+    if not columns:
+        return df
+    keep = [c for c in columns if c in df.columns]
+    if not keep:
+        raise ValueError(f"없는 열입니다: {columns} (가능: {list(df.columns)})")
+    return df[keep]
+
+
+def lttb_indices(values, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: 모양(고점/저점)을 유지하며 n_out개 지점 선택"""
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n) if n_out >= n else np.linspace(0, n - 1, max(n_out, 1)).astype(int)
+
+    x = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)  # 첫/마지막 점 사이를 n_out-2개 구간으로
+    selected = [0]
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        a = selected[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        selected.append(start + int(np.nanargmax(area)) if len(area) else start)
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def weekly(history: pd.DataFrame) -> pd.DataFrame:
+    """일봉 → 주봉 (금요일 기준)"""
+    rules = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    agg = {col: rules.get(col, "last") for col in history.columns}
+    return history.resample("W-FRI").agg(agg).dropna(how="all")
+
+
+def history_summary(history: pd.DataFrame) -> str:
+    """기간 요약 통계 (시작/끝 종가, 수익률, 최고/최저와 날짜, 변동성, 평균 거래량)"""
+    close = history["Close"].dropna()
+    if close.empty:
+        return "데이터 없음"
+    first, last = close.iloc[0], close.iloc[-1]
+    returns = close.pct_change().dropna()
+    lines = [
+        f"기간: {close.index[0]:%Y-%m-%d} ~ {close.index[-1]:%Y-%m-%d} ({len(close)} 거래일)",
+        f"종가: {first:.2f} → {last:.2f} ({(last / first - 1) * 100:+.2f}%)",
+        f"최고 종가: {close.max():.2f} ({close.idxmax():%Y-%m-%d}), 최저 종가: {close.min():.2f} ({close.idxmin():%Y-%m-%d})",
+    ]
+    if len(returns) > 1:
+        lines.append(f"일간 변동성: {returns.std() * 100:.2f}% (연율 {returns.std() * np.sqrt(252) * 100:.1f}%)")
+    if "Volume" in history:
+        lines.append(f"평균 거래량: {history['Volume'].mean():,.0f}")
+    return "\n".join(lines)
+
+
+def _history_table(history: pd.DataFrame, mode: str, max_rows: int) -> tuple:
+    """(모드 설명, 표) — auto는 행 수에 따라 full → weekly → lttb 순으로 선택"""
+    if mode == "auto":
+        if len(history) <= max_rows:
+            mode = "full"
+        elif len(weekly(history)) <= max_rows:
+            mode = "weekly"
+        else:
+            mode = "lttb"
+
+    if mode == "full":
+        table = history
+        if len(table) > max_rows:
+            return f"최근 {max_rows}거래일", table.tail(max_rows)
+        return "일별", table
+    if mode == "weekly":
+        table = weekly(history)
+        if len(table) > max_rows:
+            return f"주간 (최근 {max_rows}주)", table.tail(max_rows)
+        return "주간", table
+    idx = lttb_indices(history["Close"].to_numpy(), max_rows)
+    return f"종가 모양을 유지한 {len(idx)}개 지점 (LTTB)", history.iloc[idx]
+
+
+def serialize_history(history: pd.DataFrame, mode: str = "auto", columns=None,
+                      max_rows: int = MAX_ROWS, max_tokens: int = MAX_TOKENS) -> str:
+    """
+    주가 이력을 LLM용 문자열로 변환
+    mode: auto | summary(통계만) | full(일별) | weekly(주봉) | lttb(다운샘플)
+    """
+    if mode not in HISTORY_MODES:
+        raise ValueError(f"알 수 없는 모드: {mode} (가능: {', '.join(HISTORY_MODES)})")
+    if history.empty:
+        return "데이터가 없습니다."
+
+    history = history[[c for c in HISTORY_COLUMNS if c in history.columns] or list(history.columns)]
+    summary = history_summary(history)
+    if mode == "summary":
+        return summary
+
+    table_cols = _select(history, columns)
+    if "Close" not in table_cols.columns and "Close" in history:
+        # 다운샘플 기준 열은 항상 필요
+        table_cols = history[["Close"] + list(table_cols.columns)]
+    rows = max_rows
+    while True:
+        label, table = _history_table(table_cols, mode, rows)
+        text = f"{summary}\n\n[{label}]\n{_format_index(_round(_select(table, columns))).to_markdown()}"
+        if count_tokens(text) <= max_tokens or rows <= 5:
+            return text
+        rows = max(5, rows // 2)
+
+
+def serialize_table(df: pd.DataFrame, columns=None, max_rows: int = MAX_ROWS, max_tokens: int = MAX_TOKENS) -> str:
+    """일반 표: 열 선택 + 반올림, 행이 많으면 처음/끝만 남기고 생략 표시"""
+    if df is None or df.empty:
+        return "데이터가 없습니다."
+    df = _format_index(_round(_select(df, columns)))
+    rows = max_rows
+    while True:
+        if len(df) <= rows:
+            text = df.to_markdown()
+        else:
+            head = rows // 2
+            text = (f"{df.head(head).to_markdown()}\n... ({len(df) - rows}행 생략) ...\n"
+                    f"{df.tail(rows - head).to_markdown()}")
+        if count_tokens(text) <= max_tokens or rows <= 2:
+            return text
+        rows = max(2, rows // 2)
+
+
+def serialize_info(info: dict, fields=None, max_tokens: int = MAX_TOKENS) -> str:
+    """종목 정보 dict에서 주요(또는 지정한) 필드만 key: value 줄로"""
+    if not info:
+        return "정보가 없습니다."
+    lines = []
+    for key in fields or INFO_FIELDS:
+        value = info.get(key)
+        if value is None:
+            continue
+        if isinstance(value, float):
+            value = f"{value:,.4g}" if abs(value) < 1e4 else f"{value:,.0f}"
+        elif isinstance(value, int) and not isinstance(value, bool):
+            value = f"{value:,}"
+        lines.append(f"{key}: {value}")
+    if not fields and info.get("longBusinessSummary"):
+        lines.append(f"longBusinessSummary: {excerpt(info['longBusinessSummary'], SUMMARY_TOKENS)}")
+
+    text = "\n".join(lines)
+    if count_tokens(text) > max_tokens:
+        text = excerpt(text, max_tokens)
+    return text
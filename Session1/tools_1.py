@@ -1,12 +1,16 @@
 # tools_1.py
 from datetime import datetime
+from typing import List, Literal, Optional
 from langchain_core.tools import tool
 import pytz
 from pydantic import BaseModel, Field
-import yfinance as yf
-from io import BytesIO
-import base64
-import matplotlib.pyplot as plt
+
+# 시장 데이터(공용 캐시 계층)와 차트 렌더러는 Session3 모듈을 사용
+import _session3_path  # noqa: F401
+import market_data
+import charts
+import artifact_store
+import tool_output
 
 @tool
 def get_current_time(timezone: str, location: str) -> str:
@@ -25,13 +29,17 @@ def get_current_time(timezone: str, location: str) -> str:
 class StockHistoryInput(BaseModel):
     ticker: str = Field(..., title="주식 코드", description="주식 코드 (예: AAPL)")
     period: str = Field(..., title="기간", description="주식 데이터 조회 기간 (예: 1d, 1mo, 1y)")
+    mode: Literal["auto", "summary", "full", "weekly", "lttb"] = Field(
+        "auto", title="형식",
+        description="auto(기간에 맞게 자동), summary(요약 통계만), full(일별), weekly(주봉), lttb(추세 모양 유지 다운샘플)")
+    columns: Optional[List[str]] = Field(None, title="열", description="표에 포함할 열 (예: ['Close', 'Volume']). 생략하면 OHLCV")
 
 @tool
 def get_yf_stock_history(stock_history_input: StockHistoryInput) -> str:
-    """ 주식 종목의 가격 데이터를 조회하는 함수"""
-    stock = yf.Ticker(stock_history_input.ticker)
-    history = stock.history(period=stock_history_input.period)
-    history_md = history.to_markdown() 
+    """ 주식 종목의 가격 데이터를 조회하는 함수 (요약 통계 + 행/토큰 수가 제한된 표)"""
+    history = market_data.get_history(stock_history_input.ticker, period=stock_history_input.period)
+    history_md = tool_output.serialize_history(history, mode=stock_history_input.mode,
+                                               columns=stock_history_input.columns)
     return history_md
 
 @tool
@@ -42,10 +50,10 @@ def get_yf_stock_info(ticker: str) -> str:
     Args:
         ticker (str): 정보를 조회하려는 주식 종목의 코드   
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info # dict
-    print(info)
-    return str(info)
+    info = market_data.get_info(ticker) # dict
+    info_text = tool_output.serialize_info(info)  # 전체 dict 대신 주요 필드만
+    print(info_text)
+    return info_text
 
 @tool
 def get_yf_stock_recommendations(ticker: str):
@@ -55,9 +63,8 @@ def get_yf_stock_recommendations(ticker: str):
     Args:
         ticker (str): 추천 정보를 조회하려는 주식 종목의 코드   
     """    
-    stock = yf.Ticker(ticker)
-    recommendations = stock.recommendations # pandas DataFrame
-    recommendations_md = recommendations.to_markdown()
+    recommendations = market_data.get_recommendations(ticker) # pandas DataFrame
+    recommendations_md = tool_output.serialize_table(recommendations)
     print(recommendations_md)
     return recommendations_md
 
@@ -65,7 +72,7 @@ def get_yf_stock_recommendations(ticker: str):
 def get_stock_chart(ticker: str, start_date: str, end_date: str) -> str:
 
     """
-    해당 종목의 주가 차트를 반환합니다.
+    해당 종목의 주가 차트를 그리고 차트 이미지 핸들(artifact:...)을 반환합니다.
 
     Args:
         ticker (str): 주가 정보를 조회하려는 주식 종목의 코드 (예: AAPL)
@@ -73,25 +80,15 @@ def get_stock_chart(ticker: str, start_date: str, end_date: str) -> str:
         end_date (str): 데이터의 종료일 (예: '2023-10-30')
     """ 
 
-    df = yf.download(ticker, start=start_date, end=end_date)
+    df = market_data.get_history(ticker, start=start_date, end=end_date)
     if df.empty:
         raise ValueError("데이터가 없습니다. 종목 코드를 확인해주세요.")
 
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(df.index, df['Close'])
-    ax.set_title(f"{ticker.upper()} Price ({start_date} ~ {end_date})")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Price (USD)")
-    ax.grid(True, alpha=0.5)
-    # ax.legend()
-
-    buf = BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
-
-    # base64로 인코딩하여 전달
-    return base64.b64encode(buf.read()).decode()
+    # pyplot 전역 상태 대신 Session3 charts의 Agg Figure 템플릿으로 렌더링 (스레드 안전)
+    png = charts.render_price_chart(ticker, df, f"{ticker.upper()} Price ({start_date} ~ {end_date})")
+
+    # base64 대신 이미지는 아티팩트 저장소에 두고 작은 핸들만 전달 (UI가 핸들로 이미지를 읽음)
+    return artifact_store.put(png, "png")
 
 # 모든 도구를 리스트로 내보내기
 ALL_TOOLS = [get_current_time, get_yf_stock_history, get_yf_stock_info, get_yf_stock_recommendations, get_stock_chart]
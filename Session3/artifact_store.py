@@ -0,0 +1,69 @@
+"""
+내용 주소 기반 아티팩트 저장소 (차트 이미지 등)
+- 바이트를 SHA-256 해시 이름의 파일로 저장하고 작은 핸들 문자열("artifact:<해시>.<확장자>")을 반환
+- 같은 내용은 한 번만 저장, 파일은 원자적으로 기록 (여러 스레드/프로세스에서 동시에 써도 안전)
+- 채팅 상태/도구 메시지에는 핸들만 두고, UI는 path()/get()으로 필요할 때 이미지를 읽음
+
+설정 (환경변수): ARTIFACT_DIR
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+DEFAULT_ROOT = os.getenv(
+    "ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache", "artifacts"),
+)
+HANDLE_PREFIX = "artifact:"
+_HANDLE_PATTERN = re.compile(r"^artifact:([0-9a-f]{64})\.([0-9a-z]{1,8})$")
+
+
+def is_handle(value) -> bool:
+    return isinstance(value, str) and _HANDLE_PATTERN.match(value) is not None
+
+
+class ArtifactStore:
+    """해시 앞 2글자 폴더/해시.확장자 구조의 파일 저장소"""
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+
+    def put(self, data: bytes, ext: str = "png") -> str:
+        """바이트 저장 후 핸들 반환 (이미 있으면 쓰지 않음)"""
+        digest = hashlib.sha256(data).hexdigest()
+        handle = f"{HANDLE_PREFIX}{digest}.{ext.lower()}"
+        path = self.path(handle)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return handle
+
+    def path(self, handle: str) -> str:
+        """핸들의 파일 경로 (st.image 등에 그대로 전달 가능)"""
+        match = _HANDLE_PATTERN.match(handle or "")
+        if match is None:
+            raise ValueError(f"아티팩트 핸들이 아닙니다: {handle!r}")
+        digest, ext = match.groups()
+        return os.path.join(self.root, digest[:2], f"{digest}.{ext}")
+
+    def get(self, handle: str) -> bytes:
+        """핸들로 바이트 읽기 (없으면 FileNotFoundError)"""
+        with open(self.path(handle), "rb") as f:
+            return f.read()
+
+    def exists(self, handle: str) -> bool:
+        return is_handle(handle) and os.path.exists(self.path(handle))
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+store = ArtifactStore()
+
+put = store.put
+get = store.get
+path = store.path
+exists = store.exists
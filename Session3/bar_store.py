@@ -0,0 +1,215 @@
+"""
+로컬 일봉(OHLCV) 저장소
+- 종목당 Parquet 파일 1개 + 메타데이터 JSON(마지막 저장일, 마지막 확인일)
+- 저장된 마지막 날짜 이후 구간(tail)만 yfinance에서 받아서 이어붙임
+- start_date/end_date 구간 요청은 디스크 데이터를 잘라서 반환 (네트워크 호출 없음)
+- 하루에 종목당 최대 한 번만 tail 요청을 보냄
+
+주의: yfinance 기본값(auto_adjust=True)으로 수정주가를 저장하므로,
+새로 받은 구간에 배당/분할이 있으면 과거 수정주가가 바뀐 것이므로 해당 종목 전체를 다시 받음
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import rate_limits
+
+DEFAULT_ROOT = os.getenv(
+    "BAR_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache", "bars")
+)
+DEFAULT_BACKFILL_DAYS = 2 * 365   # 처음 받을 때 최소 확보 기간
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+_TRADING_DAYS = {"d": 1, "wk": 5}   # yfinance는 d/wk period를 거래일 수로 해석 (5d = 최근 5개 봉)
+
+
+def period_to_start(period: str, today: date = None):
+    """
+    yfinance period 문자열(예: 5d, 6mo, 1y, ytd)을 시작일로 변환. 변환 불가(max 등)면 None
+    d/wk는 달력 기준 시작일이므로 get_period는 대신 period_to_bar_count(거래일 봉 개수)를 사용
+    """
+    today = today or date.today()
+    if period == "ytd":
+        return date(today.year, 1, 1)
+    match = _PERIOD_PATTERN.match(period or "")
+    if not match:
+        return None
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "y":
+        try:
+            return today.replace(year=today.year - count)
+        except ValueError:  # 2월 29일
+            return today.replace(year=today.year - count, day=28)
+    if unit == "mo":
+        month_index = today.year * 12 + (today.month - 1) - count
+        year, month = divmod(month_index, 12)
+        return date(year, month + 1, min(today.day, 28))
+    return today - timedelta(days=count * _PERIOD_DAYS[unit])
+
+
+def period_to_bar_count(period: str):
+    """d/wk period를 최근 거래일 봉 개수로 변환 (예: 5d -> 5, 1wk -> 5). 그 외 period는 None"""
+    match = _PERIOD_PATTERN.match(period or "")
+    if not match or match.group(2) not in _TRADING_DAYS:
+        return None
+    return int(match.group(1)) * _TRADING_DAYS[match.group(2)]
+
+
+def _ticker(ticker: str) -> yf.Ticker:
+    """네트워크 호출 직전에 데이터 속도 제한을 통과"""
+    rate_limits.DATA.acquire()
+    return yf.Ticker(ticker)
+
+
+class BarStore:
+    """종목별 일봉을 디스크에 보관하고 필요한 부분만 증분으로 받아오는 저장소"""
+
+    def __init__(self, root: str = DEFAULT_ROOT, backfill_days: int = DEFAULT_BACKFILL_DAYS):
+        self.root = root
+        self.backfill_days = backfill_days
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # 공개 API
+    # -------------------------------------------------------------------------
+
+    def get_bars(self, ticker: str, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        [start_date, end_date) 구간의 일봉을 반환 (yfinance와 같이 end_date는 미포함)
+        저장소에 없는 구간이 있을 때만 네트워크 요청
+        """
+        ticker = ticker.upper()
+        start = pd.Timestamp(start_date).date() if start_date else None
+        end = pd.Timestamp(end_date).date() if end_date else None
+
+        with self._lock_for(ticker):
+            bars, meta = self._load(ticker)
+            bars, meta = self._ensure_coverage(ticker, bars, meta, start, end)
+
+        return self._slice(bars, start, end)
+
+    def get_period(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        """yfinance period 문자열로 조회. 저장소로 변환할 수 없는 period(max 등)는 직접 조회"""
+        count = period_to_bar_count(period)
+        if count is not None:
+            # 달력 기준으로 자르면 주말/장 시작 전에 1d가 비고 5d가 3개 봉이 되므로 최근 N개 거래일 봉
+            start = date.today() - timedelta(days=count * 2 + 10)   # N거래일을 충분히 덮는 구간 (휴장일 포함)
+            return self.get_bars(ticker, start_date=start).tail(count)
+        start = period_to_start(period)
+        if start is None:
+            return _ticker(ticker).history(period=period)
+        return self.get_bars(ticker, start_date=start)
+
+    def last_date(self, ticker: str):
+        """저장된 마지막 거래일 (없으면 None)"""
+        _, meta = self._load(ticker.upper())
+        return date.fromisoformat(meta["last_date"]) if meta.get("last_date") else None
+
+    # -------------------------------------------------------------------------
+    # 내부 구현
+    # -------------------------------------------------------------------------
+
+    def _lock_for(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _paths(self, ticker: str):
+        base = os.path.join(self.root, ticker)
+        return base + ".parquet", base + ".json"
+
+    def _load(self, ticker: str):
+        data_path, meta_path = self._paths(ticker)
+        if not os.path.exists(data_path) or not os.path.exists(meta_path):
+            return None, {}
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        return pd.read_parquet(data_path), meta
+
+    def _save(self, ticker: str, bars: pd.DataFrame, meta: dict):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        # 중간에 죽어도 파일이 깨지지 않도록 임시 파일에 쓰고 교체
+        bars.to_parquet(data_path + ".tmp")
+        os.replace(data_path + ".tmp", data_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _fetch(self, ticker: str, start: date, end: date = None) -> pd.DataFrame:
+        return _ticker(ticker).history(start=start.isoformat(), end=end.isoformat() if end else None)
+
+    def _ensure_coverage(self, ticker, bars, meta, start, end):
+        today = date.today()
+        wanted_start = start or today - timedelta(days=self.backfill_days)
+
+        # 1) 저장된 데이터가 없으면 충분한 기간을 한 번에 받음
+        if bars is None or bars.empty:
+            first_fetch_start = min(wanted_start, today - timedelta(days=self.backfill_days))
+            bars = self._fetch(ticker, first_fetch_start)
+            if bars.empty:
+                return bars, meta
+            meta = {"first_date": first_fetch_start.isoformat(), "last_checked": today.isoformat()}
+            return bars, self._write(ticker, bars, meta)
+
+        changed = False
+
+        # 2) 저장된 범위보다 앞쪽 구간을 요청하면 앞부분만 추가로 받음
+        first_date = date.fromisoformat(meta["first_date"])
+        if wanted_start < first_date:
+            head = self._fetch(ticker, wanted_start, first_date)
+            bars = pd.concat([head, bars])
+            meta["first_date"] = wanted_start.isoformat()
+            changed = True
+
+        # 3) 오늘 아직 확인하지 않았고, 요청 구간이 마지막 저장일 이후를 포함하면 tail만 받음
+        last_date = date.fromisoformat(meta["last_date"])
+        needs_tail = end is None or end > last_date + timedelta(days=1)
+        if needs_tail and meta.get("last_checked") != today.isoformat():
+            # 마지막 봉은 장중에 저장됐을 수 있으므로 마지막 저장일부터 다시 받아 덮어씀
+            tail = self._fetch(ticker, last_date)
+            adjustments = tail.reindex(columns=["Dividends", "Stock Splits"]).fillna(0)
+            if (adjustments.iloc[1:] != 0).any().any():
+                # 새 구간에 배당/분할 발생 → 과거 수정주가가 바뀌었으므로 전체 재수신
+                refreshed = self._fetch(ticker, date.fromisoformat(meta["first_date"]))
+                bars = refreshed if not refreshed.empty else bars
+            elif not tail.empty:
+                bars = pd.concat([bars[bars.index < tail.index[0]], tail])
+            if not tail.empty:  # 빈 응답은 일시적 오류일 수 있으므로 오늘 다시 시도하도록 남겨둠
+                meta["last_checked"] = today.isoformat()
+                changed = True
+
+        if changed:
+            bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+            meta = self._write(ticker, bars, meta)
+        return bars, meta
+
+    def _write(self, ticker: str, bars: pd.DataFrame, meta: dict) -> dict:
+        meta = {**meta, "last_date": bars.index[-1].date().isoformat()}
+        self._save(ticker, bars, meta)
+        return meta
+
+    @staticmethod
+    def _slice(bars: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+        if bars is None or bars.empty:
+            return pd.DataFrame() if bars is None else bars
+        dates = bars.index.date
+        mask = np.ones(len(bars), dtype=bool)
+        if start:
+            mask &= dates >= start
+        if end:
+            mask &= dates < end
+        return bars[mask].copy()
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+store = BarStore()
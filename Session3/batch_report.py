@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+여러 종목 투자 보고서 일괄 생성 (report_writer_3_5 배치 모드)
+- 티커 목록/파일을 받아 app.ainvoke를 동시 실행 수 제한(asyncio.Semaphore) 안에서 병렬 실행
+  (AsyncSqliteSaver 체크포인터, 종목별 제한 시간이 지나면 실행을 취소)
+- LLM / 시장 데이터 / 뉴스 검색 속도 제한을 각각 따로 설정 (rate_limits 모듈)
+- 종목별 제한 시간, 실행 후 요약표 출력
+- 종목별 체크포인트(report_writer_3_5.arun_workflow)로 실패/중단된 종목은 다시 실행하면 이어서 진행
+- --batch-sentiment: 전 종목 뉴스 감정 점수를 먼저 묶음 요청으로 채점해 두고 종목별 분석은 캐시를 사용
+
+실행 예:
+python batch_report.py AAPL MSFT NVDA --concurrency 4 --timeout 600
+python batch_report.py --file watchlist.txt --llm-rps 2 --data-rps 5 --search-rps 1
+python batch_report.py --file universe.txt --screen-top 10   # 스크리너 상위 10종목만 분석
+python batch_report.py AAPL MSFT --rerun-from report          # 분석가 결과 재사용, 보고서만 다시 작성
+"""
+
+import argparse
+import asyncio
+import time
+
+from tabulate import tabulate
+
+import llm_cache
+import rate_limits
+import report_writer_3_5 as rw
+import screener
+import sentiment
+
+
+async def analyze_one(ticker: str, semaphore: asyncio.Semaphore, timeout: float, app, checkpointer,
+                      **run_options) -> dict:
+    """한 종목 분석. 실패/시간 초과도 결과 행으로 남김"""
+    async with semaphore:
+        start = time.perf_counter()
+        result = {"ticker": ticker, "status": "ok", "seconds": 0.0, "report": "", "error": ""}
+        try:
+            final_state = await asyncio.wait_for(
+                rw.arun_workflow(app, checkpointer, ticker, **run_options), timeout=timeout
+            )
+            result["report"] = rw.save_report(ticker, final_state["final_report"]) or ""
+        except asyncio.TimeoutError:
+            # 노드가 비동기로 실행되므로 진행 중인 LLM 호출까지 취소되고 다음 노드도 시작하지 않음
+            # (완료된 노드는 체크포인트에 남아 다음 실행 때 이어서 진행)
+            result["status"] = "timeout"
+            result["error"] = f"{timeout:g}s 초과"
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - start
+        print(f"[{result['status']}] {ticker} ({result['seconds']:.1f}s)")
+        return result
+
+
+async def arun_batch(tickers, concurrency: int = 4, timeout: float = 600, parallel: bool = True,
+                     rerun_from: str = None, fresh: bool = False) -> list:
+    """티커 목록을 동시에 분석하고 종목별 결과(dict) 목록을 입력 순서대로 반환"""
+    tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+    semaphore = asyncio.Semaphore(concurrency)
+    run_options = {"parallel": parallel, "rerun_from": rerun_from, "fresh": fresh}
+    async with rw.async_workflow(parallel=parallel) as (app, checkpointer):
+        return await asyncio.gather(*(analyze_one(ticker, semaphore, timeout, app, checkpointer, **run_options)
+                                      for ticker in tickers))
+
+
+def run_batch(tickers, concurrency: int = 4, timeout: float = 600, parallel: bool = True,
+              llm_rps: float = None, data_rps: float = None, search_rps: float = None,
+              rerun_from: str = None, fresh: bool = False, batch_sentiment: bool = False) -> list:
+    """동기 API: 속도 제한을 설정하고 배치를 실행"""
+    rate_limits.configure(llm_rps=llm_rps, data_rps=data_rps, search_rps=search_rps)
+    if batch_sentiment:
+        # 여러 종목이 공유하는 기사는 한 번만 채점되고, 뉴스 분석 노드는 캐시된 점수를 읽음
+        start = time.perf_counter()
+        sentiment.analyze_tickers([ticker.strip().upper() for ticker in tickers if ticker.strip()])
+        print(f"뉴스 감정 일괄 채점 완료 ({time.perf_counter() - start:.1f}s)")
+    return asyncio.run(arun_batch(tickers, concurrency=concurrency, timeout=timeout, parallel=parallel,
+                                  rerun_from=rerun_from, fresh=fresh))
+
+
+def print_summary(results: list, elapsed: float):
+    rows = [
+        [r["ticker"], r["status"], f"{r['seconds']:.1f}", r["report"], r["error"][:60]]
+        for r in results
+    ]
+    print("\n" + tabulate(rows, headers=["종목", "상태", "소요(초)", "보고서", "오류"], tablefmt="github"))
+    succeeded = sum(r["status"] == "ok" for r in results)
+    print(f"\n완료 {succeeded}/{len(results)}종목, 전체 {elapsed:.1f}s")
+    if not llm_cache.cache.bypass:
+        stats = llm_cache.cache_stats()
+        print(f"LLM 캐시: hit {stats['hits']} / miss {stats['misses']} ({stats['hit_rate']:.0%}), "
+              f"절약 토큰 {stats['saved_tokens']:,}, 절약 대기 {stats['saved_seconds']:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 종목 투자 보고서 일괄 생성")
+    parser.add_argument("tickers", nargs="*", help="티커 목록")
+    parser.add_argument("--file", help="티커 목록 파일 (한 줄에 하나, #은 주석)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 분석할 종목 수")
+    parser.add_argument("--timeout", type=float, default=600, help="종목별 제한 시간(초)")
+    parser.add_argument("--llm-rps", type=float, help="LLM 초당 요청 수 제한")
+    parser.add_argument("--data-rps", type=float, help="시장 데이터(yfinance) 초당 요청 수 제한")
+    parser.add_argument("--search-rps", type=float, help="뉴스 검색(Tavily) 초당 요청 수 제한")
+    parser.add_argument("--sequential", action="store_true", help="종목 내 분석가를 순차 실행")
+    parser.add_argument("--screen-top", type=int, help="스크리너 상위 N종목만 분석")
+    parser.add_argument("--rerun-from", choices=rw.RERUN_NODES, help="저장된 분석가 결과로 이 단계부터 다시 실행")
+    parser.add_argument("--fresh", action="store_true", help="오늘 체크포인트를 무시하고 처음부터 분석")
+    parser.add_argument("--no-llm-cache", action="store_true", help="LLM 응답 캐시를 사용하지 않음")
+    parser.add_argument("--batch-sentiment", action="store_true", help="전 종목 뉴스 감정 점수를 먼저 일괄 채점")
+    args = parser.parse_args()
+
+    if args.no_llm_cache:
+        llm_cache.set_bypass()
+
+    tickers = list(args.tickers)
+    if args.file:
+        tickers += screener.read_ticker_file(args.file)
+    if not tickers:
+        parser.error("티커를 입력하거나 --file을 지정하세요")
+
+    if args.screen_top:
+        tickers = screener.top_candidates(screener.screen_universe(tickers), args.screen_top)
+        print(f"스크리너 상위 {len(tickers)}종목: {', '.join(tickers)}")
+
+    start = time.perf_counter()
+    results = run_batch(
+        tickers,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+        parallel=not args.sequential,
+        llm_rps=args.llm_rps,
+        data_rps=args.data_rps,
+        search_rps=args.search_rps,
+        rerun_from=args.rerun_from,
+        fresh=args.fresh,
+        batch_sentiment=args.batch_sentiment,
+    )
+    print_summary(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+채팅 세션 상태 크기/재실행 비용: base64 PNG를 메시지에 보관 vs 아티팩트 핸들
+- charts.render_price_chart로 실제 PNG를 만들고, 차트 N개가 쌓인 대화를 흉내냄
+- Streamlit은 매 재실행마다 모든 메시지를 다시 그리므로 재실행 1회당 이미지 준비 시간을 비교
+  (기존: 메시지마다 base64 디코딩, 현재: 핸들 → 파일 경로)
+
+실행: python bench_artifact_store.py --charts 30
+"""
+
+import argparse
+import base64
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from langchain_core.messages import ToolMessage
+
+import charts
+from artifact_store import ArtifactStore, is_handle
+
+
+def price_frame(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2024-01-01", periods=130)
+    return pd.DataFrame({"Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))}, index=index)
+
+
+def rerun_cost(messages, prepare, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for msg in messages:
+            prepare(msg.content)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="base64 메시지 vs 아티팩트 핸들")
+    parser.add_argument("--charts", type=int, default=30, help="대화 중 생성된 차트 수")
+    args = parser.parse_args()
+
+    store = ArtifactStore(os.path.join(tempfile.mkdtemp(), "artifacts"))
+    pngs = [charts.render_price_chart("T", price_frame(i), f"T{i} Price") for i in range(args.charts)]
+
+    legacy_msgs = [ToolMessage(content=base64.b64encode(png).decode(), tool_call_id=str(i), name="get_stock_chart")
+                   for i, png in enumerate(pngs)]
+    handle_msgs = [ToolMessage(content=store.put(png), tool_call_id=str(i), name="get_stock_chart")
+                   for i, png in enumerate(pngs)]
+
+    assert all(is_handle(msg.content) for msg in handle_msgs)
+    assert all(store.get(msg.content) == png for msg, png in zip(handle_msgs, pngs))
+    assert store.put(pngs[0]) == handle_msgs[0].content  # 같은 내용은 같은 핸들
+
+    legacy_size = len(pickle.dumps(legacy_msgs))
+    handle_size = len(pickle.dumps(handle_msgs))
+    legacy_rerun = rerun_cost(legacy_msgs, base64.b64decode)
+    handle_rerun = rerun_cost(handle_msgs, store.path)
+
+    print(f"차트 {args.charts}개 (PNG 평균 {sum(map(len, pngs)) / len(pngs) / 1024:.1f} KB)")
+    print(f"세션 상태 크기:  base64 {legacy_size / 1024:8.1f} KB  →  핸들 {handle_size / 1024:6.1f} KB")
+    print(f"재실행당 준비:   base64 디코딩 {legacy_rerun * 1e3:6.2f} ms  →  경로 조회 {handle_rerun * 1e3:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+차트 렌더링 벤치마크: 기존 pyplot 방식 vs charts.py (Agg Figure 템플릿)
+- 합성 일봉 + indicators.attach_indicators로 네트워크 없이 실행
+- 기존 방식은 pyplot 전역 상태 때문에 순차 실행만 측정
+- charts.py는 순차 / 스레드 풀 / 프로세스 풀에서 초당 차트 수 측정, 결과 PNG 크기 확인
+
+실행: python bench_charts.py --charts 24 --workers 4 --preset report
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+from PIL import Image
+
+import charts
+import indicators
+from bench_indicators import synthetic_histories
+
+
+def legacy_chart(ticker: str, hist_data, filename: str, dpi: int = 300):
+    """tools.create_technical_chart의 기존 pyplot 구현 (비교를 위해 dpi만 프리셋에 맞춤, 기존 값은 300)"""
+    data_6m = hist_data.tail(120)
+    plt.style.use('default')
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), height_ratios=[2, 1])
+    ax1.plot(data_6m.index, data_6m['Close'], label='Price', linewidth=1.5)
+    ax1.plot(data_6m.index, data_6m['MA20'], label='MA20', linewidth=1, alpha=0.7)
+    ax1.plot(data_6m.index, data_6m['MA60'], label='MA60', linewidth=1, alpha=0.7)
+    ax1.set_title(f'{ticker} - Price and Moving Averages (6 Months)', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Price ($)', fontsize=12)
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax2.plot(data_6m.index, data_6m['RSI'], label='RSI', linewidth=2, color='purple')
+    ax2.axhline(y=70, color='r', linestyle='--', alpha=0.7, label='Overbought (70)')
+    ax2.axhline(y=30, color='g', linestyle='--', alpha=0.7, label='Oversold (30)')
+    ax2.fill_between(data_6m.index, 30, 70, alpha=0.1, color='gray')
+    ax2.set_title(f'{ticker} - RSI (14)', fontsize=12)
+    ax2.set_ylabel('RSI', fontsize=12)
+    ax2.set_xlabel('Date', fontsize=12)
+    ax2.set_ylim(0, 100)
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    plt.tight_layout()
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    return filename
+
+
+def make_histories(n: int) -> list:
+    return [(ticker, indicators.attach_indicators(hist)) for ticker, hist in synthetic_histories(n, 260, seed=1).items()]
+
+
+def render_one(args):
+    ticker, hist, filename, preset = args
+    return charts.render_technical_chart(ticker, hist, filename, preset=preset)
+
+
+def rate(label: str, fn, jobs: list) -> float:
+    start = time.perf_counter()
+    results = fn(jobs)
+    elapsed = time.perf_counter() - start
+    assert all(os.path.getsize(path) > 0 for path in results)
+    print(f"{label:<28} {len(jobs) / elapsed:6.1f} 차트/s ({elapsed:.2f}s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pyplot vs Agg Figure 템플릿 차트 렌더링")
+    parser.add_argument("--charts", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--preset", default="report", choices=list(charts.PRESETS))
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 pyplot 측정 생략")
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp()
+    histories = make_histories(args.charts)
+    jobs = [(ticker, hist, os.path.join(out_dir, f"{ticker}_{i}.png"), args.preset)
+            for i, (ticker, hist) in enumerate(histories)]
+
+    width, height, dpi = charts.PRESETS[args.preset]
+    print(f"CPU {os.cpu_count()}개, 차트 {args.charts}개, 프리셋 {args.preset} {charts.PRESETS[args.preset]}")
+    if not args.skip_legacy:
+        # 해상도 차이가 속도 비교에 섞이지 않도록 기존 방식도 같은 dpi로 측정
+        rate(f"기존 pyplot (dpi {dpi}, tight)",
+             lambda js: [legacy_chart(t, h, f + ".legacy.png", dpi) for t, h, f, _ in js], jobs)
+    rate("charts 순차", lambda js: [render_one(job) for job in js], jobs)
+    with ThreadPoolExecutor(args.workers) as pool:
+        rate(f"charts 스레드 {args.workers}개", lambda js: list(pool.map(render_one, js)), jobs)
+    with ProcessPoolExecutor(args.workers) as pool:
+        list(pool.map(render_one, jobs[:args.workers]))  # 워커 시작/템플릿 생성은 측정에서 제외
+        rate(f"charts 프로세스 {args.workers}개", lambda js: list(pool.map(render_one, js)), jobs)
+
+    with Image.open(jobs[0][2]) as image:
+        assert image.size == (width * dpi, height * dpi), image.size
+        print(f"출력 크기: {image.size[0]}×{image.size[1]} px")
+
+
+if __name__ == "__main__":
+    main()
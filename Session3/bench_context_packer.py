@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+뉴스 컨텍스트 패킹 비교: 기사별 앞 300자 자르기 vs context_packer.pack_articles
+- 전체 본문(raw_content)에 광고/내비게이션 문구, 통신사 재배포 문장, 종목과 무관한 문장을 섞은 가상 기사 사용
+- 프롬프트 토큰 수, 종목 관련 문장 포함 수, 중복 문장 수, 예산 준수 여부를 비교
+
+실행: python bench_context_packer.py --budget 400
+"""
+
+import argparse
+import time
+
+import context_packer
+
+BOILERPLATE = [
+    "Subscribe to our newsletter for the latest market updates.",
+    "Click here to read more stories from our partners.",
+]
+WIRE = "Apple shares rose 3% after the company reported record services revenue of 24 billion dollars."
+
+
+def synthetic_articles() -> list:
+    articles = []
+    for i in range(6):
+        relevant = [
+            f"Analyst {i} raised the Apple price target to {200 + 5 * i} dollars citing iPhone demand.",
+            f"AAPL earnings guidance for quarter {i + 1} beat consensus estimates on margin strength.",
+        ]
+        filler = [f"The weather in city number {i} was mild this week and traffic was light." for _ in range(3)]
+        body = " ".join(BOILERPLATE + filler + [WIRE] + relevant)
+        articles.append({
+            "title": f"기사 {i + 1}",
+            "content": body[:200],
+            "raw_content": body,
+            "url": f"https://news{i}.example.com/apple",
+            "score": 0.5,
+        })
+    return articles
+
+
+def legacy_summary(articles: list) -> str:
+    """tools.analyze_news_sentiment_ai의 기존 방식"""
+    summary = ""
+    for i, article in enumerate(articles[:5]):
+        summary += f"\n{i+1}. {article['title']}\n{article['content'][:300]}...\n"
+    return summary
+
+
+def describe(name: str, text: str, budget: int = None):
+    tokens = context_packer.count_tokens(text)
+    relevant = text.count("price target") + text.count("earnings guidance")
+    wire = text.count(WIRE)
+    boilerplate = sum(text.count(line) for line in BOILERPLATE)
+    within = "" if budget is None else (" (예산 이내)" if tokens <= budget else " (예산 초과!)")
+    print(f"{name}: {tokens:4d}토큰{within}, 관련 문장 {relevant}개, 재배포 문장 {wire}회, 광고 문구 {boilerplate}회")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="300자 자르기 vs 토큰 예산 패킹")
+    parser.add_argument("--budget", type=int, default=400, help="뉴스 컨텍스트 토큰 예산")
+    args = parser.parse_args()
+
+    articles = synthetic_articles()
+    legacy = legacy_summary(articles)
+
+    context_packer.count_tokens("")  # 토크나이저 로딩은 측정에서 제외
+    start = time.perf_counter()
+    packed = context_packer.pack_articles(articles, "AAPL", "Apple Inc.", budget_tokens=args.budget)
+    elapsed = time.perf_counter() - start
+
+    assert context_packer.count_tokens(packed) <= args.budget
+    assert packed.count(WIRE) <= 1
+
+    tokenizer = "tiktoken" if context_packer._encoding(context_packer.DEFAULT_MODEL) else "근사치(오프라인)"
+    print(f"토큰 계산: {tokenizer}, 패킹 {elapsed * 1e3:.1f} ms")
+    describe("기존 300자 자르기  ", legacy)
+    describe("토큰 예산 패킹     ", packed, args.budget)
+
+
+if __name__ == "__main__":
+    main()
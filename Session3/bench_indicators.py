@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+기술지표 계산 벤치마크: 종목별 pandas 계산 vs 배치 엔진(indicators.py)
+- 합성 일봉(랜덤워크)으로 네트워크 없이 실행
+- 두 경로의 결과가 완전히 같은지(비트 단위) 확인한 뒤 처리량을 비교
+
+실행: python bench_indicators.py --tickers 500 --days 252
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import indicators
+
+
+def legacy_indicators(hist: pd.DataFrame) -> pd.DataFrame:
+    """tools.calculate_technical_indicators의 기존 종목별 pandas 계산"""
+    hist['MA20'] = hist['Close'].rolling(window=20).mean()
+    hist['MA60'] = hist['Close'].rolling(window=60).mean()
+
+    delta = hist['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    hist['RSI'] = 100 - (100 / (1 + rs))
+
+    high_low = hist['High'] - hist['Low']
+    high_close = np.abs(hist['High'] - hist['Close'].shift())
+    low_close = np.abs(hist['Low'] - hist['Close'].shift())
+    tr = np.maximum(high_low, np.maximum(high_close, low_close))
+    hist['ATR'] = tr.rolling(window=14).mean()
+
+    plus_dm = hist['High'].diff()
+    minus_dm = hist['Low'].diff() * -1
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm < 0] = 0
+
+    plus_di = (plus_dm.rolling(window=14).mean() / hist['ATR']) * 100
+    minus_di = (minus_dm.rolling(window=14).mean() / hist['ATR']) * 100
+    dx = (np.abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
+    hist['ADX'] = dx.rolling(window=14).mean()
+    return hist
+
+
+def synthetic_histories(n_tickers: int, n_days: int, seed: int = 0) -> dict:
+    """
+    랜덤워크 일봉. 일부 종목은 상장 기간을 짧게, 일부는 가격이 멈춘 구간을,
+    일부는 중간에 빠진 날짜(거래정지/휴장일)를 넣어 경계 상황을 포함
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-06-30", periods=n_days)
+    histories = {}
+    for i in range(n_tickers):
+        length = n_days if i % 10 else int(n_days * rng.uniform(0.3, 0.9))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+        if i % 7 == 0:
+            close[length // 2: length // 2 + 20] = close[length // 2]
+        spread = np.abs(rng.normal(0, 0.01, length)) * close
+        hist = pd.DataFrame({
+            "Open": close,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000, length),
+        }, index=dates[-length:])
+        if i % 5 == 3:
+            # 중간 5일 거래정지 + 띄엄띄엄 휴장일
+            gap = length // 3
+            hist = hist.drop(hist.index[gap: gap + 5]).drop(hist.index[gap + 30::40])
+        histories[f"T{i:04d}"] = hist
+    return histories
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종목별 pandas vs 배치 엔진 지표 계산 처리량 비교")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=252)
+    args = parser.parse_args()
+
+    histories = synthetic_histories(args.tickers, args.days)
+
+    # 1) 기존 경로: 종목별 pandas 계산
+    start = time.perf_counter()
+    legacy = {ticker: legacy_indicators(hist.copy()) for ticker, hist in histories.items()}
+    legacy_time = time.perf_counter() - start
+
+    # 2) 배치 엔진: 패널 한 번에 계산 (패널 구성 시간 포함)
+    start = time.perf_counter()
+    panel = indicators.build_panel(histories)
+    batch = indicators.compute_panel(panel)
+    batch_time = time.perf_counter() - start
+
+    # 3) 단일 종목 래퍼 (도구에서 쓰는 경로)
+    start = time.perf_counter()
+    single = {ticker: indicators.attach_indicators(hist.copy()) for ticker, hist in histories.items()}
+    single_time = time.perf_counter() - start
+
+    for ticker, expected in legacy.items():
+        missing = panel["Close"].index.difference(expected.index)
+        for name in indicators.INDICATOR_COLUMNS:
+            assert batch[name][ticker].loc[missing].isna().all(), f"{ticker} {name}: 빠진 날짜에 값이 있음"
+            batch_values = batch[name][ticker].loc[expected.index].to_numpy()
+            np.testing.assert_array_equal(batch_values, expected[name].to_numpy(), err_msg=f"{ticker} {name}")
+            np.testing.assert_array_equal(single[ticker][name].to_numpy(), expected[name].to_numpy(), err_msg=f"{ticker} {name}")
+
+    gapped = sum(1 for hist in histories.values() if len(hist) < len(panel["Close"].index[panel["Close"].index >= hist.index[0]]))
+    print(f"{args.tickers}종목 × {args.days}일 (중간에 빠진 날짜가 있는 종목 {gapped}개), 결과 일치 확인 완료")
+    print(f"종목별 pandas:    {legacy_time:.3f}s ({args.tickers / legacy_time:,.0f} 종목/s)")
+    print(f"단일 종목 래퍼:   {single_time:.3f}s ({args.tickers / single_time:,.0f} 종목/s)")
+    print(f"배치 엔진:        {batch_time:.3f}s ({args.tickers / batch_time:,.0f} 종목/s)")
+    print(f"배치 속도 향상:   {legacy_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
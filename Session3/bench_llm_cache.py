@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+LLM 응답 캐시(llm_cache.py) 하네스
+- 지연시간/토큰 사용량만 흉내내는 채팅 모델에 SQLiteLLMCache를 연결 (API 키/네트워크 불필요)
+- 같은 프롬프트 묶음을 두 번 실행해 두 번째 실행의 hit, 절약 토큰/시간을 확인
+- 파라미터(temperature)가 다르면 miss, TTL 만료/최대 항목 수 초과 시 삭제, bypass 동작 확인
+
+실행: python bench_llm_cache.py --prompts 5 --llm-delay 0.3
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from llm_cache import SQLiteLLMCache
+
+
+class DelayedChatModel(BaseChatModel):
+    """호출마다 delay초 기다리고 usage_metadata를 채워 응답하는 채팅 모델"""
+
+    delay: float = 0.3
+    temperature: float = 0.1
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "delayed-stub"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"temperature": self.temperature}
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.delay)
+        self.calls += 1
+        prompt_tokens = sum(len(m.content) for m in messages) // 4
+        message = AIMessage(
+            content=f"[stub 응답] {messages[-1].content[:40]}",
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": 300,
+                            "total_tokens": prompt_tokens + 300},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def run_prompts(model, prompts) -> float:
+    start = time.perf_counter()
+    for prompt in prompts:
+        model.invoke([SystemMessage(content="당신은 기업 기본분석 전문가입니다."), HumanMessage(content=prompt)])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 응답 캐시 hit/절약량 측정")
+    parser.add_argument("--prompts", type=int, default=5, help="서로 다른 프롬프트 수")
+    parser.add_argument("--llm-delay", type=float, default=0.3, help="LLM 호출 1회 지연(초)")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite")
+    cache = SQLiteLLMCache(path=path, ttl=3600, max_entries=args.prompts)
+    model = DelayedChatModel(delay=args.llm_delay, cache=cache)
+    prompts = [f"TICKER{i} 기업의 기본 분석을 상세히 해주세요. " + "데이터 " * 200 for i in range(args.prompts)]
+
+    cold = run_prompts(model, prompts)
+    warm = run_prompts(model, prompts)
+    stats = cache.stats()
+    assert model.calls == args.prompts and stats["hits"] == args.prompts
+
+    # 디스크에 저장되므로 새 캐시 객체(= 새 프로세스)에서도 hit
+    reopened = DelayedChatModel(delay=args.llm_delay, cache=SQLiteLLMCache(path=path))
+    run_prompts(reopened, prompts)
+    assert reopened.calls == 0
+
+    # 파라미터가 다르면 다른 키
+    other = DelayedChatModel(delay=0, temperature=0.7, cache=cache)
+    run_prompts(other, prompts[:1])
+    assert other.calls == 1
+
+    # 최대 항목 수를 넘으면 가장 오래 안 쓴 항목(prompts[0])부터 삭제
+    assert cache.stats()["size"] == args.prompts
+    model.calls = 0
+    run_prompts(model, prompts[:1])
+    assert model.calls == 1
+
+    # bypass: 항상 API 호출
+    cache.bypass = True
+    model.calls = 0
+    run_prompts(model, prompts[1:2])
+    assert model.calls == 1
+    cache.bypass = False
+
+    # TTL 만료
+    cache.ttl = 0
+    model.calls = 0
+    run_prompts(model, prompts[1:2])
+    assert model.calls == 1
+
+    print(f"프롬프트 {args.prompts}개, LLM 지연 {args.llm_delay:.2f}s")
+    print(f"첫 실행 (miss):   {cold:6.2f}s")
+    print(f"재실행 (hit):     {warm:6.2f}s")
+    print(f"hit {stats['hits']} / miss {stats['misses']}, 절약 토큰 {stats['saved_tokens']:,}, "
+          f"절약 대기 {stats['saved_seconds']:.2f}s")
+    print("디스크 재사용 / 파라미터별 키 / 최대 항목 수 삭제 / bypass / TTL 확인 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+뉴스 검색 벤치마크 (로컬 가짜 Tavily 서버 사용, API 키/크레딧 불필요)
+- 기존 방식: 쿼리 3개를 순차 실행, 원본 url 문자열로만 중복 제거
+- 현재 방식(news_search): 쿼리 동시 실행 + URL 정규화/본문 해시 중복 제거 + 쿼리/날짜별 캐시
+- 한 쿼리가 실패해도 나머지 결과로 성공하는지 확인
+
+실행: python bench_news_search.py --delay 0.5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from fake_tavily_server import start_server
+
+# news_search import 전에 캐시 경로/API 주소 지정
+os.environ["NEWS_CACHE_DIR"] = os.path.join(tempfile.mkdtemp(), "news")
+os.environ.setdefault("TAVILY_API_KEY", "tvly-bench")
+
+from tavily import TavilyClient
+
+import news_search
+
+
+def legacy_search(client: TavilyClient, ticker: str, company_name: str) -> list:
+    """tools.search_company_news_tavily의 기존 순차 검색 + url 문자열 중복 제거"""
+    all_news = []
+    for template in news_search.QUERY_TEMPLATES:
+        results = client.search(template.format(ticker=ticker, company_name=company_name), **news_search.SEARCH_OPTIONS)
+        all_news.extend(results["results"])
+    unique, seen = [], set()
+    for news in all_news:
+        if news["url"] not in seen and len(unique) < news_search.MAX_ARTICLES:
+            seen.add(news["url"])
+            unique.append(news)
+    return unique
+
+
+def main():
+    parser = argparse.ArgumentParser(description="순차 검색 vs 동시 검색 + 캐시")
+    parser.add_argument("--delay", type=float, default=0.5, help="가짜 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    server = start_server(delay=args.delay, fail_queries=("FAILME",))
+    os.environ["TAVILY_API_BASE_URL"] = server.url
+
+    start = time.perf_counter()
+    legacy = legacy_search(TavilyClient(api_base_url=server.url), "AAPL", "Apple Inc.")
+    legacy_time = time.perf_counter() - start
+
+    server.request_count = 0
+    start = time.perf_counter()
+    cold = news_search.search_news("AAPL", "Apple Inc.")
+    cold_time = time.perf_counter() - start
+    cold_requests = server.request_count
+
+    start = time.perf_counter()
+    warm = news_search.search_news("AAPL", "Apple Inc.")
+    warm_time = time.perf_counter() - start
+    warm_requests = server.request_count - cold_requests
+
+    assert cold["success"] and warm["news_articles"] == cold["news_articles"]
+    assert cold_requests == len(news_search.QUERY_TEMPLATES) and warm_requests == 0
+    # 쿼리별 고유 기사 3 + 공통 기사 1 + 재배포 기사 1
+    assert cold["news_count"] == len(news_search.QUERY_TEMPLATES) + 2, cold["news_articles"]
+
+    partial = news_search.search_news("FAILME", "Apple Inc.", use_cache=False)
+    assert partial["success"] and len(partial["errors"]) == 2, partial
+    failed = news_search.search_news("FAILME", "FAILME Corp", use_cache=False)
+    assert not failed["success"]
+
+    server.shutdown()
+    print(f"가짜 서버 지연 {args.delay:.2f}s, 쿼리 {len(news_search.QUERY_TEMPLATES)}개")
+    print(f"기존 순차 검색:     {legacy_time:6.2f}s, 기사 {len(legacy)}개 (url 문자열 기준 중복 제거)")
+    print(f"동시 검색 (캐시 X): {cold_time:6.2f}s, 기사 {cold['news_count']}개 (정규화 URL + 본문 해시)")
+    print(f"동시 검색 (캐시 O): {warm_time:6.2f}s, 서버 요청 {warm_requests}회")
+    print("일부 쿼리 실패 시 부분 결과 / 전체 실패 시 success=False 확인 완료")
+
+
+if __name__ == "__main__":
+    main()
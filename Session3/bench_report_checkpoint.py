@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+report_writer_3_5 체크포인트 재실행 하네스
+- bench_report_workflow의 스텁(LLM/데이터)을 쓰고 임시 SQLite 파일에 체크포인트 저장
+- 1) supervisor에서 실패 → 다시 실행하면 supervisor만 실행되는지
+- 2) 완료된 분석을 다시 요청하면 LLM 호출 없이 재사용되는지
+- 3) rerun_from="report"로 report/supervisor만 재실행되는지
+- 4) batch_report 종목별 제한 시간이 지나면 진행 중인 LLM 호출까지 취소되는지 (이후 끝나거나 새로 시작하는 호출 없음)
+각 경우의 LLM 호출 수와 소요 시간을 처음부터 실행한 경우와 비교
+
+실행: python bench_report_checkpoint.py --llm-delay 0.3 --fetch-delay 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+# report_writer_3_5 import 전에 체크포인트 파일을 임시 경로로 지정
+os.environ["REPORT_CHECKPOINT_DB"] = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+
+from bench_report_workflow import FakeLLM, install_stubs, rw
+
+
+class CountingLLM(FakeLLM):
+    """호출 수를 세고, fail_on 문구가 시스템 프롬프트에 있으면 한 번 실패하는 스텁"""
+
+    def __init__(self, delay: float):
+        super().__init__(delay)
+        self.calls = 0
+        self.finished = 0
+        self.fail_on = None
+
+    def _count(self, messages):
+        if self.fail_on and self.fail_on in messages[0].content:
+            self.fail_on = None
+            raise RuntimeError("LLM 호출 실패 (테스트)")
+        self.calls += 1
+
+    def invoke(self, messages, *args, **kwargs):
+        self._count(messages)
+        response = super().invoke(messages, *args, **kwargs)
+        self.finished += 1
+        return response
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        self._count(messages)
+        response = await super().ainvoke(messages, *args, **kwargs)
+        self.finished += 1
+        return response
+
+
+def timed(llm: CountingLLM, fn):
+    llm.calls = 0
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start, llm.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="체크포인트 이어서 실행/부분 재실행 비용 측정")
+    parser.add_argument("--llm-delay", type=float, default=0.3, help="LLM 호출 1회 지연(초)")
+    parser.add_argument("--fetch-delay", type=float, default=0.2, help="데이터/검색 호출 1회 지연(초)")
+    args = parser.parse_args()
+
+    install_stubs(args.llm_delay, args.fetch_delay)
+    llm = rw.llm = CountingLLM(args.llm_delay)
+
+    # 처음부터 실행 (기준)
+    state, full_time, full_calls = timed(llm, lambda: rw.run_workflow("STUB", fresh=True))
+    assert state["current_step"] == "completed"
+
+    # supervisor 실패 후 재실행
+    llm.fail_on = "품질 관리"
+    try:
+        rw.run_workflow("FAIL", fresh=True)
+        raise AssertionError("supervisor 실패가 발생해야 합니다")
+    except RuntimeError:
+        pass
+    state, resume_time, resume_calls = timed(llm, lambda: rw.run_workflow("FAIL"))
+    assert state["current_step"] == "completed" and resume_calls == 1
+
+    # 완료된 분석 재사용
+    state, reuse_time, reuse_calls = timed(llm, lambda: rw.run_workflow("STUB"))
+    assert state["final_report"] and reuse_calls == 0
+
+    # report부터 재실행 (분석가 결과 재사용)
+    state, rerun_time, rerun_calls = timed(llm, lambda: rw.run_workflow("STUB", rerun_from="report"))
+    assert state["current_step"] == "completed" and rerun_calls == 2
+    assert rw.get_workflow().get_state({"configurable": {"thread_id": rw.thread_id("STUB")}}).values["final_report"] == state["final_report"]
+
+    # 배치 제한 시간: 분석가 LLM 호출이 진행 중일 때 시간 초과
+    import batch_report
+    llm.calls = llm.finished = 0
+    timeout = args.fetch_delay + args.llm_delay / 2
+    [result] = asyncio.run(batch_report.arun_batch(["SLOW"], timeout=timeout))
+    started, finished = llm.calls, llm.finished
+    time.sleep(args.llm_delay * 3)
+    assert result["status"] == "timeout" and finished == 0, result
+    assert (llm.calls, llm.finished) == (started, finished), (llm.calls, llm.finished, started)
+
+    print(f"LLM 지연 {args.llm_delay:.2f}s, 데이터 지연 {args.fetch_delay:.2f}s")
+    print(f"처음부터 실행:            {full_time:6.2f}s, LLM {full_calls}회")
+    print(f"supervisor 실패 후 재개:  {resume_time:6.2f}s, LLM {resume_calls}회")
+    print(f"완료된 분석 재사용:       {reuse_time:6.2f}s, LLM {reuse_calls}회")
+    print(f"report부터 재실행:        {rerun_time:6.2f}s, LLM {rerun_calls}회")
+    print(f"배치 제한 시간 {timeout:.2f}s 초과: 진행 중이던 LLM {started}회 취소, 이후 시작/완료 0회")
+
+
+if __name__ == "__main__":
+    main()
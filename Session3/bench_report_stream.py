@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+report_writer_3_5 스트리밍 하네스: 첫 토큰까지 걸린 시간(TTFT) vs 전체 완료 시간
+- 토큰마다 지연을 두고 생성하는 스트리밍 채팅 모델 스텁 + bench_report_workflow의 데이터 스텁
+- run_workflow(블로킹)는 supervisor가 끝나야 보고서를 받고,
+  stream_workflow는 첫 분석가의 첫 토큰부터 바로 받음
+
+실행: python bench_report_stream.py --tokens 40 --token-delay 0.01
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# report_writer_3_5 import 전에 체크포인트 파일을 임시 경로로 지정
+os.environ["REPORT_CHECKPOINT_DB"] = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from bench_report_workflow import install_stubs, rw
+
+
+class StreamingStubModel(BaseChatModel):
+    """tokens개 토큰을 token_delay초 간격으로 생성하는 채팅 모델"""
+
+    tokens: int = 40
+    token_delay: float = 0.01
+
+    @property
+    def _llm_type(self) -> str:
+        return "streaming-stub"
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for i in range(self.tokens):
+            time.sleep(self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=f"t{i} "))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = "".join(chunk.text for chunk in self._stream(messages, stop, run_manager))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="블로킹 실행 vs 토큰 스트리밍 첫 응답 시간")
+    parser.add_argument("--tokens", type=int, default=40, help="LLM 응답 1회 토큰 수")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="토큰 1개 생성 지연(초)")
+    parser.add_argument("--fetch-delay", type=float, default=0.1, help="데이터/검색 호출 1회 지연(초)")
+    args = parser.parse_args()
+
+    install_stubs(args.tokens * args.token_delay, args.fetch_delay)
+    rw.llm = StreamingStubModel(tokens=args.tokens, token_delay=args.token_delay)
+
+    start = time.perf_counter()
+    blocking_state = rw.run_workflow("STUB", fresh=True)
+    blocking_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first_token, tokens_by_node, final_state = None, {}, None
+    for kind, node, value in rw.stream_workflow("STUB", fresh=True):
+        if kind == "token":
+            first_token = first_token or time.perf_counter() - start
+            tokens_by_node[node] = tokens_by_node.get(node, 0) + 1
+        elif kind == "done":
+            final_state = value
+    stream_time = time.perf_counter() - start
+
+    assert final_state["final_report"] == blocking_state["final_report"]
+    assert set(tokens_by_node) == set(rw.ANALYST_NODES + rw.RERUN_NODES), tokens_by_node
+    assert all(count == args.tokens for count in tokens_by_node.values()), tokens_by_node
+
+    print(f"LLM 응답 {args.tokens}토큰 × {args.token_delay:.3f}s, 데이터 지연 {args.fetch_delay:.2f}s")
+    print(f"블로킹 실행: 보고서까지 {blocking_time:6.2f}s (첫 출력도 이 시점)")
+    print(f"스트리밍:    첫 토큰 {first_token:6.2f}s, 전체 {stream_time:6.2f}s")
+    print("노드별 토큰 수: " + ", ".join(f"{node} {count}" for node, count in tokens_by_node.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+report_writer_3_5 워크플로우 타이밍 하네스
+- LLM과 데이터 소스(yfinance, Tavily, 차트)를 지연시간만 흉내내는 스텁으로 교체
+- 순차 모드와 병렬(fan-out/fan-in) 모드의 티커당 소요 시간을 비교
+
+실행: python bench_report_workflow.py --llm-delay 0.5 --fetch-delay 0.3 --runs 3
+(API 키나 네트워크 없이 실행됩니다)
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+# report_writer_3_5는 import 시점에 API 키를 검사하므로 더미 값을 채워둠
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("TAVILY_API_KEY", "tvly-bench")
+
+import report_writer_3_5 as rw
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """llm.invoke(messages) / ainvoke를 흉내내는 스텁"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def invoke(self, messages, *args, **kwargs):
+        time.sleep(self.delay)
+        return FakeResponse(f"[stub 응답] {messages[-1].content[:40]}")
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        await asyncio.sleep(self.delay)
+        return FakeResponse(f"[stub 응답] {messages[-1].content[:40]}")
+
+
+class FakeTool:
+    """@tool 객체의 .invoke(dict) / .ainvoke(dict)를 흉내내는 스텁"""
+
+    def __init__(self, delay: float, result):
+        self.delay = delay
+        self.result = result
+
+    def invoke(self, args, *rest, **kwargs):
+        time.sleep(self.delay)
+        return self.result(args) if callable(self.result) else self.result
+
+    async def ainvoke(self, args, *rest, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self.result(args) if callable(self.result) else self.result
+
+
+def install_stubs(llm_delay: float, fetch_delay: float):
+    rw.llm = FakeLLM(llm_delay)
+    rw.get_stock_basic_data = FakeTool(fetch_delay, {
+        "name": "Stub Corp", "sector": "Technology", "price": 100.0,
+        "market_cap": 1_000_000_000, "pe_ratio": 20.0, "pb_ratio": 3.0,
+        "dividend_yield": 0.01, "52w_high": 120.0, "52w_low": 80.0,
+    })
+    rw.calculate_technical_indicators = FakeTool(fetch_delay, {
+        "current_price": 100.0, "ma20": 98.0, "ma60": 95.0, "rsi": 55.0,
+        "adx": 27.0, "price_ma20_ratio": 100.0 / 98.0, "ma20_ma60_trend": "상승",
+        "volume": 1_000_000, "high_52w": 120.0, "low_52w": 80.0,
+    })
+    rw.analyze_trading_signals = FakeTool(0, {
+        "entry_signal": "매수", "long_score": 3, "short_score": 1,
+    })
+    rw.create_technical_chart = FakeTool(0, "STUB_technical_chart.png")
+    rw.search_company_news_tavily = FakeTool(fetch_delay, {
+        "success": True, "news_count": 1,
+        "news_articles": [{"title": "stub", "content": "stub", "url": "https://example.com", "score": 1}],
+    })
+    # 감정 분석 도구는 내부에서 LLM을 한 번 더 호출함
+    rw.analyze_news_sentiment_ai = FakeTool(llm_delay, {
+        "sentiment": "중립적", "score": 0, "analysis": "stub",
+    })
+
+
+def time_mode(parallel: bool, runs: int) -> float:
+    app = rw.get_workflow(parallel=parallel, checkpoint=False)
+    elapsed = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        final_state = app.invoke(rw.initial_state("STUB"))
+        elapsed.append(time.perf_counter() - start)
+        assert final_state["current_step"] == "completed"
+        assert final_state["fundamental_analysis"] and final_state["technical_analysis"] and final_state["news_analysis"]
+    return min(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="report_writer_3_5 순차/병렬 워크플로우 타이밍")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="LLM 호출 1회 지연(초)")
+    parser.add_argument("--fetch-delay", type=float, default=0.3, help="데이터/검색 호출 1회 지연(초)")
+    parser.add_argument("--runs", type=int, default=3, help="모드별 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    install_stubs(args.llm_delay, args.fetch_delay)
+
+    sequential = time_mode(parallel=False, runs=args.runs)
+    parallel = time_mode(parallel=True, runs=args.runs)
+
+    print(f"LLM 지연 {args.llm_delay:.2f}s, 데이터 지연 {args.fetch_delay:.2f}s, {args.runs}회 중 최솟값")
+    print(f"순차 모드: {sequential:.2f}s / 티커")
+    print(f"병렬 모드: {parallel:.2f}s / 티커")
+    print(f"단축: {sequential - parallel:.2f}s ({sequential / parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+스크리너 벤치마크: 종목별 파이썬 불리언 평가 vs 벡터화 마스크(screener.py)
+- 무작위 지표 값으로 네트워크 없이 실행
+- 두 경로의 점수/신호가 같은지 확인한 뒤 순위표 생성 시간을 비교
+
+실행: python bench_screener.py --tickers 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import screener
+
+
+def legacy_signals(technical_data: dict) -> dict:
+    """tools.analyze_trading_signals의 기존 종목별 평가"""
+    ma20_above_ma60 = technical_data["ma20"] > technical_data["ma60"]
+    price_ma20_ratio = technical_data["price_ma20_ratio"]
+    rsi = technical_data["rsi"]
+    adx = technical_data["adx"]
+
+    long_score = sum([ma20_above_ma60, price_ma20_ratio < 1.02, rsi < 70, adx > 25])
+    short_score = sum([not ma20_above_ma60, price_ma20_ratio > 0.98, rsi > 30, adx > 25])
+
+    if long_score == 4:
+        entry_signal = "강력 매수"
+    elif long_score == 3:
+        entry_signal = "매수"
+    elif short_score == 4:
+        entry_signal = "강력 매도"
+    elif short_score == 3:
+        entry_signal = "매도"
+    else:
+        entry_signal = "중립"
+    return {"entry_signal": entry_signal, "long_score": long_score, "short_score": short_score}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종목별 평가 vs 벡터화 스크리너 비교")
+    parser.add_argument("--tickers", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.tickers
+    tickers = [f"T{i:05d}" for i in range(n)]
+    ma60 = rng.uniform(50, 500, n)
+    ma20 = ma60 * rng.uniform(0.9, 1.1, n)
+    ratio = rng.uniform(0.85, 1.15, n)
+    rsi = rng.uniform(0, 100, n)
+    adx = rng.uniform(5, 50, n)
+
+    start = time.perf_counter()
+    legacy = [
+        legacy_signals({"ma20": ma20[i], "ma60": ma60[i], "price_ma20_ratio": ratio[i], "rsi": rsi[i], "adx": adx[i]})
+        for i in range(n)
+    ]
+    legacy_ranked = sorted(zip(tickers, legacy, adx), key=lambda x: (-x[1]["long_score"], x[1]["short_score"], -x[2]))
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = screener.screen_signals(tickers, ma20, ma60, ratio, rsi, adx)
+    vector_time = time.perf_counter() - start
+
+    by_ticker = table.set_index("ticker")
+    for ticker, expected, _ in legacy_ranked:
+        row = by_ticker.loc[ticker]
+        assert row["entry_signal"] == expected["entry_signal"], ticker
+        assert row["long_score"] == expected["long_score"] and row["short_score"] == expected["short_score"], ticker
+    assert table["ticker"].tolist() == [ticker for ticker, _, _ in legacy_ranked]
+
+    print(f"{n:,}종목, 신호/점수/순위 일치 확인 완료")
+    print(f"종목별 평가:  {legacy_time * 1e3:.1f} ms")
+    print(f"벡터화 평가:  {vector_time * 1e3:.1f} ms")
+    print(f"속도 향상:    {legacy_time / vector_time:.1f}x")
+    print("\n상위 5종목:")
+    print(table.head().to_markdown(index=False))
+
+
+if __name__ == "__main__":
+    main()
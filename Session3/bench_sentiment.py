@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+뉴스 감정 채점 하네스: 종목별 자유 형식 호출 + 키워드 매칭 vs sentiment.score_articles
+- 채점 모델을 구조화 응답 스텁으로 교체 (API 키 불필요), 요청 수/기사 수/소요 시간 비교
+- 여러 종목이 공유하는 기사는 한 번만 채점되는지, 재실행 시 캐시만 쓰는지 확인
+- 기존 키워드 매칭이 응답 양식의 "**긍정적 뉴스**" 머리글 때문에 부정적 응답도 +5로 읽는 문제 재현
+
+실행: python bench_sentiment.py --tickers 20 --llm-delay 0.5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# sentiment import 전에 캐시 경로 지정
+os.environ["SENTIMENT_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "sentiment.sqlite")
+
+import sentiment
+
+
+class FakeScorer:
+    """with_structured_output(SentimentBatch).batch를 흉내내는 스텁 (요청마다 delay초)"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.requests = 0
+        self.articles = 0
+
+    def batch(self, requests, config=None, return_exceptions=False):
+        max_concurrency = (config or {}).get("max_concurrency") or len(requests)
+        rounds = -(-len(requests) // max_concurrency)
+        time.sleep(self.delay * rounds)
+        results = []
+        for messages in requests:
+            self.requests += 1
+            scores = []
+            for block in messages[-1].content.split("\n\n"):
+                header = block.split("\n", 1)[0]            # "[기사 n] 채점 종목: AAA (..), BBB (..)"
+                number = int(header.split("]")[0].split()[-1])
+                self.articles += 1
+                for target in header.split(": ", 1)[1].split(", "):
+                    ticker = target.split()[0]
+                    scores.append(sentiment.TickerScore(article=number, ticker=ticker, score=-6, reason="stub"))
+            results.append(sentiment.SentimentBatch(scores=scores))
+        return results
+
+
+def legacy_keyword_score(analysis: str) -> int:
+    """tools.analyze_news_sentiment_ai의 기존 점수 추출"""
+    if "매우 긍정적" in analysis:
+        return 8
+    elif "긍정적" in analysis:
+        return 5
+    elif "매우 부정적" in analysis:
+        return -8
+    elif "부정적" in analysis:
+        return -5
+    return 0
+
+
+def synthetic_news(n_tickers: int, per_ticker: int = 6, shared: int = 2) -> dict:
+    """종목마다 고유 기사 + 모든 종목이 공유하는 시장 기사"""
+    common = [
+        {"title": f"시장 기사 {i}", "url": f"https://www.market.example.com/story/{i}/?utm_source=x",
+         "content": f"시장 전체 기사 {i}", "score": 0.6}
+        for i in range(shared)
+    ]
+    news = {}
+    for t in range(n_tickers):
+        own = [
+            {"title": f"T{t} 기사 {i}", "url": f"https://news.example.com/t{t}/{i}",
+             "content": f"T{t} 관련 기사 {i}", "score": 0.9}
+            for i in range(per_ticker - shared)
+        ]
+        news[f"T{t:03d}"] = own + common
+    return news
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종목별 감정 호출 vs 묶음 구조화 채점")
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="LLM 요청 1회 지연(초)")
+    args = parser.parse_args()
+
+    news = synthetic_news(args.tickers)
+    scorer = FakeScorer(args.llm_delay)
+    sentiment._scorer = lambda: scorer
+
+    # 기존: 종목마다 순차 호출 1회 (기사 수와 무관)
+    legacy_time = args.tickers * args.llm_delay
+
+    start = time.perf_counter()
+    scored = sentiment.score_articles(news)
+    batch_time = time.perf_counter() - start
+    unique_articles = len({sentiment.article_key(a) for articles in news.values() for a in articles})
+    assert scorer.articles == unique_articles, (scorer.articles, unique_articles)
+    assert all(len(rows) == len(news[t]) for t, rows in scored.items())
+    first_requests = scorer.requests
+
+    start = time.perf_counter()
+    sentiment.score_articles(news)
+    cached_time = time.perf_counter() - start
+    assert scorer.requests == first_requests
+
+    summary = sentiment.summarize(next(iter(scored.values())))
+    negative_reply = "## 뉴스 감정 분석 결과\n**감정 점수**: -6/10 → 부정적\n**긍정적 뉴스** (상승 요인):\n- 없음"
+
+    print(f"{args.tickers}종목, 기사 {sum(map(len, news.values()))}건 (고유 {unique_articles}건), LLM 지연 {args.llm_delay:.2f}s")
+    print(f"기존 종목별 호출:   요청 {args.tickers}회, 약 {legacy_time:.2f}s (순차)")
+    print(f"묶음 구조화 채점:   요청 {first_requests}회 (요청당 기사 {sentiment.ARTICLES_PER_REQUEST}건), {batch_time:.2f}s")
+    print(f"재실행 (캐시):      요청 0회, {cached_time * 1e3:.1f} ms")
+    print(f"부정적 응답(-6)의 점수: 기존 키워드 매칭 {legacy_keyword_score(negative_reply):+d}, "
+          f"구조화 출력 {summary['score']:+d} ({summary['sentiment']})")
+
+
+if __name__ == "__main__":
+    main()
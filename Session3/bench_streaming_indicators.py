@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+관심종목 폴링 벤치마크: 새 봉마다 전체 재계산 vs IndicatorState 증분 갱신
+- 합성 일봉으로 네트워크 없이 실행
+- 증분 결과가 전체 재계산 결과와 완전히 같은지, 직렬화 후 재개해도 같은지 확인
+
+실행: python bench_streaming_indicators.py --tickers 50 --days 252 --new-bars 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import indicators
+from bench_indicators import synthetic_histories
+from streaming_indicators import IndicatorState
+
+
+def bar_at(hist, i: int) -> dict:
+    row = hist.iloc[i]
+    return {"High": row["High"], "Low": row["Low"], "Close": row["Close"],
+            "Volume": row["Volume"], "date": hist.index[i].date()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 재계산 vs 증분 지표 갱신 비교")
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--days", type=int, default=252)
+    parser.add_argument("--new-bars", type=int, default=20, help="초기 상태 이후 들어오는 봉 개수")
+    args = parser.parse_args()
+
+    histories = synthetic_histories(args.tickers, args.days + args.new_bars)
+    seed_len = {ticker: len(hist) - args.new_bars for ticker, hist in histories.items()}
+    states = {ticker: IndicatorState.from_history(ticker, hist.iloc[:seed_len[ticker]])
+              for ticker, hist in histories.items()}
+
+    # 1) 새 봉마다 전체 히스토리로 재계산 (기존 방식)
+    start = time.perf_counter()
+    for ticker, hist in histories.items():
+        for i in range(seed_len[ticker], len(hist)):
+            indicators.attach_indicators(hist.iloc[: i + 1].copy())
+    recompute_time = time.perf_counter() - start
+
+    # 2) 증분 갱신
+    start = time.perf_counter()
+    for ticker, hist in histories.items():
+        for i in range(seed_len[ticker], len(hist)):
+            states[ticker].update(bar_at(hist, i))
+    streaming_time = time.perf_counter() - start
+
+    # 결과 비교: 마지막 봉 지표가 전체 재계산과 같아야 함
+    for ticker, hist in histories.items():
+        expected = indicators.attach_indicators(hist.copy()).iloc[-1]
+        for name in indicators.INDICATOR_COLUMNS:
+            np.testing.assert_array_equal(states[ticker].latest[name], expected[name], err_msg=f"{ticker} {name}")
+
+    # 직렬화 후 재개: 저장 → 복원 → 같은 봉을 넣으면 같은 결과
+    ticker, hist = next(iter(histories.items()))
+    state = IndicatorState.from_history(ticker, hist.iloc[:-1])
+    path = os.path.join(tempfile.mkdtemp(), f"{ticker}.json")
+    state.save(path)
+    resumed = IndicatorState.load(path).update(bar_at(hist, len(hist) - 1))
+    continued = state.update(bar_at(hist, len(hist) - 1))
+    for name in indicators.INDICATOR_COLUMNS:
+        np.testing.assert_array_equal(resumed[name], continued[name], err_msg=f"resume {name}")
+
+    updates = args.tickers * args.new_bars
+    print(f"{args.tickers}종목 × 새 봉 {args.new_bars}개, 결과 일치 및 직렬화 재개 확인 완료")
+    print(f"전체 재계산: {recompute_time:.3f}s ({recompute_time / updates * 1e3:.2f} ms/봉)")
+    print(f"증분 갱신:   {streaming_time:.3f}s ({streaming_time / updates * 1e3:.3f} ms/봉)")
+    print(f"속도 향상:   {recompute_time / streaming_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+워크플로우 시작/요청당 지연 벤치마크
+- 기존 방식: 요청(종목)마다 StateGraph 컴파일 + Mermaid PNG 렌더링 후 실행
+- 현재 방식: get_workflow()로 한 번 컴파일한 그래프를 재사용
+- LLM/데이터는 bench_report_workflow의 스텁을 사용하므로 API 키 없이 실행
+
+실행: python bench_workflow_startup.py --requests 20 [--render]
+--render를 주면 draw_mermaid_png(원격 렌더러, 네트워크 필요) 시간도 측정
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_report_workflow import install_stubs, rw
+
+
+def measure(fn, repeat: int) -> float:
+    """repeat회 실행 평균(초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워크플로우 컴파일/렌더링 비용 측정")
+    parser.add_argument("--requests", type=int, default=20, help="요청(종목) 수")
+    parser.add_argument("--render", action="store_true", help="원격 Mermaid PNG 렌더링 시간도 측정")
+    args = parser.parse_args()
+
+    # 그래프 자체의 오버헤드만 보이도록 스텁 지연은 0
+    install_stubs(llm_delay=0, fetch_delay=0)
+
+    compile_time = measure(lambda: rw.create_workflow(parallel=True), args.requests)
+    mermaid_text_time = measure(lambda: rw.create_workflow(parallel=True).get_graph().draw_mermaid(), 5) - compile_time
+
+    render_time, render_note = None, "(측정 안 함, --render)"
+    if args.render:
+        # 렌더러에 접속할 수 없으면 기존 방식은 재시도 후 예외로 요청 전체가 실패했음
+        output_path = os.path.join(tempfile.mkdtemp(), "workflow.png")
+        start = time.perf_counter()
+        try:
+            rw.get_workflow(checkpoint=False).get_graph().draw_mermaid_png(output_file_path=output_path)
+            render_note = ""
+        except Exception as e:
+            render_note = f"(실패까지 걸린 시간: {str(e).splitlines()[0][:60]})"
+        render_time = time.perf_counter() - start
+
+    cached_app = rw.get_workflow(parallel=True, checkpoint=False)
+    invoke_time = measure(lambda: cached_app.invoke(rw.initial_state("STUB")), args.requests)
+    old_per_request = compile_time + (render_time or 0) + invoke_time
+
+    print(f"\n요청 {args.requests}회 평균 (LLM/데이터 스텁 지연 0)")
+    print(f"그래프 컴파일:             {compile_time * 1e3:8.1f} ms")
+    print(f"Mermaid 텍스트 생성:       {mermaid_text_time * 1e3:8.1f} ms")
+    if render_time is not None:
+        print(f"Mermaid PNG 렌더링:        {render_time * 1e3:8.1f} ms {render_note}")
+    else:
+        print(f"Mermaid PNG 렌더링:        {render_note}")
+    print(f"그래프 실행(invoke):       {invoke_time * 1e3:8.1f} ms")
+    print(f"기존 요청당 오버헤드:      {old_per_request * 1e3:8.1f} ms (컴파일 + 렌더링 + 실행)")
+    print(f"현재 요청당 오버헤드:      {invoke_time * 1e3:8.1f} ms (실행만)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+차트 렌더러 (Agg 백엔드 + 객체지향 Figure API)
+- pyplot 전역 상태를 쓰지 않으므로 스레드/프로세스 풀에서 동시에 호출 가능
+- 차트 종류×크기 프리셋별 Figure 템플릿을 스레드마다 한 번 만들고, 이후에는 선 데이터/제목만 바꿔 다시 그림
+- 크기/DPI 프리셋: CHART_PRESET 환경변수 또는 preset 인자
+  기본 report는 기존 create_technical_chart와 같은 12×10 inch, 300 DPI. 화면용으로 충분하면 screen(120 DPI)을 선택
+
+사용:
+charts.render_technical_chart("AAPL", hist, "AAPL_technical_chart.png")
+png_bytes = charts.render_price_chart("AAPL", df, "AAPL Price (2024-01-01 ~ 2024-06-30)")
+"""
+
+import os
+import threading
+from io import BytesIO
+
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# 이름 -> (가로 inch, 세로 inch, dpi)
+PRESETS = {
+    "report": (12, 10, 300),     # 보고서 기본 (기존 설정과 같은 크기/해상도)
+    "screen": (12, 10, 120),     # 화면용 저해상도 (선택: 렌더링이 빠르고 파일이 작음)
+    "thumbnail": (6, 5, 80),
+    "price": (10, 4, 100),       # Session1 get_stock_chart (기존 plt 기본 dpi)
+}
+DEFAULT_PRESET = os.getenv("CHART_PRESET", "report")
+TECHNICAL_DAYS = 120  # 기술 차트는 최근 약 6개월
+
+_local = threading.local()
+
+
+def _preset(name: str) -> tuple:
+    if name not in PRESETS:
+        raise ValueError(f"알 수 없는 차트 프리셋: {name} (가능: {', '.join(PRESETS)})")
+    return PRESETS[name]
+
+
+def _date_axis(ax):
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+
+
+class TechnicalChartTemplate:
+    """주가 + MA20/MA60 + RSI 두 칸 차트. 축/범례/기준선은 한 번만 만들고 선 데이터만 교체"""
+
+    def __init__(self, preset: str):
+        width, height, self.dpi = _preset(preset)
+        self.fig = Figure(figsize=(width, height), dpi=self.dpi)
+        FigureCanvasAgg(self.fig)
+        ax1, ax2 = self.fig.subplots(2, 1, height_ratios=[2, 1])
+        self.fig.subplots_adjust(left=0.08, right=0.97, top=0.95, bottom=0.07, hspace=0.3)
+
+        # 상단: 주가 + MA
+        self.price, = ax1.plot([], [], label='Price', linewidth=1.5)
+        self.ma20, = ax1.plot([], [], label='MA20', linewidth=1, alpha=0.7)
+        self.ma60, = ax1.plot([], [], label='MA60', linewidth=1, alpha=0.7)
+        self.title1 = ax1.set_title('', fontsize=14, fontweight='bold')
+        ax1.set_ylabel('Price ($)', fontsize=12)
+        ax1.legend(loc='upper left')
+        ax1.grid(True, alpha=0.3)
+
+        # 하단: RSI (30~70 구간 음영은 x 범위와 무관하게 고정)
+        self.rsi, = ax2.plot([], [], label='RSI', linewidth=2, color='purple')
+        ax2.axhline(y=70, color='r', linestyle='--', alpha=0.7, label='Overbought (70)')
+        ax2.axhline(y=30, color='g', linestyle='--', alpha=0.7, label='Oversold (30)')
+        ax2.axhspan(30, 70, alpha=0.1, color='gray')
+        self.title2 = ax2.set_title('', fontsize=12)
+        ax2.set_ylabel('RSI', fontsize=12)
+        ax2.set_xlabel('Date', fontsize=12)
+        ax2.set_ylim(0, 100)
+        ax2.legend(loc='upper left')
+        ax2.grid(True, alpha=0.3)
+
+        _date_axis(ax1)
+        _date_axis(ax2)
+        self.ax1, self.ax2 = ax1, ax2
+
+    def render(self, ticker: str, hist, output, dpi: int = None, fmt: str = "png"):
+        data = hist.tail(TECHNICAL_DAYS)
+        x = mdates.date2num(data.index.to_pydatetime())
+        self.price.set_data(x, data['Close'].to_numpy())
+        self.ma20.set_data(x, data['MA20'].to_numpy())
+        self.ma60.set_data(x, data['MA60'].to_numpy())
+        self.rsi.set_data(x, data['RSI'].to_numpy())
+        self.title1.set_text(f'{ticker} - Price and Moving Averages (6 Months)')
+        self.title2.set_text(f'{ticker} - RSI (14)')
+
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+        if len(x):
+            self.ax2.set_xlim(self.ax1.get_xlim())
+        self.fig.savefig(output, dpi=dpi or self.dpi, format=fmt)
+
+
+class PriceChartTemplate:
+    """종가 한 줄 차트 (Session1 get_stock_chart)"""
+
+    def __init__(self, preset: str):
+        width, height, self.dpi = _preset(preset)
+        self.fig = Figure(figsize=(width, height), dpi=self.dpi)
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.subplots()
+        self.line, = self.ax.plot([], [])
+        self.title = self.ax.set_title('')
+        self.ax.set_xlabel("Date")
+        self.ax.set_ylabel("Price (USD)")
+        self.ax.grid(True, alpha=0.5)
+        self.fig.subplots_adjust(left=0.09, right=0.97, top=0.9, bottom=0.13)
+        _date_axis(self.ax)
+
+    def render(self, title: str, df, output, dpi: int = None, fmt: str = "png"):
+        self.line.set_data(mdates.date2num(df.index.to_pydatetime()), df['Close'].to_numpy())
+        self.title.set_text(title)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.fig.savefig(output, dpi=dpi or self.dpi, format=fmt)
+
+
+def _template(kind, preset: str):
+    """현재 스레드의 (종류, 프리셋) 템플릿 (스레드끼리 Figure를 공유하지 않음)"""
+    templates = getattr(_local, "templates", None)
+    if templates is None:
+        templates = _local.templates = {}
+    key = (kind, preset)
+    if key not in templates:
+        templates[key] = kind(preset)
+    return templates[key]
+
+
+def render_technical_chart(ticker: str, hist, output=None, preset: str = None, dpi: int = None):
+    """
+    기술 차트 렌더링. hist에는 Close/MA20/MA60/RSI 컬럼 필요
+    output이 파일 경로면 저장 후 경로 반환, None이면 PNG bytes 반환
+    """
+    template = _template(TechnicalChartTemplate, preset or DEFAULT_PRESET)
+    return _render(lambda out: template.render(ticker, hist, out, dpi=dpi), output)
+
+
+def render_price_chart(ticker: str, df, title: str = None, output=None, preset: str = "price", dpi: int = None):
+    """종가 차트 렌더링. output이 None이면 PNG bytes 반환"""
+    template = _template(PriceChartTemplate, preset)
+    return _render(lambda out: template.render(title or f"{ticker.upper()} Price", df, out, dpi=dpi), output)
+
+
+def _render(draw, output):
+    if output is None:
+        buf = BytesIO()
+        draw(buf)
+        return buf.getvalue()
+    draw(output)
+    return output
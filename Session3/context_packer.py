@@ -0,0 +1,167 @@
+"""
+프롬프트 컨텍스트 패킹 (토큰 예산 기반)
+- 모델 토크나이저(tiktoken)로 토큰 수를 세어 고정 글자 수 자르기 대신 토큰 예산을 채움
+- 뉴스: 기사 본문을 문장 단위로 나눠 종목 관련도로 순위를 매기고, 기사 간 거의 같은 문장은 한 번만 포함
+- 분석 의견 발췌: 문장 경계에서 토큰 예산만큼 앞부분 유지
+
+설정 (환경변수): NEWS_CONTEXT_TOKENS, ANALYSIS_EXCERPT_TOKENS
+"""
+
+import logging
+import os
+import re
+from functools import lru_cache
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o-mini"
+NEWS_CONTEXT_TOKENS = int(os.getenv("NEWS_CONTEXT_TOKENS", 1200))     # 감정 분석에 넣을 뉴스 본문
+ANALYSIS_EXCERPT_TOKENS = int(os.getenv("ANALYSIS_EXCERPT_TOKENS", 250))  # 보고서의 분석가별 의견 발췌
+NEAR_DUPLICATE_THRESHOLD = 0.8  # 단어 3-gram Jaccard 유사도가 이 이상이면 같은 문장으로 봄
+
+# 관련도 가중치를 주는 투자 관련 단어
+FINANCE_TERMS = {
+    "earnings", "revenue", "guidance", "profit", "margin", "eps", "forecast", "upgrade", "downgrade",
+    "analyst", "rating", "target", "shares", "stock", "dividend", "buyback", "sales", "growth",
+    "실적", "매출", "영업이익", "순이익", "목표주가", "전망", "주가", "배당", "상향", "하향",
+}
+
+# 회사명에서 관련도 계산에 쓰지 않는 단어
+NAME_STOPWORDS = {"inc", "corp", "corporation", "co", "ltd", "plc", "the", "company", "holdings", "group", "class"}
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """모델 토크나이저. 인코딩 파일을 받을 수 없으면(오프라인) None"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("tiktoken 인코딩을 불러오지 못해 근사치로 토큰 수를 계산합니다: %s", e)
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """토큰 수. 토크나이저가 없으면 ASCII 4자당 1토큰, 그 외 문자는 1자당 1토큰으로 넉넉하게 추정"""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    ascii_chars = sum(ch.isascii() for ch in text)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def split_sentences(text: str) -> list:
+    """줄바꿈/문장 부호 기준 문장 분리 (너무 짧은 조각은 버림)"""
+    pieces = re.split(r"(?<=[.!?。])\s+|\n+", text or "")
+    return [piece.strip() for piece in pieces if len(piece.strip()) >= 10]
+
+
+def _words(text: str) -> list:
+    return re.findall(r"[0-9a-z가-힣]+", text.lower())
+
+
+def _shingles(words: list) -> set:
+    if len(words) < 3:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+
+
+def relevance_terms(ticker: str, company_name: str = "") -> set:
+    """종목 관련도 계산용 단어: 티커 + 회사명 단어"""
+    terms = {ticker.lower()}
+    terms.update(word for word in _words(company_name) if len(word) > 1 and word not in NAME_STOPWORDS)
+    return terms
+
+
+def score_sentence(words: list, terms: set) -> float:
+    """종목 단어 3점, 투자 관련 단어 1점 (문장당 최대 5점), 숫자가 있으면 0.5점"""
+    word_set = set(words)
+    score = 3.0 * len(word_set & terms) + min(len(word_set & FINANCE_TERMS), 5)
+    if any(word.isdigit() for word in words):
+        score += 0.5
+    return score
+
+
+def select_sentences(articles: list, ticker: str, company_name: str = "",
+                     budget_tokens: int = NEWS_CONTEXT_TOKENS, model: str = DEFAULT_MODEL) -> dict:
+    """
+    pack_articles의 문장 선택 단계: 토큰 예산 안에서 관련도 순으로 고르고 기사 간 중복 문장은 제외
+    반환: {기사 번호: [(문장 번호, 문장)]} (문장 원래 순서, 고른 문장이 없는 기사는 빠짐)
+    """
+    terms = relevance_terms(ticker, company_name)
+    candidates = []  # (점수, 기사 번호, 문장 번호, 문장, 단어 목록)
+    for article_index, article in enumerate(articles):
+        body = article.get("raw_content") or article.get("content") or ""
+        for sentence_index, sentence in enumerate(split_sentences(body)):
+            words = _words(sentence)
+            score = score_sentence(words, terms) + float(article.get("score") or 0) + 1.0 / (1 + sentence_index)
+            candidates.append((score, article_index, sentence_index, sentence, words))
+    candidates.sort(key=lambda item: (-item[0], item[1], item[2]))
+
+    headers = [_article_header(i, article) for i, article in enumerate(articles)]
+    used_tokens = 0
+    selected = {}                   # 기사 번호 -> [(문장 번호, 문장)]
+    kept_shingles, kept_exact = [], set()
+    for _, article_index, sentence_index, sentence, words in candidates:
+        key = " ".join(words)
+        if key in kept_exact:
+            continue
+        shingles = _shingles(words)
+        if any(len(shingles & other) / len(shingles | other) >= NEAR_DUPLICATE_THRESHOLD for other in kept_shingles):
+            continue
+
+        cost = count_tokens(sentence + " ", model)
+        if article_index not in selected:
+            cost += count_tokens(headers[article_index], model)
+        if used_tokens + cost > budget_tokens:
+            continue  # 더 짧은 문장이 남은 예산에 들어갈 수 있으므로 계속 탐색
+
+        used_tokens += cost
+        selected.setdefault(article_index, []).append((sentence_index, sentence))
+        kept_exact.add(key)
+        kept_shingles.append(shingles)
+
+    return {article_index: sorted(sentences) for article_index, sentences in selected.items()}
+
+
+def _article_header(article_index: int, article: dict) -> str:
+    return f"\n{article_index + 1}. {article.get('title', '')}\n"
+
+
+def pack_articles(articles: list, ticker: str, company_name: str = "",
+                  budget_tokens: int = NEWS_CONTEXT_TOKENS, model: str = DEFAULT_MODEL) -> str:
+    """
+    기사 목록을 토큰 예산 안의 컨텍스트 문자열로 패킹
+    - 본문은 raw_content(전체 본문)가 있으면 사용, 없으면 content(요약)
+    - 모든 기사의 문장을 관련도(+ 기사 검색 점수, 앞쪽 문장 가산점) 순으로 골라 예산을 채움
+    - 출력은 기사 순서/문장 원래 순서대로 "번호. 제목" 아래에 배치
+    """
+    selected = select_sentences(articles, ticker, company_name, budget_tokens, model)
+    parts = []
+    for article_index in sorted(selected):
+        sentences = " ".join(sentence for _, sentence in selected[article_index])
+        parts.append(_article_header(article_index, articles[article_index]) + sentences + "\n")
+    return "".join(parts)
+
+
+def excerpt(text: str, budget_tokens: int = ANALYSIS_EXCERPT_TOKENS, model: str = DEFAULT_MODEL) -> str:
+    """문장 경계에서 토큰 예산만큼 앞부분 발췌 (잘렸으면 끝에 ...)"""
+    text = text or ""
+    if count_tokens(text, model) <= budget_tokens:
+        return text
+    pieces = re.split(r"(?<=[.!?。\n])", text)
+    kept, used = [], 0
+    for piece in pieces:
+        cost = count_tokens(piece, model)
+        if used + cost > budget_tokens:
+            break
+        kept.append(piece)
+        used += cost
+    if not kept:
+        # 첫 문장부터 예산을 넘으면 토큰(또는 글자) 단위로 자름
+        encoding = _encoding(model)
+        kept = [encoding.decode(encoding.encode(text)[:budget_tokens]) if encoding else text[:budget_tokens]]
+    return "".join(kept).rstrip() + "..."
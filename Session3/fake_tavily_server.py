@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+로컬 가짜 Tavily 검색 서버 (테스트/벤치마크용)
+- POST /search 에 쿼리별로 결정적인 결과를 delay초 뒤 응답
+- 쿼리 사이에 추적 파라미터/www/끝 슬래시만 다른 URL, 같은 본문을 다른 URL로 섞어 중복 제거를 확인할 수 있음
+- fail_queries에 포함된 단어가 쿼리에 있으면 500 응답
+
+단독 실행: python fake_tavily_server.py --port 8765 --delay 0.5
+사용: TAVILY_API_BASE_URL=http://127.0.0.1:8765 python report_writer_3_5.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_results(query: str, max_results: int = 3) -> list:
+    """쿼리마다 고유 기사 + 공통 기사(URL 표기만 다름) + 다른 URL의 같은 본문"""
+    slug = "-".join(query.lower().split())[:40]
+    results = [
+        {
+            "title": f"{query} - 고유 기사",
+            "url": f"https://news.example.com/{slug}",
+            "content": f"{query}에 대한 고유 기사 본문",
+            "score": 0.9,
+        },
+        {
+            # 모든 쿼리에 같은 기사, 표기만 다른 URL
+            "title": "공통 기사",
+            "url": f"https://WWW.news.example.com/common/?utm_source={slug}&id=1",
+            "content": "모든 쿼리에 나오는 공통 기사 본문",
+            "score": 0.8,
+        },
+        {
+            # 통신사 기사 재배포: URL은 다르고 본문은 같음
+            "title": "재배포 기사",
+            "url": f"https://mirror-{len(slug) % 3}.example.com/wire/{slug}",
+            "content": "여러 매체에 실린  통신사 기사 본문",
+            "score": 0.7,
+        },
+    ]
+    return results[:max_results]
+
+
+class FakeTavilyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay: float = 0.5, fail_queries=()):
+        super().__init__(address, FakeTavilyHandler)
+        self.delay = delay
+        self.fail_queries = tuple(fail_queries)
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class FakeTavilyHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != "/search":
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with self.server._count_lock:
+            self.server.request_count += 1
+        time.sleep(self.server.delay)
+
+        query = body.get("query", "")
+        if any(word in query for word in self.server.fail_queries):
+            self._reply(500, {"detail": {"error": "fake server error"}})
+            return
+        self._reply(200, {
+            "query": query,
+            "results": fake_results(query, body.get("max_results", 3)),
+            "response_time": self.server.delay,
+        })
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(delay: float = 0.5, port: int = 0, fail_queries=()) -> FakeTavilyServer:
+    """백그라운드 스레드에서 서버 시작 (port=0이면 빈 포트). server.shutdown()으로 종료"""
+    server = FakeTavilyServer(("127.0.0.1", port), delay=delay, fail_queries=fail_queries)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 Tavily 검색 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.5, help="응답 지연(초)")
+    args = parser.parse_args()
+
+    server = FakeTavilyServer(("127.0.0.1", args.port), delay=args.delay)
+    print(f"가짜 Tavily 서버: {server.url} (지연 {args.delay}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
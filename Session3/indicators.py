@@ -0,0 +1,154 @@
+"""
+기술지표 배치 계산 엔진
+- (날짜 × 종목) 2차원 가격 패널을 받아 MA20/MA60/RSI/ATR/ADX를 종목 방향으로 한 번에 계산
+- 이동평균은 (날짜 × 종목) 배열 전체에 DataFrame.rolling().mean()을 한 번 호출 (열 단위 계산)
+  → tools.calculate_technical_indicators의 기존 종목별 pandas 결과와 비트 단위까지 같은 값이 나옴
+- 단일 종목 도구는 attach_indicators()로 이 엔진을 (N × 1) 패널로 호출하는 얇은 래퍼
+
+패널 규칙: 상장 기간이 짧은 종목은 앞쪽을 NaN으로 채움 (앞쪽 NaN은 해당 종목 데이터가 없는 구간으로 취급)
+중간에 빠진 날짜(거래정지, 거래소별 휴장일 등)가 있는 종목은 compute_panel이 그 종목의 행만 모아서 계산하므로
+종목별 계산과 같은 값이 나오고, 빠진 날짜의 지표는 NaN
+"""
+
+import numpy as np
+import pandas as pd
+
+MA_SHORT = 20
+MA_LONG = 60
+WINDOW = 14        # RSI / ATR / ADX 공통 구간
+
+INDICATOR_COLUMNS = ["MA20", "MA60", "RSI", "ATR", "ADX"]
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    열(종목)별 고정 구간 이동평균: 2차원 배열 전체에 DataFrame.rolling(window).mean()을 한 번 호출
+    (열마다 Series.rolling(window).mean()과 같은 계산이므로 종목별 결과와 같은 값.
+     NaN은 건너뛰고, 구간 안의 유효값이 window개 미만이면 NaN)
+    """
+    return pd.DataFrame(values, dtype=np.float64).rolling(window).mean().to_numpy()
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    out = np.empty_like(values)
+    out[0] = np.nan
+    out[1:] = values[1:] - values[:-1]
+    return out
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    out = np.empty_like(values)
+    out[0] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+
+def compute_indicators(high, low, close) -> dict:
+    """
+    (날짜 × 종목) 고가/저가/종가 배열로 모든 지표를 계산
+    반환: {"MA20": 2차원 배열, "MA60": ..., "RSI": ..., "ATR": ..., "ADX": ...}
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+
+    # 종목별 첫 데이터 이전 구간 (패널 정렬용 NaN 패딩)
+    leading = np.cumsum(~np.isnan(close), axis=0) == 0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # RSI 입력
+        delta = _diff(close)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = -np.where(delta < 0, delta, 0.0)
+        gain[leading] = np.nan
+        loss[leading] = np.nan
+
+        # ATR/ADX 입력
+        prev_close = _shift(close)
+        high_low = high - low
+        high_close = np.abs(high - prev_close)
+        low_close = np.abs(low - prev_close)
+        tr = np.maximum(high_low, np.maximum(high_close, low_close))
+
+        plus_dm = _diff(high)
+        minus_dm = _diff(low) * -1
+        plus_dm[plus_dm < 0] = 0
+        minus_dm[minus_dm < 0] = 0
+
+        # 14일 구간 지표는 종목 축으로 이어붙여 한 번에 계산
+        means_14 = rolling_mean(np.concatenate([gain, loss, tr, plus_dm, minus_dm], axis=1), WINDOW)
+        gain_mean, loss_mean, atr, plus_dm_mean, minus_dm_mean = np.split(means_14, 5, axis=1)
+
+        rs = gain_mean / loss_mean
+        rsi = 100 - (100 / (1 + rs))
+
+        plus_di = (plus_dm_mean / atr) * 100
+        minus_di = (minus_dm_mean / atr) * 100
+        dx = (np.abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
+        adx = rolling_mean(dx, WINDOW)
+
+    return {
+        "MA20": rolling_mean(close, MA_SHORT),
+        "MA60": rolling_mean(close, MA_LONG),
+        "RSI": rsi,
+        "ATR": atr,
+        "ADX": adx,
+    }
+
+
+def build_panel(histories: dict) -> dict:
+    """
+    {티커: yfinance 일봉 DataFrame}을 날짜 기준으로 정렬한 High/Low/Close 패널로 변환
+    반환: {"High": DataFrame, "Low": DataFrame, "Close": DataFrame, "Present": DataFrame(bool)}
+          (행: 날짜, 열: 티커, Present: 그 종목 일봉에 해당 날짜 행이 있는지)
+    """
+    panel = {
+        field: pd.DataFrame({ticker: hist[field] for ticker, hist in histories.items()}).sort_index()
+        for field in ("High", "Low", "Close")
+    }
+    present = pd.DataFrame({ticker: pd.Series(True, index=hist.index) for ticker, hist in histories.items()})
+    panel["Present"] = present.reindex(panel["Close"].index).fillna(False).astype(bool)
+    return panel
+
+
+def _compact_rows(present: np.ndarray):
+    """종목(열)별로 있는 행을 위로 모으는 행 순서 (안정 정렬이라 날짜 순서 유지)"""
+    return np.argsort(~present, axis=0, kind="stable")
+
+
+def compute_panel(panel: dict) -> dict:
+    """
+    build_panel() 결과로 지표를 계산해 같은 모양의 DataFrame으로 반환
+    종목마다 자기 행만 이어서 계산 (중간에 빠진 날짜가 있어도 종목별 계산과 같은 값)
+    """
+    close = panel["Close"]
+    present = panel["Present"].to_numpy() if "Present" in panel else close.notna().to_numpy()
+    order = _compact_rows(present)
+    counts = present.sum(axis=0)
+    padding = np.arange(len(close))[:, None] >= counts   # 모은 뒤 아래쪽 빈 행
+
+    def compact(frame):
+        values = np.take_along_axis(frame.to_numpy(dtype=np.float64), order, axis=0)
+        values[padding] = np.nan
+        return values
+
+    indicators = compute_indicators(compact(panel["High"]), compact(panel["Low"]), compact(close))
+
+    result = {}
+    for name, values in indicators.items():
+        # 원래 날짜 위치로 되돌리고 그 종목에 없는 날짜는 NaN
+        restored = np.empty_like(values)
+        np.put_along_axis(restored, order, values, axis=0)
+        restored[~present] = np.nan
+        result[name] = pd.DataFrame(restored, index=close.index, columns=close.columns)
+    return result
+
+
+def attach_indicators(hist: pd.DataFrame) -> pd.DataFrame:
+    """단일 종목 일봉 DataFrame에 지표 컬럼(MA20, MA60, RSI, ATR, ADX)을 추가"""
+    indicators = compute_indicators(
+        hist[["High"]].to_numpy(), hist[["Low"]].to_numpy(), hist[["Close"]].to_numpy()
+    )
+    for name in INDICATOR_COLUMNS:
+        hist[name] = indicators[name][:, 0]
+    return hist
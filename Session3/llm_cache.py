@@ -0,0 +1,196 @@
+"""
+LLM 응답 디스크 캐시 (SQLite)
+- ChatOpenAI(cache=llm_cache.cache)로 연결: 모델/파라미터(llm_string)와 메시지 목록을 해시한 키로 응답 저장
+- 같은 날 같은 데이터로 같은 종목을 다시 분석하면 동일한 프롬프트의 완성 결과를 재사용
+- TTL 만료 + 최대 항목 수 초과 시 가장 오래 안 쓴 항목부터 삭제
+- bypass=True(또는 LLM_CACHE_BYPASS=1)면 캐시를 읽지도 쓰지도 않음
+- hit/miss 카운터, 아낀 토큰 수와 응답 대기 시간 제공
+
+설정 (환경변수): LLM_CACHE_PATH, LLM_CACHE_TTL(초), LLM_CACHE_MAX_ENTRIES, LLM_CACHE_BYPASS
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+DEFAULT_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache", "llm_cache.sqlite"),
+)
+DEFAULT_TTL = float(os.getenv("LLM_CACHE_TTL", 24 * 60 * 60))          # 하루
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+PENDING_TIMEOUT = 10 * 60   # miss 후 이 시간 안에 update가 없으면 실패한 호출로 보고 기록 삭제
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """모델/파라미터 + 메시지 직렬화 문자열의 SHA-256"""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+def _total_tokens(generations) -> int:
+    tokens = 0
+    for generation in generations:
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        tokens += usage.get("total_tokens", 0)
+    return tokens
+
+
+def _dump_generations(generations) -> str:
+    rows = []
+    for generation in generations:
+        if isinstance(generation, ChatGeneration):
+            rows.append({"message": message_to_dict(generation.message)})
+        else:
+            rows.append({"text": generation.text})
+    return json.dumps(rows, ensure_ascii=False)
+
+
+def _load_generations(payload: str) -> list:
+    generations = []
+    for row in json.loads(payload):
+        if "message" in row:
+            generations.append(ChatGeneration(message=messages_from_dict([row["message"]])[0]))
+        else:
+            generations.append(Generation(text=row["text"]))
+    return generations
+
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain BaseCache 구현: 디스크(SQLite)에 저장하는 LLM 응답 캐시"""
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, bypass: bool = None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = os.getenv("LLM_CACHE_BYPASS") == "1" if bypass is None else bypass
+        self._conn = None
+        self._lock = threading.Lock()
+        self._pending = {}   # key -> miss 시각 (update에서 실제 응답 시간 계산, 실패한 호출은 PENDING_TIMEOUT 후 삭제)
+        self._stats = {"hits": 0, "misses": 0, "saved_tokens": 0, "saved_seconds": 0.0}
+
+    # -------------------------------------------------------------------------
+    # BaseCache 인터페이스
+    # -------------------------------------------------------------------------
+
+    def lookup(self, prompt: str, llm_string: str):
+        if self.bypass:
+            return None
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._db().execute(
+                "SELECT payload, tokens, latency, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[3] > self.ttl:
+                self._db().execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self._stats["misses"] += 1
+                self._expire_pending()
+                self._pending[key] = time.perf_counter()
+                return None
+            self._db().execute(
+                "UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._stats["hits"] += 1
+            self._stats["saved_tokens"] += row[1]
+            self._stats["saved_seconds"] += row[2]
+        return _load_generations(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        if self.bypass:
+            return
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            started = self._pending.pop(key, None)
+            latency = time.perf_counter() - started if started is not None else 0.0
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, payload, tokens, latency, created_at, last_used, hits)"
+                " VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, _dump_generations(return_val), _total_tokens(return_val), latency, now, now),
+            )
+            self._evict(db, now)
+
+    def clear(self, **kwargs) -> None:
+        """저장된 응답과 카운터 초기화"""
+        with self._lock:
+            self._db().execute("DELETE FROM llm_cache")
+            self._pending.clear()
+            self._stats.update(hits=0, misses=0, saved_tokens=0, saved_seconds=0.0)
+
+    # -------------------------------------------------------------------------
+    # 통계
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        이 프로세스의 hit/miss, 아낀 토큰/시간과 디스크 전체 누적 값
+        saved_seconds는 hit된 응답이 처음 생성될 때 걸린 시간의 합
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            entries, lifetime_hits, lifetime_tokens, lifetime_seconds = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0), COALESCE(SUM(hits * tokens), 0),"
+                " COALESCE(SUM(hits * latency), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["size"] = entries
+        stats["lifetime"] = {"hits": lifetime_hits, "saved_tokens": lifetime_tokens, "saved_seconds": lifetime_seconds}
+        return stats
+
+    # -------------------------------------------------------------------------
+    # 내부 구현
+    # -------------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        """처음 사용할 때 파일/테이블 생성 (import만으로는 디스크를 건드리지 않음)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, payload TEXT NOT NULL, tokens INTEGER NOT NULL,"
+                " latency REAL NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL,"
+                " hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+            self._conn = conn
+        return self._conn
+
+    def _expire_pending(self):
+        """예외로 끝나 update가 오지 않은 호출의 miss 기록 정리 (lock 안에서 호출)"""
+        cutoff = time.perf_counter() - PENDING_TIMEOUT
+        for key in [key for key, started in self._pending.items() if started < cutoff]:
+            del self._pending[key]
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        db.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+
+# 프로세스 전체에서 공유하는 기본 캐시
+cache = SQLiteLLMCache()
+
+cache_stats = cache.stats
+clear_cache = cache.clear
+
+
+def set_bypass(bypass: bool = True):
+    """캐시를 건너뛰고 항상 API 호출 (프롬프트/모델 비교 실험용)"""
+    cache.bypass = bypass
@@ -0,0 +1,150 @@
+"""
+시장 데이터 공급 모듈 (yfinance 공용 캐시 계층)
+- 모든 도구(Session1, Session3)는 yf.Ticker를 직접 만들지 않고 이 모듈을 통해 데이터를 가져옴
+- 프로세스 내 LRU 캐시 + 데이터 종류별 TTL (시세는 짧게, info는 중간, 일봉은 길게)
+- 같은 데이터를 동시에 요청하면 한 번만 다운로드하고 결과를 공유 (요청 병합)
+- hit/miss/병합 카운터 제공
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import yfinance as yf
+
+import bar_store
+import rate_limits
+
+# 데이터 종류별 캐시 유지 시간(초)
+DEFAULT_TTLS = {
+    "quote": 30,                   # 현재가: 짧게
+    "info": 10 * 60,               # 기업 정보: 중간
+    "history": 60 * 60,            # 일봉: 길게
+    "recommendations": 60 * 60,    # 애널리스트 추천: 하루 중 거의 안 바뀜
+}
+
+
+def _ticker(ticker: str) -> yf.Ticker:
+    """네트워크 호출 직전에 데이터 속도 제한을 통과"""
+    rate_limits.DATA.acquire()
+    return yf.Ticker(ticker)
+
+
+class MarketDataProvider:
+    """yfinance 호출을 LRU + TTL 캐시로 감싼 공급자"""
+
+    def __init__(self, maxsize: int = 512, ttls: dict = None):
+        self.maxsize = maxsize
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._cache = OrderedDict()   # key -> (만료시각, 값)
+        self._inflight = {}           # key -> Future (다운로드 진행 중인 요청)
+        self._lock = threading.Lock()
+        self._stats = {kind: {"hits": 0, "misses": 0, "coalesced": 0} for kind in self.ttls}
+
+    # -------------------------------------------------------------------------
+    # 공개 API
+    # -------------------------------------------------------------------------
+
+    def get_quote(self, ticker: str) -> float:
+        """현재가"""
+        ticker = ticker.upper()
+        return self._get("quote", (ticker,), lambda: _ticker(ticker).fast_info["lastPrice"])
+
+    def get_info(self, ticker: str) -> dict:
+        """Yahoo Finance info dict (복사본)"""
+        ticker = ticker.upper()
+        info = self._get("info", (ticker,), lambda: _ticker(ticker).info)
+        return dict(info)
+
+    def get_history(self, ticker: str, period: str = "1y", start: str = None, end: str = None):
+        """
+        일봉 DataFrame (복사본). start/end가 주어지면 period 대신 기간으로 조회
+        캐시 miss 시 디스크 일봉 저장소(bar_store)에서 읽고, 부족한 tail만 네트워크로 받음
+        """
+        ticker = ticker.upper()
+        if start or end:
+            key = (ticker, None, start, end)
+            fetch = lambda: bar_store.store.get_bars(ticker, start_date=start, end_date=end)
+        else:
+            key = (ticker, period, None, None)
+            fetch = lambda: bar_store.store.get_period(ticker, period)
+        # 호출하는 쪽에서 컬럼을 추가하는 경우가 있으므로 캐시 원본은 건드리지 않도록 복사
+        return self._get("history", key, fetch).copy()
+
+    def get_recommendations(self, ticker: str):
+        """애널리스트 추천 DataFrame (복사본)"""
+        ticker = ticker.upper()
+        recommendations = self._get("recommendations", (ticker,), lambda: _ticker(ticker).recommendations)
+        return recommendations.copy() if recommendations is not None else None
+
+    def stats(self) -> dict:
+        """종류별 hit/miss/병합 카운터와 현재 캐시 크기"""
+        with self._lock:
+            stats = {kind: dict(counts) for kind, counts in self._stats.items()}
+            stats["size"] = len(self._cache)
+        return stats
+
+    def clear(self):
+        """캐시와 카운터 초기화"""
+        with self._lock:
+            self._cache.clear()
+            for counts in self._stats.values():
+                counts.update(hits=0, misses=0, coalesced=0)
+
+    # -------------------------------------------------------------------------
+    # 내부 구현
+    # -------------------------------------------------------------------------
+
+    def _get(self, kind: str, key: tuple, fetch):
+        key = (kind,) + key
+        counts = self._stats[kind]
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                counts["hits"] += 1
+                return entry[1]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                # 같은 요청이 이미 다운로드 중이면 그 결과를 기다림
+                counts["coalesced"] += 1
+                owner = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                counts["misses"] += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttls[kind], value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+
+# 프로세스 전체에서 공유하는 기본 공급자
+provider = MarketDataProvider()
+
+get_quote = provider.get_quote
+get_info = provider.get_info
+get_history = provider.get_history
+get_recommendations = provider.get_recommendations
+cache_stats = provider.stats
+clear_cache = provider.clear
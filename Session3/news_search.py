@@ -0,0 +1,201 @@
+"""
+뉴스 검색 모듈 (Tavily)
+- 종목별 검색 쿼리들을 스레드 풀로 동시에 실행
+- 쿼리+날짜별 디스크 캐시: 같은 날 같은 쿼리는 검색 크레딧/대기 시간을 다시 쓰지 않음
+- 정규화한 URL(추적 파라미터, www, 끝 슬래시 등 제거)과 본문 해시로 중복 기사 제거
+- 쿼리별 실패는 errors에 기록하고 나머지 결과로 계속 진행
+
+설정 (환경변수): TAVILY_API_BASE_URL (로컬 가짜 서버 등), NEWS_CACHE_DIR
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from tavily import TavilyClient
+
+import rate_limits
+
+QUERY_TEMPLATES = [
+    "{ticker} {company_name} news 2024 2025",
+    "{company_name} earnings stock price",
+    "{ticker} analyst rating upgrade downgrade",
+]
+SEARCH_OPTIONS = {"max_results": 3, "include_raw_content": True, "search_depth": "advanced"}
+MAX_ARTICLES = 6
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "NEWS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache", "news"),
+)
+KEEP_DAYS = 3  # 이보다 오래된 날짜 폴더는 정리
+
+# URL 정규화 시 버리는 추적용 쿼리 파라미터
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src", "cmpid", "mod", "guccounter", "ncid", "taid"}
+
+
+def normalize_url(url: str) -> str:
+    """중복 판별용 URL: 소문자 host, www/기본 포트/fragment/추적 파라미터/끝 슬래시 제거, 파라미터 정렬"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+
+def content_hash(text: str) -> str:
+    """공백/대소문자를 무시한 본문 해시 (같은 기사가 다른 URL로 올라온 경우)"""
+    normalized = re.sub(r"\s+", " ", text or "").strip().lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def dedupe_articles(results, limit: int = MAX_ARTICLES) -> list:
+    """검색 결과 순서를 유지하며 URL/본문 중복을 제거하고 기사 dict로 변환"""
+    articles = []
+    seen_urls, seen_contents = set(), set()
+    for result in results:
+        url_key = normalize_url(result.get("url", ""))
+        body = result.get("content", "")
+        body_key = content_hash(body) if body else None
+        if url_key in seen_urls or (body_key and body_key in seen_contents):
+            continue
+        seen_urls.add(url_key)
+        if body_key:
+            seen_contents.add(body_key)
+        articles.append({
+            "title": result.get("title", ""),
+            "content": body,
+            "url": result.get("url", ""),
+            "score": result.get("score", 0),
+            "raw_content": result.get("raw_content") or "",  # 감정 분석 컨텍스트 패킹용 전체 본문
+        })
+        if len(articles) >= limit:
+            break
+    return articles
+
+
+@lru_cache(maxsize=None)
+def _client() -> TavilyClient:
+    """연결을 재사용하도록 프로세스당 클라이언트 1개"""
+    return TavilyClient(api_base_url=os.getenv("TAVILY_API_BASE_URL"))
+
+
+class NewsSearchCache:
+    """쿼리+날짜별 검색 결과 디스크 캐시 (날짜 폴더/쿼리 해시.json)"""
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, keep_days: int = KEEP_DAYS):
+        self.root = root
+        self.keep_days = keep_days
+        self._lock = threading.Lock()
+        self._pruned = False
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _path(self, query: str, day: str) -> str:
+        key = hashlib.sha256(json.dumps([query, SEARCH_OPTIONS], sort_keys=True).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, day, f"{key}.json")
+
+    def get(self, query: str, day: str):
+        path = self._path(query, day)
+        try:
+            with open(path, encoding="utf-8") as f:
+                results = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+        return results
+
+    def put(self, query: str, day: str, results: list):
+        path = self._path(query, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._prune()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._stats.update(hits=0, misses=0)
+
+    def _prune(self):
+        """프로세스당 한 번 keep_days보다 오래된 날짜 폴더 삭제"""
+        with self._lock:
+            if self._pruned:
+                return
+            self._pruned = True
+        cutoff = (date.today() - timedelta(days=self.keep_days)).isoformat()
+        for name in os.listdir(self.root):
+            if name < cutoff:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+
+cache = NewsSearchCache()
+
+
+def search_query(query: str, day: str = None, use_cache: bool = True) -> list:
+    """쿼리 1개 검색 (캐시 우선). 실패 시 예외를 그대로 전달"""
+    day = day or date.today().isoformat()
+    if use_cache:
+        results = cache.get(query, day)
+        if results is not None:
+            return results
+    rate_limits.SEARCH.acquire()
+    results = _client().search(query, **SEARCH_OPTIONS).get("results", [])
+    if use_cache:
+        cache.put(query, day, results)
+    return results
+
+
+def search_news(ticker: str, company_name: str, use_cache: bool = True) -> dict:
+    """
+    종목 뉴스 검색: 쿼리들을 동시에 실행하고 중복을 제거한 기사 목록 반환
+    모든 쿼리가 실패했을 때만 success=False
+    """
+    queries = [template.format(ticker=ticker, company_name=company_name) for template in QUERY_TEMPLATES]
+    day = date.today().isoformat()
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = [executor.submit(search_query, query, day, use_cache) for query in queries]
+
+    all_results, errors = [], []
+    for query, future in zip(queries, futures):
+        try:
+            all_results.extend(future.result())
+        except Exception as e:
+            errors.append(f"{query}: {type(e).__name__}: {e}")
+
+    if errors and len(errors) == len(queries):
+        return {"success": False, "error": "; ".join(errors)}
+
+    articles = dedupe_articles(all_results)
+    news_data = {
+        "success": True,
+        "news_count": len(articles),
+        "news_articles": articles,
+        "search_timestamp": datetime.now().isoformat(),
+    }
+    if errors:
+        news_data["errors"] = errors
+    return news_data
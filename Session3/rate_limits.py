@@ -0,0 +1,47 @@
+"""
+외부 호출 속도 제한 (LLM / 시장 데이터 / 뉴스 검색을 각각 따로 제한)
+- LLM: ChatOpenAI(rate_limiter=rate_limits.LLM)
+- 시장 데이터(yfinance): market_data, bar_store가 네트워크 호출 직전에 DATA.acquire()
+- 뉴스 검색(Tavily): news_search가 캐시 miss로 실제 검색하기 직전에 SEARCH.acquire()
+
+기본값은 제한 없음. batch_report 등에서 configure()로 초당 요청 수를 지정
+"""
+
+from langchain_core.rate_limiters import BaseRateLimiter, InMemoryRateLimiter
+
+
+class ConfigurableRateLimiter(BaseRateLimiter):
+    """나중에 한도를 설정/해제할 수 있는 속도 제한기 (설정 전에는 바로 통과)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._limiter = None
+
+    def configure(self, requests_per_second: float = None, max_bucket_size: float = 1):
+        """초당 요청 수 지정. None이면 제한 해제"""
+        if requests_per_second:
+            self._limiter = InMemoryRateLimiter(
+                requests_per_second=requests_per_second,
+                check_every_n_seconds=min(0.1, 1 / requests_per_second),
+                max_bucket_size=max_bucket_size,
+            )
+        else:
+            self._limiter = None
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        return self._limiter.acquire(blocking=blocking) if self._limiter else True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        return await self._limiter.aacquire(blocking=blocking) if self._limiter else True
+
+
+LLM = ConfigurableRateLimiter("llm")
+DATA = ConfigurableRateLimiter("data")
+SEARCH = ConfigurableRateLimiter("search")
+
+
+def configure(llm_rps: float = None, data_rps: float = None, search_rps: float = None):
+    """세 제한기를 한 번에 설정 (None은 제한 없음)"""
+    LLM.configure(llm_rps)
+    DATA.configure(data_rps)
+    SEARCH.configure(search_rps)
@@ -0,0 +1,61 @@
+# 투자 리서치 봇 v3.5 Streamlit 화면 (노드별 토큰 스트리밍)
+# 실행: streamlit run report_streamlit.py
+
+import os
+
+import streamlit as st
+
+import report_writer_3_5 as rw
+
+NODE_TITLES = {
+    "fundamental": "기본분석가",
+    "technical": "기술분석가",
+    "news": "뉴스분석가",
+    "report": "보고서 초안",
+    "supervisor": "최종 보고서",
+}
+
+st.title("AI 투자 리서치 봇 v3.5")
+
+with st.sidebar:
+    sequential = st.checkbox("분석가 순차 실행")
+    rerun_from = st.selectbox("재실행 시작 단계", ["(처음부터/이어서)"] + rw.RERUN_NODES)
+    fresh = st.checkbox("오늘 체크포인트 무시")
+
+ticker = st.text_input("종목 코드", placeholder="AAPL").strip().upper()
+
+if st.button("분석 시작", disabled=not ticker):
+    # 분석가 세 명은 나란히, report/supervisor는 아래에 출력
+    columns = st.columns(len(rw.ANALYST_NODES))
+    placeholders = {node: column.container(border=True) for node, column in zip(rw.ANALYST_NODES, columns)}
+    for node in rw.RERUN_NODES:
+        placeholders[node] = st.container(border=True)
+
+    texts = {node: "" for node in placeholders}
+    boxes = {}
+    for node, container in placeholders.items():
+        container.markdown(f"**{NODE_TITLES[node]}**")
+        boxes[node] = container.empty()
+
+    events = rw.stream_workflow(
+        ticker,
+        parallel=not sequential,
+        rerun_from=None if rerun_from.startswith("(") else rerun_from,
+        fresh=fresh,
+    )
+    final_state = None
+    with st.spinner(f"{ticker} 분석 중..."):
+        for kind, node, value in events:
+            if kind == "token" and node in boxes:
+                texts[node] += value
+                boxes[node].markdown(texts[node])
+            elif kind == "done":
+                final_state = value
+
+    chart_file = final_state.get("chart_filename", "")
+    if chart_file and os.path.exists(chart_file):
+        st.image(chart_file, caption=f"{ticker} 기술적 분석 차트")
+
+    filename = rw.save_report(ticker, final_state["final_report"])
+    if filename:
+        st.download_button("보고서 다운로드 (.md)", final_state["final_report"], file_name=filename)
@@ -4,19 +4,34 @@
 - tools.py 분리
 - 상세한 보고서 작성 (각 의견 300자 이상)
 - 기술 차트 이미지 포함
+- 기본/기술/뉴스 분석가 병렬 실행 (fan-out → report에서 fan-in)
+- SQLite 체크포인트 (종목+날짜별): 중단된 분석 이어서 실행, report/supervisor만 재실행
+- LLM 응답 디스크 캐시 (llm_cache): 같은 프롬프트는 API를 다시 호출하지 않음
+- 스트리밍 실행 (--stream, report_streamlit.py): 노드별 토큰을 생성되는 대로 출력
 
 필요 패키지:
-pip install langgraph langchain-openai yfinance python-dotenv pandas numpy tavily-python matplotlib
+pip install langgraph langgraph-checkpoint-sqlite langchain-openai yfinance python-dotenv pandas numpy tavily-python matplotlib
 """
 
+import argparse
 import os
+import sqlite3
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import TypedDict
+from functools import lru_cache
+from typing import Annotated, Generator, TypedDict
 from dotenv import load_dotenv
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+import context_packer
+import llm_cache
+import rate_limits
 
 # tools.py에서 도구들 import
 from tools import (
@@ -38,36 +53,75 @@ if not os.getenv("OPENAI_API_KEY") or not os.getenv("TAVILY_API_KEY"):
 # 상태 정의
 # =============================================================================
 
+def merge_dict(left: dict, right: dict) -> dict:
+    """dict 필드 reducer: 병렬 노드가 각자 쓴 값을 합칩니다"""
+    return {**(left or {}), **(right or {})}
+
+def keep_last(left: str, right: str) -> str:
+    """str 필드 reducer: 같은 단계에서 여러 노드가 써도 마지막 값만 남깁니다"""
+    return right or left
+
+# 분석가 노드는 자기 몫의 필드만 반환하고, 동시에 쓰일 수 있는 필드는 reducer로 병합
 class InvestmentState(TypedDict):
     ticker: str
-    stock_data: dict
-    technical_data: dict
-    news_data: dict
+    stock_data: Annotated[dict, merge_dict]
+    technical_data: Annotated[dict, merge_dict]
+    news_data: Annotated[dict, merge_dict]
     chart_filename: str
     fundamental_analysis: str
     technical_analysis: str
     news_analysis: str
     draft_report: str
     final_report: str
-    current_step: str
+    current_step: Annotated[str, keep_last]
 
 # =============================================================================
 # AI 에이전트들 (LangGraph 노드 함수들)
 # =============================================================================
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+# 같은 모델/파라미터/메시지의 응답은 llm_cache(SQLite)에서 재사용
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1, rate_limiter=rate_limits.LLM, cache=llm_cache.cache)
+
+# 노드 본문: (도구 또는 llm, 입력)을 yield하면 그 호출 결과를 돌려받는 제너레이터
+NodeSteps = Generator[tuple, object, dict]
+
+def graph_node(steps):
+    """
+    제너레이터 노드 본문 하나로 동기/비동기 LangGraph 노드를 만듦
+    - app.invoke/stream: 도구/LLM을 .invoke로 호출
+    - app.ainvoke: .ainvoke로 호출 → 실행이 취소되면(wait_for 시간 초과 등) 진행 중인 LLM 호출도 함께 취소
+    """
+    def run(state):
+        calls = steps(state)
+        try:
+            runnable, arg = next(calls)
+            while True:
+                runnable, arg = calls.send(runnable.invoke(arg))
+        except StopIteration as done:
+            return done.value
+
+    async def arun(state):
+        calls = steps(state)
+        try:
+            runnable, arg = next(calls)
+            while True:
+                runnable, arg = calls.send(await runnable.ainvoke(arg))
+        except StopIteration as done:
+            return done.value
+
+    return RunnableLambda(run, afunc=arun, name=steps.__name__)
+
 
-def fundamental_analyst(state: InvestmentState) -> InvestmentState:
+@graph_node
+def fundamental_analyst(state: InvestmentState) -> NodeSteps:
     """기본 분석 에이전트"""
     print("\n[기본분석가 작업 중...]")
     
     ticker = state["ticker"]
-    data = get_stock_basic_data.invoke({"ticker": ticker})
-    state["stock_data"] = data
+    data = yield get_stock_basic_data, {"ticker": ticker}
     
     if "error" in data:
-        state["fundamental_analysis"] = f"데이터 오류: {data['error']}"
-        return state
+        return {"stock_data": data, "fundamental_analysis": f"데이터 오류: {data['error']}"}
     
     prompt = f"""
 당신은 경험 많은 기본분석 전문가입니다.
@@ -98,37 +152,39 @@ def fundamental_analyst(state: InvestmentState) -> InvestmentState:
     messages = [SystemMessage(content="당신은 기업 기본분석 전문가입니다."), 
                 HumanMessage(content=prompt)]
     
-    response = llm.invoke(messages)
-    state["fundamental_analysis"] = response.content
-    state["current_step"] = "fundamental_done"
+    response = yield llm, messages
     
     print("기본분석 완료!")
-    return state
+    return {
+        "stock_data": data,
+        "fundamental_analysis": response.content,
+        "current_step": "fundamental_done"
+    }
 
-def technical_analyst(state: InvestmentState) -> InvestmentState:
+@graph_node
+def technical_analyst(state: InvestmentState) -> NodeSteps:
     """기술 분석 에이전트"""
     print("[기술분석가 작업 중...]")
     
     ticker = state["ticker"]
     
     # 기술지표 계산
-    tech_data = calculate_technical_indicators.invoke({"ticker": ticker})
-    state["technical_data"] = tech_data
+    tech_data = yield calculate_technical_indicators, {"ticker": ticker}
     
     if "error" in tech_data:
-        state["technical_analysis"] = f"기술지표 계산 실패: {tech_data['error']}"
-        return state
+        return {"technical_data": tech_data, "technical_analysis": f"기술지표 계산 실패: {tech_data['error']}"}
     
     # 매매신호 분석
-    signals = analyze_trading_signals.invoke({"technical_data": tech_data})
+    signals = yield analyze_trading_signals, {"technical_data": tech_data}
     
-    # 차트 생성
-    if "hist_data" in tech_data:
-        chart_file = create_technical_chart.invoke({
+    # 차트 생성 (DataFrame은 체크포인트에 저장하지 않도록 상태에서 제외)
+    chart_file = ""
+    hist_data = tech_data.pop("hist_data", None)
+    if hist_data is not None:
+        chart_file = yield create_technical_chart, {
             "ticker": ticker, 
-            "hist_data": tech_data["hist_data"]
-        })
-        state["chart_filename"] = chart_file
+            "hist_data": hist_data
+        }
     
     prompt = f"""
 당신은 경험 많은 기술분석 전문가입니다.
@@ -159,37 +215,40 @@ def technical_analyst(state: InvestmentState) -> InvestmentState:
     messages = [SystemMessage(content="당신은 기술분석 전문가입니다."), 
                 HumanMessage(content=prompt)]
     
-    response = llm.invoke(messages)
-    state["technical_analysis"] = response.content
-    state["current_step"] = "technical_done"
+    response = yield llm, messages
     
     print("기술분석 완료!")
-    return state
+    return {
+        "technical_data": tech_data,
+        "chart_filename": chart_file,
+        "technical_analysis": response.content,
+        "current_step": "technical_done"
+    }
 
-def news_analyst(state: InvestmentState) -> InvestmentState:
+@graph_node
+def news_analyst(state: InvestmentState) -> NodeSteps:
     """뉴스 분석 에이전트"""
     print("[뉴스분석가 작업 중...]")
     
     ticker = state["ticker"]
-    data = state["stock_data"]
+    # 병렬 모드에서는 기본분석가가 아직 stock_data를 채우지 않았으므로 직접 조회 (회사명/섹터만 사용)
+    data = state.get("stock_data") or (yield get_stock_basic_data, {"ticker": ticker})
     
     # 뉴스 검색
-    news_data = search_company_news_tavily.invoke({
+    news_data = yield search_company_news_tavily, {
         "ticker": ticker, 
         "company_name": data.get('name', ticker)
-    })
-    state["news_data"] = news_data
+    }
     
     if not news_data.get("success"):
-        state["news_analysis"] = f"뉴스 검색 실패: {news_data.get('error', 'Unknown error')}"
-        return state
+        return {"news_data": news_data, "news_analysis": f"뉴스 검색 실패: {news_data.get('error', 'Unknown error')}"}
     
     # 감정 분석
-    sentiment_result = analyze_news_sentiment_ai.invoke({
+    sentiment_result = yield analyze_news_sentiment_ai, {
         "news_data": news_data,
         "ticker": ticker,
         "company_name": data.get('name', ticker)
-    })
+    }
     
     prompt = f"""
 당신은 시장 뉴스 및 정서 분석 전문가입니다.
@@ -217,14 +276,17 @@ AI 감정 분석:
     messages = [SystemMessage(content="당신은 시장 뉴스 및 정서 분석 전문가입니다."), 
                 HumanMessage(content=prompt)]
     
-    response = llm.invoke(messages)
-    state["news_analysis"] = response.content
-    state["current_step"] = "news_done"
+    response = yield llm, messages
     
     print("뉴스분석 완료!")
-    return state
+    return {
+        "news_data": news_data,
+        "news_analysis": response.content,
+        "current_step": "news_done"
+    }
 
-def report_writer(state: InvestmentState) -> InvestmentState:
+@graph_node
+def report_writer(state: InvestmentState) -> NodeSteps:
     """보고서 작성 에이전트"""
     print("[보고서작성가 작업 중...]")
     
@@ -268,13 +330,13 @@ def report_writer(state: InvestmentState) -> InvestmentState:
 ## 분석가별 상세 의견
 
 ### 기본분석가 의견
-{state['fundamental_analysis'][:500]}...
+{context_packer.excerpt(state['fundamental_analysis'])}
 
 ### 기술분석가 의견  
-{state['technical_analysis'][:500]}...
+{context_packer.excerpt(state['technical_analysis'])}
 
 ### 뉴스분석가 의견
-{state['news_analysis'][:500]}...
+{context_packer.excerpt(state['news_analysis'])}
 
 ## 투자 리스크
 - **높은 리스크**: [최우선 리스크]
@@ -290,14 +352,13 @@ def report_writer(state: InvestmentState) -> InvestmentState:
     messages = [SystemMessage(content="당신은 투자 보고서 작성 전문가입니다."), 
                 HumanMessage(content=prompt)]
     
-    response = llm.invoke(messages)
-    state["draft_report"] = response.content
-    state["current_step"] = "report_done"
+    response = yield llm, messages
     
     print("보고서 작성 완료!")
-    return state
+    return {"draft_report": response.content, "current_step": "report_done"}
 
-def supervisor(state: InvestmentState) -> InvestmentState:
+@graph_node
+def supervisor(state: InvestmentState) -> NodeSteps:
     """감독 에이전트"""
     print("[감독관 검토 중...]")
     
@@ -321,18 +382,41 @@ def supervisor(state: InvestmentState) -> InvestmentState:
     messages = [SystemMessage(content="당신은 투자 보고서 품질 관리 전문가입니다."), 
                 HumanMessage(content=prompt)]
     
-    response = llm.invoke(messages)
-    state["final_report"] = response.content
-    state["current_step"] = "completed"
+    response = yield llm, messages
     
     print("감독 검토 완료!")
-    return state
+    return {"final_report": response.content, "current_step": "completed"}
 
 # =============================================================================
 # 워크플로우 및 실행
 # =============================================================================
 
-def create_workflow():
+ANALYST_NODES = ["fundamental", "technical", "news"]
+RERUN_NODES = ["report", "supervisor"]  # 분석가 결과를 재사용해 다시 돌릴 수 있는 단계
+
+CHECKPOINT_DB = os.getenv(
+    "REPORT_CHECKPOINT_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache", "report_checkpoints.sqlite"),
+)
+
+@lru_cache(maxsize=None)
+def get_checkpointer(path: str = CHECKPOINT_DB) -> SqliteSaver:
+    """노드 실행 결과를 저장하는 SQLite 체크포인터 (프로세스당 연결 1개, 스레드 간 공유)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    return SqliteSaver(conn)
+
+def thread_id(ticker: str, as_of: str = None, parallel: bool = True) -> str:
+    """체크포인트 키: 종목+날짜 (같은 날 재실행하면 이전 결과를 이어서 사용, 순차 모드는 그래프가 달라 따로 저장)"""
+    key = f"{ticker.upper()}-{as_of or datetime.now().strftime('%Y-%m-%d')}"
+    return key if parallel else f"{key}-seq"
+
+def create_workflow(parallel: bool = True, checkpointer=None):
+    """
+    parallel=True: 세 분석가를 동시에 실행(fan-out)하고 report에서 합류(fan-in)
+    parallel=False: fundamental → technical → news → report 순차 실행
+    checkpointer를 주면 노드가 끝날 때마다 상태를 저장 (실행 시 thread_id 필요)
+    """
     workflow = StateGraph(InvestmentState)
     
     workflow.add_node("fundamental", fundamental_analyst)
@@ -341,19 +425,31 @@ def create_workflow():
     workflow.add_node("report", report_writer)
     workflow.add_node("supervisor", supervisor)
     
-    workflow.set_entry_point("fundamental")
-    workflow.add_edge("fundamental", "technical")
-    workflow.add_edge("technical", "news")
-    workflow.add_edge("news", "report")
+    if parallel:
+        for node in ANALYST_NODES:
+            workflow.add_edge(START, node)
+        workflow.add_edge(ANALYST_NODES, "report")  # 세 분석가가 모두 끝나야 report 실행
+    else:
+        workflow.set_entry_point("fundamental")
+        workflow.add_edge("fundamental", "technical")
+        workflow.add_edge("technical", "news")
+        workflow.add_edge("news", "report")
     workflow.add_edge("report", "supervisor")
     workflow.add_edge("supervisor", END)
 
-    app = workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
-    absolute_path = os.path.abspath(__file__)
-    app.get_graph().draw_mermaid_png(output_file_path=absolute_path.replace('.py', '.png'))
+@lru_cache(maxsize=None)
+def get_workflow(parallel: bool = True, checkpoint: bool = True):
+    """컴파일된 워크플로우를 모드별로 한 번만 만들어 모든 종목/스레드에서 재사용"""
+    return create_workflow(parallel=parallel, checkpointer=get_checkpointer() if checkpoint else None)
 
-    return app
+def draw_workflow(parallel: bool = True, output_path: str = None) -> str:
+    """워크플로우 다이어그램 PNG 저장 (원격 Mermaid 렌더러를 쓸 수 있으므로 명시적으로 요청할 때만 실행)"""
+    output_path = output_path or os.path.abspath(__file__).replace('.py', '.png')
+    get_workflow(parallel, checkpoint=False).get_graph().draw_mermaid_png(output_file_path=output_path)
+    print(f"워크플로우 다이어그램 저장: {output_path}")
+    return output_path
 
 def save_report(ticker: str, report: str) -> str:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -368,10 +464,8 @@ def save_report(ticker: str, report: str) -> str:
         print(f"보고서 저장 실패: {e}")
         return None
 
-def analyze_stock(ticker: str):
-    print(f"\n{ticker} [분석 시작...]")
-    
-    initial_state = {
+def initial_state(ticker: str) -> dict:
+    return {
         "ticker": ticker.upper(),
         "stock_data": {},
         "technical_data": {},
@@ -384,16 +478,147 @@ def analyze_stock(ticker: str):
         "final_report": "",
         "current_step": "started"
     }
+
+def _check_rerun_node(rerun_from: str):
+    if rerun_from not in RERUN_NODES:
+        raise ValueError(f"재실행 가능한 단계: {', '.join(RERUN_NODES)}")
+
+def _plan_from_snapshot(ticker: str, tid: str, config: dict, snapshot):
+    """현재 체크포인트 상태로 (입력, 실행 config, 완료된 상태 또는 None) 결정"""
+    if snapshot.next:
+        print(f"[체크포인트 {tid}: {', '.join(snapshot.next)}부터 이어서 실행]")
+        return None, config, None
+    if snapshot.values.get("current_step") == "completed":
+        print(f"[체크포인트 {tid}: 완료된 분석 재사용]")
+        return None, config, snapshot.values
+    return initial_state(ticker), config, None
+
+def _plan_run(ticker: str, parallel: bool, rerun_from: str, fresh: bool, as_of: str):
+    """
+    체크포인트 상태를 보고 실행 방법 결정
+    반환: (app, 입력, 실행 config, 스레드 config, 이미 완료된 상태 또는 None) — 입력이 None이면 체크포인트에서 이어서 실행
+    """
+    app = get_workflow(parallel=parallel)
+    tid = thread_id(ticker, as_of, parallel)
+    config = {"configurable": {"thread_id": tid}}
+
+    if fresh:
+        get_checkpointer().delete_thread(tid)
+
+    if rerun_from:
+        _check_rerun_node(rerun_from)
+        # 해당 노드 실행 직전 체크포인트에서 분기 (가장 최근 것부터 조회)
+        for snapshot in app.get_state_history(config):
+            if snapshot.next == (rerun_from,):
+                print(f"[체크포인트 {tid}: {rerun_from}부터 재실행]")
+                return app, None, snapshot.config, config, None
+        raise ValueError(f"{tid}: {rerun_from} 이전 단계까지 완료된 체크포인트가 없습니다")
+
+    graph_input, run_config, completed = _plan_from_snapshot(ticker, tid, config, app.get_state(config))
+    return app, graph_input, run_config, config, completed
+
+def run_workflow(ticker: str, parallel: bool = True, rerun_from: str = None,
+                 fresh: bool = False, as_of: str = None) -> dict:
+    """
+    체크포인트를 이용해 워크플로우를 실행하고 최종 상태를 반환
+    - 오늘 완료된 분석이 있으면 그대로 반환, 중간에 멈춘 분석은 마지막 완료 노드 다음부터 이어서 실행
+    - rerun_from="report"/"supervisor": 저장된 분석가 결과로 해당 단계부터 다시 실행
+    - fresh=True: 저장된 체크포인트를 지우고 처음부터 실행
+    """
+    app, graph_input, run_config, _, completed = _plan_run(ticker, parallel, rerun_from, fresh, as_of)
+    if completed is not None:
+        return completed
+    return app.invoke(graph_input, run_config)
+
+@asynccontextmanager
+async def async_workflow(parallel: bool = True, path: str = CHECKPOINT_DB):
+    """
+    app.ainvoke용 (워크플로우, AsyncSqliteSaver)
+    비동기 체크포인터 연결은 현재 이벤트 루프에 묶이므로 실행 구간(async with) 동안만 유지
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(path) as checkpointer:
+        yield create_workflow(parallel=parallel, checkpointer=checkpointer), checkpointer
+
+async def arun_workflow(app, checkpointer, ticker: str, parallel: bool = True, rerun_from: str = None,
+                        fresh: bool = False, as_of: str = None) -> dict:
+    """
+    run_workflow의 비동기 버전 (async_workflow()의 app/checkpointer 사용)
+    asyncio 취소(wait_for 시간 초과 등) 시 진행 중인 LLM 호출을 취소하고 다음 노드도 시작하지 않음
+    (완료된 노드는 체크포인트에 남음. 데이터/검색 도구는 동기 함수라 스레드에서 끝까지 돌고 결과만 버림)
+    """
+    tid = thread_id(ticker, as_of, parallel)
+    config = {"configurable": {"thread_id": tid}}
+    if fresh:
+        await checkpointer.adelete_thread(tid)
+
+    if rerun_from:
+        _check_rerun_node(rerun_from)
+        async for snapshot in app.aget_state_history(config):
+            if snapshot.next == (rerun_from,):
+                print(f"[체크포인트 {tid}: {rerun_from}부터 재실행]")
+                return await app.ainvoke(None, snapshot.config)
+        raise ValueError(f"{tid}: {rerun_from} 이전 단계까지 완료된 체크포인트가 없습니다")
+
+    graph_input, run_config, completed = _plan_from_snapshot(ticker, tid, config, await app.aget_state(config))
+    if completed is not None:
+        return completed
+    return await app.ainvoke(graph_input, run_config)
+
+def stream_workflow(ticker: str, parallel: bool = True, rerun_from: str = None,
+                    fresh: bool = False, as_of: str = None):
+    """
+    run_workflow의 스트리밍 버전: 실행 중 이벤트를 (종류, 노드, 값) 튜플로 yield
+    - ("token", 노드, 텍스트): 노드의 LLM이 생성한 토큰 (병렬 분석가의 토큰은 섞여서 도착)
+    - ("update", 노드, dict): 노드가 끝나며 반환한 상태 변경분
+    - ("done", None, 최종 상태): 마지막 이벤트
+    """
+    app, graph_input, run_config, thread_config, completed = _plan_run(ticker, parallel, rerun_from, fresh, as_of)
+    if completed is not None:
+        # 이미 완료된 분석은 최종 보고서를 supervisor 출력 한 번으로 전달
+        yield "token", "supervisor", completed["final_report"]
+        yield "done", None, completed
+        return
+
+    for mode, payload in app.stream(graph_input, run_config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            chunk, metadata = payload
+            if chunk.content:
+                yield "token", metadata["langgraph_node"], chunk.content
+        else:
+            for node, update in payload.items():
+                yield "update", node, update
+    yield "done", None, app.get_state(thread_config).values
+
+def print_stream(events) -> dict:
+    """stream_workflow 이벤트를 콘솔에 출력하고 최종 상태를 반환 (노드가 바뀔 때마다 [노드] 머리말)"""
+    current_node = None
+    for kind, node, value in events:
+        if kind == "token":
+            if node != current_node:
+                print(f"\n\n[{node}] ", end="", flush=True)
+                current_node = node
+            print(value, end="", flush=True)
+        elif kind == "done":
+            print()
+            return value
+
+def analyze_stock(ticker: str, parallel: bool = True, rerun_from: str = None, fresh: bool = False,
+                  stream: bool = False):
+    print(f"\n{ticker} [분석 시작...]")
     
     try:
-        app = create_workflow() # 랭그래프 워크플로우 객체 생성
-        final_state = app.invoke(initial_state) # 작업 실행
+        if stream:
+            # 토큰이 생성되는 대로 출력 (supervisor 토큰이 곧 최종 보고서)
+            final_state = print_stream(stream_workflow(ticker, parallel=parallel, rerun_from=rerun_from, fresh=fresh))
+        else:
+            final_state = run_workflow(ticker, parallel=parallel, rerun_from=rerun_from, fresh=fresh) # 작업 실행 (체크포인트 재사용)
         
-        print(f"\n" + "="*60)
-        print(f"{ticker} 투자 분석 보고서 v3.5")
-        print("="*60)
-        print(final_state["final_report"])
-        print("="*60)
+            print(f"\n" + "="*60)
+            print(f"{ticker} 투자 분석 보고서 v3.5")
+            print("="*60)
+            print(final_state["final_report"])
+            print("="*60)
         
         # 차트 파일 확인
         chart_file = final_state.get("chart_filename", "")
@@ -408,6 +633,22 @@ def analyze_stock(ticker: str):
         return None, None
 
 def main():
+    parser = argparse.ArgumentParser(description="AI 투자 리서치 봇 v3.5")
+    parser.add_argument("--draw", action="store_true", help="워크플로우 다이어그램 PNG만 저장하고 종료")
+    parser.add_argument("--sequential", action="store_true", help="분석가를 순차 실행")
+    parser.add_argument("--rerun-from", choices=RERUN_NODES, help="저장된 분석가 결과로 이 단계부터 다시 실행")
+    parser.add_argument("--fresh", action="store_true", help="오늘 체크포인트를 무시하고 처음부터 분석")
+    parser.add_argument("--no-llm-cache", action="store_true", help="LLM 응답 캐시를 사용하지 않음")
+    parser.add_argument("--stream", action="store_true", help="노드별 LLM 토큰을 생성되는 대로 출력")
+    args = parser.parse_args()
+
+    if args.no_llm_cache:
+        llm_cache.set_bypass()
+
+    if args.draw:
+        draw_workflow(parallel=not args.sequential)
+        return
+
     print("AI 투자 리서치 봇 v3.5")
     print("=" * 50)
     print("업데이트: tools.py 분리 + 상세보고서 + 기술차트")
@@ -426,7 +667,8 @@ def main():
             continue
         
         try:
-            result, filename = analyze_stock(ticker)
+            result, filename = analyze_stock(ticker, parallel=not args.sequential,
+                                             rerun_from=args.rerun_from, fresh=args.fresh, stream=args.stream)
             
             if result and filename:
                 print(f"\n{ticker} 분석 완료!")
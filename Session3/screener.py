@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+유니버스 매매신호 스크리너
+- analyze_trading_signals의 16개 진입/청산 조건을 N개 종목 배열에 대한 불리언 마스크로 한 번에 평가
+- entry_signal / long_score / short_score 순위표를 만들고, 상위 종목만 LLM 분석(report_writer_3_5)으로 보냄
+- 조건 정의는 이 모듈 한 곳에만 있고, tools.analyze_trading_signals도 같은 함수를 사용
+
+실행: python screener.py AAPL MSFT NVDA TSLA --top 3 [--report]
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import indicators
+import market_data
+
+SIGNAL_LABELS = ["강력 매수", "매수", "강력 매도", "매도"]
+NEUTRAL_LABEL = "중립"
+
+
+def evaluate_conditions(ma20, ma60, price_ma20_ratio, rsi, adx) -> dict:
+    """
+    16개 조건을 불리언 배열로 평가 (스칼라를 넣으면 0차원 배열)
+    반환: {"long_conditions": {...}, "short_conditions": {...},
+           "long_exit_conditions": {...}, "short_exit_conditions": {...}}
+    """
+    ma20, ma60 = np.asarray(ma20, dtype=float), np.asarray(ma60, dtype=float)
+    price_ma20_ratio = np.asarray(price_ma20_ratio, dtype=float)
+    rsi, adx = np.asarray(rsi, dtype=float), np.asarray(adx, dtype=float)
+
+    ma20_above_ma60 = ma20 > ma60
+
+    return {
+        "long_conditions": {
+            "trend": ma20_above_ma60,
+            "position": price_ma20_ratio < 1.02,
+            "momentum": rsi < 70,
+            "strength": adx > 25
+        },
+        "short_conditions": {
+            "trend": ~ma20_above_ma60,
+            "position": price_ma20_ratio > 0.98,
+            "momentum": rsi > 30,
+            "strength": adx > 25
+        },
+        "long_exit_conditions": {
+            "trend_break": ~ma20_above_ma60,
+            "overbought": rsi > 75,
+            "weak_trend": adx < 20,
+            "distance": price_ma20_ratio > 1.08
+        },
+        "short_exit_conditions": {
+            "trend_break": ma20_above_ma60,
+            "oversold": rsi < 25,
+            "weak_trend": adx < 20,
+            "distance": price_ma20_ratio < 0.92
+        },
+    }
+
+
+def score_conditions(conditions: dict) -> dict:
+    """조건 묶음별 점수(참인 조건 개수)와 진입 신호 라벨"""
+    scores = {
+        group.replace("_conditions", "_score"): np.sum(list(masks.values()), axis=0)
+        for group, masks in conditions.items()
+    }
+    long_score, short_score = scores["long_score"], scores["short_score"]
+    # 우선순위: 강력 매수 > 매수 > 강력 매도 > 매도 > 중립 (기존 if/elif 순서와 동일)
+    scores["entry_signal"] = np.select(
+        [long_score == 4, long_score == 3, short_score == 4, short_score == 3],
+        SIGNAL_LABELS,
+        default=NEUTRAL_LABEL
+    )
+    return scores
+
+
+def screen_signals(tickers, ma20, ma60, price_ma20_ratio, rsi, adx) -> pd.DataFrame:
+    """
+    N개 종목의 지표 배열로 신호를 평가하고 순위표를 반환
+    정렬: long_score 내림차순 → short_score 오름차순 → ADX(추세 강도) 내림차순
+    """
+    scores = score_conditions(evaluate_conditions(ma20, ma60, price_ma20_ratio, rsi, adx))
+    table = pd.DataFrame({
+        "ticker": list(tickers),
+        "entry_signal": scores["entry_signal"],
+        "long_score": scores["long_score"],
+        "short_score": scores["short_score"],
+        "long_exit_score": scores["long_exit_score"],
+        "short_exit_score": scores["short_exit_score"],
+        "rsi": np.asarray(rsi, dtype=float),
+        "adx": np.asarray(adx, dtype=float),
+        "price_ma20_ratio": np.asarray(price_ma20_ratio, dtype=float),
+    })
+    table = table.sort_values(
+        ["long_score", "short_score", "adx"], ascending=[False, True, False], kind="stable"
+    )
+    return table.reset_index(drop=True)
+
+
+def screen_universe(tickers, period: str = "1y", max_workers: int = 8) -> pd.DataFrame:
+    """티커 목록의 일봉을 받아 배치 지표 엔진으로 계산한 뒤 순위표를 반환"""
+    tickers = [ticker.upper() for ticker in tickers]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        histories = dict(zip(tickers, pool.map(lambda t: market_data.get_history(t, period=period), tickers)))
+    histories = {ticker: hist for ticker, hist in histories.items() if not hist.empty}
+
+    panel = indicators.build_panel(histories)
+    # 마지막 날짜에 봉이 없는 종목(휴장일이 다른 거래소 등)은 자기 마지막 거래일 값
+    latest = {name: frame.ffill().iloc[-1] for name, frame in indicators.compute_panel(panel).items()}
+    close = panel["Close"].ffill().iloc[-1]
+
+    return screen_signals(
+        close.index,
+        latest["MA20"].to_numpy(),
+        latest["MA60"].to_numpy(),
+        (close / latest["MA20"]).to_numpy(),
+        latest["RSI"].to_numpy(),
+        latest["ADX"].to_numpy(),
+    )
+
+
+def read_ticker_file(path: str) -> list:
+    """티커 목록 파일 읽기 (한 줄에 하나, 빈 줄과 #으로 시작하는 줄은 무시)"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def top_candidates(table: pd.DataFrame, n: int) -> list:
+    """순위표 상위 n개 티커"""
+    return table["ticker"].head(n).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="매매신호 스크리너")
+    parser.add_argument("tickers", nargs="*", help="티커 목록")
+    parser.add_argument("--file", help="티커 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--top", type=int, default=5, help="LLM 분석으로 보낼 상위 종목 수")
+    parser.add_argument("--report", action="store_true", help="상위 종목을 report_writer_3_5로 분석")
+    args = parser.parse_args()
+
+    tickers = list(args.tickers)
+    if args.file:
+        tickers += read_ticker_file(args.file)
+    if not tickers:
+        parser.error("티커를 입력하거나 --file을 지정하세요")
+
+    table = screen_universe(tickers)
+    print(table.to_markdown(index=False))
+
+    candidates = top_candidates(table, args.top)
+    print(f"\n상위 {len(candidates)}종목: {', '.join(candidates)}")
+
+    if args.report:
+        from report_writer_3_5 import analyze_stock
+        for ticker in candidates:
+            analyze_stock(ticker)
+
+
+if __name__ == "__main__":
+    main()
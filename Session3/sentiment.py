@@ -0,0 +1,313 @@
+"""
+뉴스 감정 점수 일괄 계산 (구조화 출력)
+- 여러 종목의 기사들을 기사 단위로 모아 한 요청에 여러 기사씩 넣고, 요청들은 .batch()로 동시에 실행
+- 응답은 스키마(SentimentBatch)로 받아 기사×종목마다 -10~+10 숫자 점수와 근거를 얻음 (키워드 매칭 없음)
+- 기사 본문은 종목별로 context_packer 문장 선택(관련도 순위 + 기사 간 3-gram 중복 제거)으로 추림
+- 기사 URL(정규화)별로 디스크 캐시: 여러 종목이 공유하는 기사는 한 번만 채점, 같은 날 재실행도 재사용
+- 종목 점수는 기사 점수를 검색 점수로 가중 평균
+
+설정 (환경변수): SENTIMENT_CACHE_PATH
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
+
+import context_packer
+import llm_cache
+import market_data
+import news_search
+import rate_limits
+
+ARTICLES_PER_REQUEST = 8     # 한 요청에 넣는 기사 수
+ARTICLE_TOKENS = 300         # 기사 1개당 평균 본문 토큰 예산 (종목별 합계 안에서 관련도 순으로 배분)
+MAX_CONCURRENCY = 4          # 동시에 보내는 요청 수
+SEARCH_CONCURRENCY = 8       # 동시에 뉴스를 검색하는 종목 수 (검색 속도 제한은 rate_limits.SEARCH)
+CACHE_TTL = 7 * 24 * 60 * 60
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "SENTIMENT_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache", "sentiment.sqlite"),
+)
+
+SYSTEM_PROMPT = """당신은 금융 뉴스 감정 분석 전문가입니다.
+각 기사가 지정된 종목의 주가에 주는 영향을 종목별로 -10~+10 정수로 채점하세요.
+-8~-10 매우 부정적, -4~-7 부정적, -3~+3 중립적, +4~+7 긍정적, +8~+10 매우 긍정적.
+기사 번호와 종목을 빠짐없이 채점하고, reason에는 근거를 한국어 한 문장으로 쓰세요."""
+
+
+class TickerScore(BaseModel):
+    article: int = Field(description="기사 번호")
+    ticker: str = Field(description="채점한 종목 티커")
+    score: int = Field(ge=-10, le=10, description="주가 영향 점수 (-10 ~ +10)")
+    reason: str = Field(description="근거 한 문장")
+
+
+class SentimentBatch(BaseModel):
+    scores: List[TickerScore]
+
+
+def label(score: float) -> str:
+    if score >= 8:
+        return "매우 긍정적"
+    if score > 3:
+        return "긍정적"
+    if score <= -8:
+        return "매우 부정적"
+    if score < -3:
+        return "부정적"
+    return "중립적"
+
+
+def article_key(article: dict) -> str:
+    """캐시 키: 정규화 URL (URL이 없으면 본문 해시)"""
+    if article.get("url"):
+        return news_search.normalize_url(article["url"])
+    return "sha1:" + news_search.content_hash(article.get("content", ""))
+
+
+class SentimentCache:
+    """(기사 키, 종목) -> (점수, 근거) SQLite 캐시"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get_many(self, pairs) -> dict:
+        found = {}
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            db = self._db()
+            for key, ticker in pairs:
+                row = db.execute(
+                    "SELECT score, reason FROM sentiment WHERE article = ? AND ticker = ? AND created_at >= ?",
+                    (key, ticker, cutoff),
+                ).fetchone()
+                if row is not None:
+                    found[(key, ticker)] = {"score": row[0], "reason": row[1]}
+        return found
+
+    def put_many(self, values: dict):
+        now = time.time()
+        with self._lock:
+            self._db().executemany(
+                "INSERT OR REPLACE INTO sentiment (article, ticker, score, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(key, ticker, value["score"], value["reason"], now) for (key, ticker), value in values.items()],
+            )
+
+    def clear(self):
+        with self._lock:
+            self._db().execute("DELETE FROM sentiment")
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                " article TEXT NOT NULL, ticker TEXT NOT NULL, score INTEGER NOT NULL,"
+                " reason TEXT NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (article, ticker))"
+            )
+            self._conn = conn
+        return self._conn
+
+
+cache = SentimentCache()
+
+
+@lru_cache(maxsize=None)
+def _scorer():
+    """구조화 출력 채점 모델 (프로세스당 1개). 중간 결과이므로 토큰 스트리밍에서 제외"""
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, rate_limiter=rate_limits.LLM,
+                     cache=llm_cache.cache, tags=["nostream"])
+    return llm.with_structured_output(SentimentBatch)
+
+
+def _article_bodies(missing: dict, articles: dict, company_names: dict) -> dict:
+    """
+    채점할 기사의 본문 컨텍스트 {기사 키: 본문}
+    종목마다 그 종목 기사들에서 관련도 높은 문장을 고르고 기사 간 중복 문장은 뺌 (context_packer.select_sentences)
+    여러 종목이 공유하는 기사는 종목별로 고른 문장을 합침
+    본문(raw_content)이 없어 고른 문장이 없으면 요약(content) 앞부분 발췌
+    """
+    keys_by_ticker = {}
+    for key, tickers in missing.items():
+        for ticker in tickers:
+            keys_by_ticker.setdefault(ticker, []).append(key)
+
+    chosen = {}   # 기사 키 -> {문장 번호: 문장}
+    for ticker, keys in keys_by_ticker.items():
+        selected = context_packer.select_sentences(
+            [articles[key] for key in keys], ticker, company_names.get(ticker, ""),
+            budget_tokens=ARTICLE_TOKENS * len(keys),
+        )
+        for index, sentences in selected.items():
+            chosen.setdefault(keys[index], {}).update(sentences)
+
+    bodies = {}
+    for key in missing:
+        article = articles[key]
+        if key in chosen:
+            bodies[key] = " ".join(sentence for _, sentence in sorted(chosen[key].items()))
+        elif not article.get("raw_content"):
+            bodies[key] = context_packer.excerpt(article.get("content", ""), ARTICLE_TOKENS)
+        else:
+            bodies[key] = "(본문 생략: 다른 기사와 중복되거나 관련 문장 없음)"
+    return bodies
+
+
+def _request_messages(items: list) -> list:
+    """items: [(기사 dict, [(티커, 회사명)], 본문)] -> 채점 요청 메시지"""
+    parts = []
+    for number, (article, companies, body) in enumerate(items, 1):
+        targets = ", ".join(f"{ticker} ({name})" for ticker, name in companies)
+        parts.append(f"[기사 {number}] 채점 종목: {targets}\n제목: {article.get('title', '')}\n{body}")
+    return [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content="\n\n".join(parts))]
+
+
+def _plan_scoring(news_by_ticker: dict, company_names: dict) -> dict:
+    """캐시에 없는 (기사, 종목)만 모아 채점 요청 메시지를 만듦"""
+    news_by_ticker = {ticker.upper(): news for ticker, news in news_by_ticker.items()}
+    company_names = {ticker.upper(): name for ticker, name in (company_names or {}).items()}
+
+    # 기사 키별로 채점이 필요한 종목을 모음 (공유 기사는 한 항목으로)
+    articles, wanted = {}, {}
+    for ticker, news in news_by_ticker.items():
+        for article in news:
+            key = article_key(article)
+            articles.setdefault(key, article)
+            wanted.setdefault(key, [])
+            if ticker not in wanted[key]:
+                wanted[key].append(ticker)
+
+    pairs = [(key, ticker) for key, tickers in wanted.items() for ticker in tickers]
+    scores = cache.get_many(pairs)
+    missing = {}
+    for key, ticker in pairs:
+        if (key, ticker) not in scores:
+            missing.setdefault(key, []).append(ticker)
+
+    chunks, requests = [], []
+    if missing:
+        keys = list(missing)
+        bodies = _article_bodies(missing, articles, company_names)
+        chunks = [keys[i:i + ARTICLES_PER_REQUEST] for i in range(0, len(keys), ARTICLES_PER_REQUEST)]
+        requests = [
+            _request_messages([
+                (articles[key], [(t, company_names.get(t, t)) for t in missing[key]], bodies[key]) for key in chunk
+            ])
+            for chunk in chunks
+        ]
+    return {"news_by_ticker": news_by_ticker, "scores": scores, "missing": missing,
+            "chunks": chunks, "requests": requests}
+
+
+def _collect_scores(plan: dict, results: list) -> dict:
+    """채점 응답을 캐시에 저장하고 종목별 결과로 정리"""
+    scores, missing = plan["scores"], plan["missing"]
+    if results:
+        failures = [result for result in results if isinstance(result, Exception)]
+        if len(failures) == len(results):
+            raise failures[0]
+
+        fresh = {}
+        for chunk, result in zip(plan["chunks"], results):
+            if isinstance(result, Exception):
+                continue  # 일부 요청 실패: 해당 기사는 캐시하지 않고 결과에서 빠짐
+            for item in result.scores:
+                if 1 <= item.article <= len(chunk):
+                    key = chunk[item.article - 1]
+                    ticker = item.ticker.upper()
+                    if ticker in missing[key]:
+                        fresh[(key, ticker)] = {"score": item.score, "reason": item.reason}
+        cache.put_many(fresh)
+        scores.update(fresh)
+
+    scored = {}
+    for ticker, news in plan["news_by_ticker"].items():
+        rows = []
+        for article in news:
+            value = scores.get((article_key(article), ticker))
+            if value is not None:
+                rows.append({
+                    "title": article.get("title", ""),
+                    "url": article.get("url", ""),
+                    "score": value["score"],
+                    "reason": value["reason"],
+                    "search_score": article.get("score", 0),
+                })
+        scored[ticker] = rows
+    return scored
+
+
+def score_articles(news_by_ticker: dict, company_names: dict = None) -> dict:
+    """
+    여러 종목의 기사 감정 점수 일괄 계산
+    news_by_ticker: {티커: [기사 dict]}, company_names: {티커: 회사명}
+    반환: {티커: [{title, url, score, reason, search_score}]} (입력 기사 순서)
+    """
+    plan = _plan_scoring(news_by_ticker, company_names)
+    results = []
+    if plan["requests"]:
+        results = _scorer().batch(plan["requests"], config={"max_concurrency": MAX_CONCURRENCY},
+                                  return_exceptions=True)
+    return _collect_scores(plan, results)
+
+
+async def ascore_articles(news_by_ticker: dict, company_names: dict = None) -> dict:
+    """score_articles의 비동기 버전 (취소되면 진행 중인 채점 요청도 취소)"""
+    plan = _plan_scoring(news_by_ticker, company_names)
+    results = []
+    if plan["requests"]:
+        results = await _scorer().abatch(plan["requests"], config={"max_concurrency": MAX_CONCURRENCY},
+                                         return_exceptions=True)
+    return _collect_scores(plan, results)
+
+
+def summarize(scored_articles: list) -> dict:
+    """기사 점수 -> 종목 감정 (검색 점수 가중 평균, analyze_news_sentiment_ai 반환 형식)"""
+    if not scored_articles:
+        return {"sentiment": "중립적", "score": 0, "analysis": "채점된 뉴스 없음", "articles": []}
+    weights = [max(float(row["search_score"] or 0), 0.1) for row in scored_articles]
+    score = sum(w * row["score"] for w, row in zip(weights, scored_articles)) / sum(weights)
+    lines = [f"## 뉴스 감정 분석 결과\n\n**감정 점수**: {score:+.1f}/10 → {label(score)}\n"]
+    for row in sorted(scored_articles, key=lambda r: -abs(r["score"])):
+        lines.append(f"- ({row['score']:+d}) {row['title']}: {row['reason']}")
+    return {
+        "sentiment": label(score),
+        "score": round(score),
+        "analysis": "\n".join(lines),
+        "articles": scored_articles,
+    }
+
+
+def _ticker_news(ticker: str, use_news_cache: bool):
+    """한 종목의 (회사명, 기사 목록)"""
+    try:
+        company_name = market_data.get_info(ticker).get("longName", ticker)
+    except Exception:
+        company_name = ticker
+    news = news_search.search_news(ticker, company_name, use_cache=use_news_cache)
+    return company_name, news.get("news_articles", []) if news.get("success") else []
+
+
+def analyze_tickers(tickers, use_news_cache: bool = True) -> dict:
+    """종목 목록의 뉴스 검색 + 감정 점수를 한 번에 계산 (배치 실행 전 미리 채점해 캐시를 채우는 용도)"""
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    # 종목별 검색은 스레드 풀에서 동시에 실행 (search_news 안의 쿼리도 동시 실행)
+    with ThreadPoolExecutor(max_workers=max(1, min(SEARCH_CONCURRENCY, len(tickers)))) as executor:
+        results = list(executor.map(lambda ticker: _ticker_news(ticker, use_news_cache), tickers))
+    company_names = {ticker: name for ticker, (name, _) in zip(tickers, results)}
+    news_by_ticker = {ticker: news for ticker, (_, news) in zip(tickers, results)}
+    scored = score_articles(news_by_ticker, company_names)
+    return {ticker: summarize(rows) for ticker, rows in scored.items()}
@@ -0,0 +1,221 @@
+"""
+증분(스트리밍) 기술지표 상태
+- 종목별 IndicatorState가 MA20/MA60/RSI(14)/ATR(14)/ADX 구간의 링버퍼와 누적합을 보관
+- 새 일봉 1개를 받으면 모든 지표를 O(1)로 갱신 (전체 히스토리 재계산 없음)
+- indicators.py와 같은 보정 합산을 쓰므로 같은 히스토리를 처음부터 넣으면 배치 결과와 값이 완전히 같음
+- to_dict()/from_dict(), save()/load()로 직렬화해서 재시작 후 이어서 갱신 가능
+
+장중 폴링: 아직 확정되지 않은 오늘 봉은 preview()로 계산만 하고, 장 마감 후 update()로 확정
+"""
+
+import copy
+import json
+import math
+from collections import deque
+
+import numpy as np
+
+from indicators import MA_SHORT, MA_LONG, WINDOW
+
+NAN = float("nan")
+
+
+def _divide(a: float, b: float) -> float:
+    """numpy와 같은 0 나눗셈 규칙(inf/NaN)으로 나눔"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return float(np.float64(a) / np.float64(b))
+
+
+def _maximum(a: float, b: float) -> float:
+    """np.maximum과 같이 NaN을 전파하는 max"""
+    if math.isnan(a) or math.isnan(b):
+        return NAN
+    return max(a, b)
+
+
+class RollingMean:
+    """
+    고정 구간 이동평균의 O(1) 갱신 상태 (pandas rolling().mean()과 같은 보정 합산)
+    NaN은 건너뛰고, 구간 안 유효값이 window개 미만이면 NaN
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = deque(maxlen=window)
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        # 구간 값이 모두 같으면 부동소수 오차 없이 그 값을 그대로 반환 (pandas와 동일)
+        self.same_count = 0
+        self.prev_value = NAN
+
+    def push(self, new: float) -> float:
+        """값 하나를 추가하고 현재 평균을 반환"""
+        if len(self.buffer) == self.window:
+            old = self.buffer[0]
+            if old == old:
+                self.nobs -= 1
+                self.neg_ct -= math.copysign(1.0, old) < 0
+                y = -old - self.compensation_remove
+                t = self.sum_x + y
+                self.compensation_remove = t - self.sum_x - y
+                self.sum_x = t
+        self.buffer.append(new)
+
+        if new == new:
+            self.nobs += 1
+            self.neg_ct += math.copysign(1.0, new) < 0
+            y = new - self.compensation_add
+            t = self.sum_x + y
+            self.compensation_add = t - self.sum_x - y
+            self.sum_x = t
+            self.same_count = self.same_count + 1 if new == self.prev_value else 1
+            self.prev_value = new
+
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.nobs < self.window:
+            return NAN
+        result = self.prev_value if self.same_count >= self.nobs else self.sum_x / self.nobs
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+    def to_dict(self) -> dict:
+        state = {key: value for key, value in vars(self).items() if key != "buffer"}
+        state["buffer"] = list(self.buffer)
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "RollingMean":
+        rolling = cls(state["window"])
+        for key, value in state.items():
+            if key != "buffer":
+                setattr(rolling, key, value)
+        rolling.buffer.extend(state["buffer"])
+        return rolling
+
+
+class IndicatorState:
+    """한 종목의 MA20/MA60/RSI/ATR/ADX 증분 계산 상태"""
+
+    _WINDOWS = {
+        "ma20": MA_SHORT,
+        "ma60": MA_LONG,
+        "gain": WINDOW,
+        "loss": WINDOW,
+        "tr": WINDOW,
+        "plus_dm": WINDOW,
+        "minus_dm": WINDOW,
+        "dx": WINDOW,
+    }
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker.upper()
+        self.windows = {name: RollingMean(window) for name, window in self._WINDOWS.items()}
+        self.prev_bar = None          # 직전 봉의 High/Low/Close
+        self.last_date = None
+        self.bar_count = 0
+        self.latest = {}
+
+    # -------------------------------------------------------------------------
+    # 갱신
+    # -------------------------------------------------------------------------
+
+    def update(self, bar: dict) -> dict:
+        """
+        확정된 일봉 하나를 반영하고 최신 지표를 반환
+        bar: {"High", "Low", "Close"} 필수, "Volume", "date" 선택
+        """
+        high, low, close = float(bar["High"]), float(bar["Low"]), float(bar["Close"])
+        prev = self.prev_bar or {"High": NAN, "Low": NAN, "Close": NAN}
+        w = self.windows
+
+        # RSI: 첫 봉의 변화량(NaN)은 pandas where()와 같이 0으로 취급
+        delta = close - prev["Close"]
+        gain_mean = w["gain"].push(delta if delta > 0 else 0.0)
+        loss_mean = w["loss"].push(-delta if delta < 0 else 0.0)
+        rsi = 100 - _divide(100, 1 + _divide(gain_mean, loss_mean))
+
+        # ATR
+        tr = _maximum(high - low, _maximum(abs(high - prev["Close"]), abs(low - prev["Close"])))
+        atr = w["tr"].push(tr)
+
+        # ADX
+        plus_dm = high - prev["High"]
+        minus_dm = (low - prev["Low"]) * -1
+        plus_dm = 0.0 if plus_dm < 0 else plus_dm
+        minus_dm = 0.0 if minus_dm < 0 else minus_dm
+        plus_di = _divide(w["plus_dm"].push(plus_dm), atr) * 100
+        minus_di = _divide(w["minus_dm"].push(minus_dm), atr) * 100
+        dx = _divide(abs(plus_di - minus_di), plus_di + minus_di) * 100
+        adx = w["dx"].push(dx)
+
+        self.prev_bar = {"High": high, "Low": low, "Close": close}
+        self.last_date = str(bar["date"]) if bar.get("date") is not None else self.last_date
+        self.bar_count += 1
+        self.latest = {
+            "date": self.last_date,
+            "Close": close,
+            "Volume": float(bar["Volume"]) if bar.get("Volume") is not None else None,
+            "MA20": w["ma20"].push(close),
+            "MA60": w["ma60"].push(close),
+            "RSI": rsi,
+            "ATR": atr,
+            "ADX": adx,
+        }
+        return dict(self.latest)
+
+    def preview(self, bar: dict) -> dict:
+        """장중 미확정 봉으로 지표를 계산만 하고 상태는 바꾸지 않음 (상태 크기가 고정이므로 O(1))"""
+        return copy.deepcopy(self).update(bar)
+
+    @classmethod
+    def from_history(cls, ticker: str, hist) -> "IndicatorState":
+        """yfinance 일봉 DataFrame 전체를 순서대로 넣어 초기 상태를 만듦"""
+        state = cls(ticker)
+        for timestamp, high, low, close, volume in zip(
+            hist.index, hist["High"], hist["Low"], hist["Close"], hist["Volume"]
+        ):
+            state.update({"High": high, "Low": low, "Close": close, "Volume": volume, "date": timestamp.date()})
+        return state
+
+    # -------------------------------------------------------------------------
+    # 직렬화
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        return {
+            "ticker": self.ticker,
+            "windows": {name: rolling.to_dict() for name, rolling in self.windows.items()},
+            "prev_bar": self.prev_bar,
+            "last_date": self.last_date,
+            "bar_count": self.bar_count,
+            "latest": self.latest,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        state = cls(data["ticker"])
+        state.windows = {name: RollingMean.from_dict(rolling) for name, rolling in data["windows"].items()}
+        state.prev_bar = data["prev_bar"]
+        state.last_date = data["last_date"]
+        state.bar_count = data["bar_count"]
+        state.latest = data["latest"]
+        return state
+
+    def save(self, path: str):
+        # float은 repr로 저장되어 그대로 복원되므로 재시작 후에도 같은 값으로 이어서 계산됨 (NaN 포함)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "IndicatorState":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,137 @@
+# bench_mcp_session_pool.py
+# MultiServerMCPClient.get_tools() 도구(호출마다 새 세션) vs MCPSessionPool 도구(유지된 세션) 호출 지연 비교
+# - math: stdio (호출마다 python math_server.py 프로세스 시작 + initialize)
+# - weather: streamable_http (이 스크립트가 weather_server.py를 127.0.0.1:8000에 띄움, 호출마다 initialize 왕복)
+#   get_coordinates는 외부 지오코딩을 쓰므로 오프라인이면 오류를 잡아 None을 돌려줌 (지연은 MCP 부분만 비교됨)
+# - 세션 하나(기본값)로 동시 호출 시 순차 호출 대비 시간 (세션을 공유하므로 직렬화되지 않아야 함)
+# - 끝으로 weather 서버를 재시작해서 풀이 재연결하는지 확인
+#
+# Usage: python bench_mcp_session_pool.py [호출 횟수]
+
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+from mcp_session_pool import MCPSessionPool
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+CONNECTIONS = {
+    "math": {
+        "command": sys.executable,
+        "args": [os.path.join(current_dir, "math_server.py")],
+        "transport": "stdio",
+    },
+    "weather": {
+        "url": "http://127.0.0.1:8000/mcp/",
+        "transport": "streamable_http",
+    },
+}
+CALLS_TO_TIME = [("add", {"a": 2, "b": 3}), ("get_coordinates", {"place_name": "Seoul"})]
+
+
+def start_weather_server() -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, os.path.join(current_dir, "weather_server.py")],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", 8000), timeout=0.5).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("weather_server.py did not start on port 8000")
+
+
+def stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+async def time_calls(tools: list) -> dict:
+    by_name = {tool.name: tool for tool in tools}
+    results = {}
+    for name, args in CALLS_TO_TIME:
+        await by_name[name].ainvoke(args)  # 첫 호출(캐시/임포트) 제외
+        samples = []
+        for _ in range(CALLS):
+            start = time.perf_counter()
+            await by_name[name].ainvoke(args)
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = samples
+    return results
+
+
+def report(label: str, results: dict):
+    for name, samples in results.items():
+        print(f"  {label:<24} {name:<16} median {statistics.median(samples):8.1f} ms"
+              f"   p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.1f} ms")
+
+
+async def main():
+    print(f"호출 {CALLS}회씩 (도구별)\n")
+
+    client = MultiServerMCPClient(CONNECTIONS)
+    per_call = await time_calls(await client.get_tools())
+    report("get_tools (세션/호출)", per_call)
+
+    start = time.perf_counter()
+    pool = MCPSessionPool(CONNECTIONS, sessions_per_server=1, health_interval=0)
+    await pool.start()
+    print(f"\n  풀 시작 (서버 2개 연결 + initialize) {(time.perf_counter() - start) * 1000:.0f} ms")
+    pooled = await time_calls(await pool.get_tools())
+    report("MCPSessionPool", pooled)
+
+    print()
+    for name in per_call:
+        before, after = statistics.median(per_call[name]), statistics.median(pooled[name])
+        print(f"  {name:<16} {before:7.1f} ms -> {after:6.1f} ms  ({before / after:.0f}x)")
+
+    # 동시 호출: 서버당 세션 1개를 같이 씀 (요청이 직렬화되지 않고 한 세션에 겹쳐서 나감)
+    add = next(tool for tool in await pool.get_tools("math") if tool.name == "add")
+    start = time.perf_counter()
+    for i in range(CALLS):
+        await add.ainvoke({"a": i, "b": 1})
+    sequential = time.perf_counter() - start
+    start = time.perf_counter()
+    results = await asyncio.gather(*(add.ainvoke({"a": i, "b": 1}) for i in range(CALLS)))
+    concurrent = time.perf_counter() - start
+    assert [int(r[0]["text"]) for r in results] == [i + 1 for i in range(CALLS)]
+    print(f"\n  add {CALLS}회, 세션 1개: 순차 {sequential * 1000:.0f} ms, 동시 {concurrent * 1000:.0f} ms")
+    await pool.close()
+
+
+async def recovery():
+    """weather 서버를 재시작해도 풀이 다시 연결해서 응답하는지 확인"""
+    global weather
+    async with MCPSessionPool(CONNECTIONS, health_interval=0) as pool:
+        tools = {tool.name: tool for tool in await pool.get_tools()}
+        await tools["get_coordinates"].ainvoke({"place_name": "Seoul"})
+        stop_server(weather)
+        weather = start_weather_server()
+        await tools["get_coordinates"].ainvoke({"place_name": "Seoul"})   # 실패 → 재연결 → 재시도
+        await pool.health_check()
+        print(f"\n  weather 서버 재시작 후 호출 성공, 풀 통계 {pool.stats}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("mcp").setLevel(logging.ERROR)
+    weather = start_weather_server()
+    try:
+        asyncio.run(main())
+        asyncio.run(recovery())
+    finally:
+        stop_server(weather)
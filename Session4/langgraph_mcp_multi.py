@@ -1,7 +1,7 @@
 # langgraph_mcp_multi.py
-# Multi-MCPServer LangGraph code (Session Closed)
-# In the following code as we are using client.get_tools() , 
-# where a new MCP ClientSession for each tool invocation.
+# Multi-MCPServer LangGraph code (Session Pooled)
+# client.get_tools() opens a new MCP ClientSession for each tool invocation,
+# so MCPSessionPool keeps one initialized session per server and reuses it (see mcp_session_pool.py).
 
 from typing import List
 from typing_extensions import TypedDict
@@ -12,36 +12,35 @@ from langgraph.prebuilt import tools_condition, ToolNode
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import AnyMessage, add_messages
 from langgraph.checkpoint.memory import MemorySaver
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp_session_pool import MCPSessionPool
 from dotenv import load_dotenv
 import asyncio
 
 load_dotenv()
 
-client = MultiServerMCPClient(
-    {
-        "math": {
-            "command": "python",
-            "args": ["math_server.py"],
-            "transport": "stdio",
-        },
-
-        # "weather": {
-        #     "command": "python",
-        #     "args": ["weather_server.py"],
-        #     "transport": "stdio",
-        # }
-
-        "weather": {
-            "url": "http://127.0.0.1:8000/mcp/",
-            "transport": "streamable_http"
-        } # userscore not hyphen. Make sure you must run the server first.
-    }
-)
+connections = {
+    "math": {
+        "command": "python",
+        "args": ["math_server.py"],
+        "transport": "stdio",
+    },
+
+    # "weather": {
+    #     "command": "python",
+    #     "args": ["weather_server.py"],
+    #     "transport": "stdio",
+    # }
+
+    "weather": {
+        "url": "http://127.0.0.1:8000/mcp/",
+        "transport": "streamable_http"
+    } # userscore not hyphen. Make sure you must run the server first.
+}
+pool = MCPSessionPool(connections)  # main()에서 start/close
 
 async def create_graph():
     llm = ChatOpenAI(model="gpt-4o")
-    tools = await client.get_tools()
+    tools = await pool.get_tools()
     llm_with_tool = llm.bind_tools(tools)
 
     prompt_template = ChatPromptTemplate.from_messages([
@@ -75,14 +74,19 @@ async def create_graph():
 
 async def main():
     config = {"configurable": {"thread_id": 1234}}
-    agent = await create_graph()
-
-    while True:
-        user_input = input("User: ")
-        if user_input in ["exit", "quit", "q"]:
-            break                
-        response = await agent.ainvoke({"messages": user_input}, config=config)
-        print("AI: "+response["messages"][-1].content)
+    await pool.start()
+    try:
+        agent = await create_graph()
+
+        while True:
+            # 입력을 기다리는 동안에도 이벤트 루프가 돌아야 health check가 실행됨
+            user_input = await asyncio.to_thread(input, "User: ")
+            if user_input in ["exit", "quit", "q"]:
+                break
+            response = await agent.ainvoke({"messages": user_input}, config=config)
+            print("AI: "+response["messages"][-1].content)
+    finally:
+        await pool.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
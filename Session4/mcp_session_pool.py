@@ -0,0 +1,236 @@
+# mcp_session_pool.py
+# Long-lived MCP session pool for MultiServerMCPClient-style server configs.
+# client.get_tools() 도구는 호출할 때마다 새 ClientSession을 엶 (stdio 서버면 매번 python 프로세스 시작 + 핸드셰이크)
+# → 서버마다 초기화된 세션을 N개 유지하고 도구 호출은 그 세션으로 RPC 한 번만 보냄
+#   - 세션마다 전용 task가 연결 context를 열고 닫음 (anyio context는 연 task에서 닫아야 함)
+#   - MCP 세션은 요청 id로 응답을 구분하므로 동시 호출이 세션 하나를 같이 씀 (세션이 여러 개면 진행 중 호출이 적은 쪽)
+#   - 요청이 서버에 전달되지 않은 것이 확실한 연결 오류(닫힌 스트림, 서버가 세션을 모름)일 때만 재연결 후 한 번 재시도
+#   - 응답을 기다리다 연결이 닫힌 경우(CONNECTION_CLOSED)는 도구가 이미 실행됐을 수 있으므로
+#     재연결만 하고 오류를 그대로 올림 (list_tools처럼 다시 보내도 되는 요청만 재시도)
+#   - 주기적으로 모든 세션에 ping (health check), 실패하면 재연결
+#   - close()/async with 종료 시 모든 세션 정리
+#
+# Usage:
+#   async with MCPSessionPool(connections, sessions_per_server=2) as pool:
+#       tools = await pool.get_tools()     # ToolNode(tools=tools), llm.bind_tools(tools)에 그대로 사용
+
+import asyncio
+import itertools
+import logging
+import os
+
+import anyio
+from langchain_mcp_adapters.sessions import create_session
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, INVALID_REQUEST
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_PER_SERVER = int(os.getenv("MCP_SESSIONS_PER_SERVER", 1))
+HEALTH_INTERVAL = float(os.getenv("MCP_HEALTH_INTERVAL", 30))    # 초, 0이면 health check 안 함
+CONNECT_TIMEOUT = float(os.getenv("MCP_CONNECT_TIMEOUT", 30))
+PING_TIMEOUT = 5
+
+# 연결이 끊겼음을 뜻하는 McpError 코드 (재연결 대상)
+# INVALID_REQUEST: streamable_http 서버가 세션을 모름 (서버 재시작 등, "Session terminated")
+#   mcp 1.x streamable_http 클라이언트는 이 오류를 부호 없이(32600) 만들므로 둘 다 확인
+_SESSION_TERMINATED = {INVALID_REQUEST, -INVALID_REQUEST}
+_CONNECTION_ERRORS = {CONNECTION_CLOSED} | _SESSION_TERMINATED
+# 이미 닫힌 연결에 요청을 쓰려 할 때 나는 오류 (요청이 전달되지 않음)
+_CLOSED_STREAM_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+class _PooledConnection:
+    """세션 하나. 전용 task가 연결을 열고(initialize) stop 신호를 받을 때까지 유지"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, server: str, connection: dict):
+        self.server = server
+        self.connection = connection
+        self.id = next(self._ids)
+        self.session = None
+        self.in_flight = 0   # 이 세션에서 진행 중인 호출 수
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task = None
+
+    async def open(self):
+        self._task = asyncio.create_task(self._run(), name=f"mcp-{self.server}-{self.id}")
+        ready = asyncio.create_task(self._ready.wait())
+        done, _ = await asyncio.wait({ready, self._task}, timeout=CONNECT_TIMEOUT,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        ready.cancel()
+        if self._ready.is_set():
+            return self
+        if self._task in done:
+            self._task.result()  # 연결 실패 예외를 그대로 전달
+        await self.close()
+        raise TimeoutError(f"MCP server '{self.server}' did not initialize within {CONNECT_TIMEOUT:g}s")
+
+    async def _run(self):
+        async with create_session(self.connection) as session:
+            await session.initialize()
+            self.session = session
+            self._ready.set()
+            await self._stop.wait()
+        self.session = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def ping(self) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), PING_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        self._stop.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), PING_TIMEOUT)
+        except Exception:
+            # 응답 없는 서버는 task를 취소해서 정리
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class _PooledSession:
+    """load_mcp_tools에 넘기는 세션 대역: 호출마다 풀의 살아 있는 세션으로 보냄"""
+
+    def __init__(self, pool, server: str):
+        self.pool = pool
+        self.server = server
+
+    async def list_tools(self, cursor=None):
+        return await self.pool.request(self.server, lambda session: session.list_tools(cursor=cursor),
+                                       idempotent=True)
+
+    async def call_tool(self, name, arguments=None, progress_callback=None, **kwargs):
+        return await self.pool.request(self.server, lambda session: session.call_tool(
+            name, arguments, progress_callback=progress_callback, **kwargs))
+
+
+class MCPSessionPool:
+    """서버 이름 -> 연결 설정 (MultiServerMCPClient와 같은 형식)"""
+
+    def __init__(self, connections: dict, sessions_per_server: int = SESSIONS_PER_SERVER,
+                 health_interval: float = HEALTH_INTERVAL):
+        self.connections = connections
+        self.sessions_per_server = max(1, sessions_per_server)
+        self.health_interval = health_interval
+        self._all = {}       # 서버 -> [_PooledConnection] (호출들이 공유)
+        self._reconnecting = {}   # 서버 -> [asyncio.Lock] 세션 자리마다 재연결은 한 번에 하나만
+        self._health_task = None
+        self._closed = False
+        self.stats = {"calls": 0, "reconnects": 0, "health_checks": 0}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self):
+        """모든 서버에 세션을 열어 둠 (서버들은 동시에 연결)"""
+        async def open_server(server, connection):
+            conns = await asyncio.gather(*(_PooledConnection(server, connection).open()
+                                           for _ in range(self.sessions_per_server)))
+            self._all[server] = list(conns)
+            self._reconnecting[server] = [asyncio.Lock() for _ in conns]
+
+        await asyncio.gather(*(open_server(s, c) for s, c in self.connections.items()))
+        if self.health_interval:
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-health")
+
+    async def get_tools(self, server: str = None) -> list:
+        """LangChain 도구 목록. 도구 호출은 풀의 세션을 사용"""
+        servers = [server] if server else list(self.connections)
+        tools = []
+        for name in servers:
+            tools.extend(await load_mcp_tools(_PooledSession(self, name), server_name=name))
+        return tools
+
+    async def request(self, server: str, call, idempotent: bool = False):
+        """
+        살아 있는 세션으로 call(session) 실행 (다른 호출과 세션을 공유)
+        요청이 전달되지 않은 연결 오류면 재연결 후 한 번 재시도
+        idempotent: 응답 대기 중 연결이 끊겨도 다시 보내도 되는 요청 (list_tools 등, call_tool은 아님)
+        """
+        if self._closed:
+            raise RuntimeError("MCPSessionPool is closed")
+        conns = self._all[server]
+        slot = min(range(len(conns)), key=lambda i: conns[i].in_flight)
+        self.stats["calls"] += 1
+        for attempt in range(2):
+            conn = self._all[server][slot]
+            if not conn.alive:
+                conn = await self._reconnect(server, slot, conn)
+            conn.in_flight += 1
+            try:
+                return await call(conn.session)
+            except McpError as e:
+                if e.error.code not in _CONNECTION_ERRORS or attempt:
+                    raise  # 서버가 돌려준 오류 (연결은 정상)
+                if e.error.code == CONNECTION_CLOSED and not idempotent:
+                    # 요청은 이미 서버로 나갔을 수 있음 → 다시 보내지 않고 다음 호출을 위해 재연결만
+                    await self._reconnect_quietly(server, slot, conn)
+                    raise
+                failure = e
+            except _CLOSED_STREAM_ERRORS as e:
+                if attempt:
+                    raise
+                failure = e
+            finally:
+                conn.in_flight -= 1
+            logger.warning("MCP %s session %d failed (%r), reconnecting", server, conn.id, failure)
+            await self._reconnect(server, slot, conn)
+
+    async def health_check(self):
+        """모든 세션에 ping, 실패한 세션은 재연결"""
+        self.stats["health_checks"] += 1
+        for server, conns in self._all.items():
+            for slot, conn in enumerate(list(conns)):
+                try:
+                    if not conn.alive or not await conn.ping():
+                        logger.warning("MCP %s session %d failed health check, reconnecting", server, conn.id)
+                        await self._reconnect(server, slot, conn)
+                except Exception as e:
+                    logger.warning("MCP %s reconnect failed: %s", server, e)
+
+    async def close(self):
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+        await asyncio.gather(*(conn.close() for conns in self._all.values() for conn in conns))
+
+    async def _reconnect(self, server: str, slot: int, conn: _PooledConnection) -> _PooledConnection:
+        """slot 자리의 세션 conn을 새 연결로 교체 (동시에 실패한 호출들은 먼저 만든 새 연결을 같이 씀)"""
+        async with self._reconnecting[server][slot]:
+            current = self._all[server][slot]
+            if current is not conn and current.alive:
+                return current
+            await conn.close()
+            new = await _PooledConnection(conn.server, conn.connection).open()
+            self._all[server][slot] = new
+            self.stats["reconnects"] += 1
+            return new
+
+    async def _reconnect_quietly(self, server: str, slot: int, conn: _PooledConnection):
+        """재연결 실패는 기록만 (원래 오류를 올리는 중이므로, 다음 호출이 다시 시도)"""
+        try:
+            await self._reconnect(server, slot, conn)
+        except Exception as e:
+            logger.warning("MCP %s reconnect failed: %s", server, e)
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.health_check()